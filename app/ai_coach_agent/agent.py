@@ -20,14 +20,23 @@ from .tools import (
     create_event,
     edit_event,
     list_events,
+    create_events,
+    edit_events,
+    delete_events,
     get_activity_with_laps,
+    get_activities_with_laps_by_dates,
     get_weather_forecast,
+    get_weather_forecasts,
+    update_weekly_weather,
     file_reader,
     write_chromaDB,
     get_session_by_date,
     update_sessions_calendar_by_date,
     update_sessions_weather_by_date,
     update_sessions_time_scheduled_by_date,
+    update_session_schedule_by_date,
+    update_sessions_weather_by_dates,
+    update_session_schedules_by_dates,
     mark_session_completed_by_date,
     get_weekly_sessions,
     write_activity_data,
@@ -296,10 +305,9 @@ scheduler_agent = LlmAgent(
     - **If weather data is available**: Continue to Step 4
     - **If weather data is not available**: Skip to Step 5
 
-    ### Step 4: Update Weather in Database
-    Use tool `update_sessions_weather_by_date` with:
-    - date: the requested date
-    - weather_data: the weather data from Step 3
+    ### Step 4: Keep Weather Data
+    Keep the weather data from Step 3. It is written to the database together with the
+    calendar events and time_scheduled in a single `update_session_schedule_by_date` call (Step 7d or Step 8).
 
     ### Step 5: Get Calendar Events
     Use tool `list_events` with the requested date to retrieve all calendar events.
@@ -339,9 +347,11 @@ scheduler_agent = LlmAgent(
        - end_time: estimate based on distance (1 hour per 10km)
        - title: "[Session Type] [distance] - AI Coach Session"
     
-    d. **Update Database**: 
-       - Use `update_sessions_calendar_by_date` with the date and all events (including the new one)
-       - Use `update_sessions_time_scheduled_by_date` with the date and time_scheduled data
+    d. **Update Database**: Use `update_session_schedule_by_date` ONCE with:
+       - date: the requested date
+       - weather_data: the weather data from Step 3 (if available)
+       - calendar_events: all events (including the new one)
+       - time_scheduled_data: the time_scheduled data
 
     ### Step 8: Handle Existing AI Training Session
     **When AI Coach Session already exists:**
@@ -352,7 +362,7 @@ scheduler_agent = LlmAgent(
        - **MANDATORY LOGGING**: Log session details: `agent_log("scheduler_agent", "info", "Found existing AI Coach Session: [session_title] at [start_time]-[end_time]")`
        - **MANDATORY LOGGING**: Log time comparison: `agent_log("scheduler_agent", "info", "Time comparison: Current time = [current_time], Session end time = [session_end_time]")`
        - **CRITICAL**: Do NOT reschedule here - just inform about the session status
-       - **MANDATORY**: Always update calendar in database with current events using `update_sessions_calendar_by_date`
+       - **MANDATORY**: Always update the database with a single `update_session_schedule_by_date` call with the current events as calendar_events and the weather data from Step 3 (if available) as weather_data
        - **MANDATORY**: Log session status: `agent_log("scheduler_agent", "info", "AI Coach Session found - letting orchestrator handle completion check and potential rescheduling")`
 
     ### Step 9: Present Information
@@ -393,13 +403,26 @@ scheduler_agent = LlmAgent(
     - Use `edit_event` to reschedule with event_id and new times
     - **CRITICAL**: After editing the event, fetch updated calendar events using `list_events` to get the modified event
     - **MANDATORY LOGGING**: Log the updated event details: `agent_log("scheduler_agent", "info", "Updated event in calendar: [event_title] at [new_start_time]-[new_end_time]")`
-    - **MANDATORY**: Update calendar in database with the UPDATED events using `update_sessions_calendar_by_date`
-    - **MANDATORY**: Update time_scheduled in database with new scheduling using `update_sessions_time_scheduled_by_date`
+    - **MANDATORY**: Update the database with a single `update_session_schedule_by_date` call with the UPDATED events as calendar_events and the new scheduling as time_scheduled_data
     - **MANDATORY LOGGING**: Log database update completion: `agent_log("scheduler_agent", "info", "Successfully updated database with rescheduled session")`
     
     ### Step 5: Log Finish
     Call `agent_log("scheduler_agent", "finish", "Successfully completed rescheduling workflow")`
 
+    ## Additional Workflow: "Schedule sessions for [date range]" (e.g. a whole training plan)
+    **When several sessions need calendar events at once:**
+
+    1. Call `agent_log("scheduler_agent", "start", "Starting bulk scheduling workflow")`
+    2. Take the sessions and dates from the request (use `get_session_by_date` only for dates whose session details are missing)
+    3. Use `list_events` with the first date and the number of days in the range to get all existing events in ONE call
+    4. Pick a time for each session as in Step 7a of the main workflow (no conflicts, 6:00 AM to 9:00 PM)
+    5. Use `create_events` ONCE with the list of all events:
+       [{{"date": "YYYY-MM-DD", "start_time": "HH:MM", "end_time": "HH:MM", "title": "[Session Type] [distance] - AI Coach Session"}}, ...]
+       - Use `edit_events` (with event_id) to move several existing events and `delete_events` to remove several events
+       - Retry only the entries listed in `failed`
+    6. Use `update_session_schedules_by_dates` ONCE with the time_scheduled data of every scheduled date
+    7. Call `agent_log("scheduler_agent", "finish", "Successfully completed bulk scheduling workflow")`
+
     ## Workflow Examples
 
     **Example 1: "Day overview for 2025-01-15" (No existing session)**
@@ -410,7 +433,7 @@ scheduler_agent = LlmAgent(
     
     3. **Get Weather**: `get_weather_forecast("2025-01-15")` → Returns: Clear, 15°C
     
-    4. **Update Weather**: `update_sessions_weather_by_date("2025-01-15", weather_data)`
+    4. **Keep Weather**: weather_data is written in step 7
     
     5. **Get Calendar**: `list_events("2025-01-15")` → Returns: Meeting at 2:00 PM, Dinner at 7:00 PM
     
@@ -420,7 +443,7 @@ scheduler_agent = LlmAgent(
        - Best time: 6:00 AM (avoids meetings, good weather)
        - Create time_scheduled: [{{"title": "Easy run 10k", "start": "06:00", "end": "07:00", "tempC": "15", "desc": "Clear", "status": "scheduled"}}]
        - Create event: "Easy Run 10k - AI Coach Session" at 6:00-7:00 AM
-       - Update database with new event and time_scheduled
+       - Update database once: `update_session_schedule_by_date("2025-01-15", weather_data, calendar_events, time_scheduled_data)`
     
     8. **Present**: "You have 2 calendar events today. I've scheduled your Easy Run 10k for 6:00 AM to avoid your afternoon meeting and take advantage of the clear, 15°C weather."
     
@@ -434,7 +457,7 @@ scheduler_agent = LlmAgent(
     
     3. **Get Weather**: `get_weather_forecast("2025-01-15")` → Returns: Clear, 18°C
     
-    4. **Update Weather**: `update_sessions_weather_by_date("2025-01-15", weather_data)`
+    4. **Keep Weather**: weather_data is written in step 8
     
     5. **Get Calendar**: `list_events("2025-01-15")` → Returns: "Easy Run 8km - AI Coach Session" at 07:00-08:00, Meeting at 2:00 PM
     
@@ -445,7 +468,7 @@ scheduler_agent = LlmAgent(
        - Log: `agent_log("scheduler_agent", "info", "Time comparison: Current time = 14:30, Session end time = 08:00")`
        - Log: `agent_log("scheduler_agent", "info", "AI Coach Session found - letting orchestrator handle completion check and potential rescheduling")`
     
-    8. **Update Database**: Update calendar in database with current events
+    8. **Update Database**: `update_session_schedule_by_date("2025-01-15", weather_data, calendar_events)`
     
     9. **Present**: "You have 2 calendar events today. I found your Easy Run 8k scheduled for 7:00-8:00 AM. Let me check if you've completed this session."
     
@@ -474,8 +497,7 @@ scheduler_agent = LlmAgent(
        - Create new time_scheduled: [{{"title": "Easy run 8k", "start": "06:00", "end": "07:00", "tempC": "18", "desc": "Clear", "status": "rescheduled"}}]
        - Use `edit_event` to reschedule to tomorrow 6:00-7:00 AM
        - **CRITICAL**: Fetch updated calendar events using `list_events` to get the modified event
-       - **MANDATORY**: Update calendar in database with UPDATED events using `update_sessions_calendar_by_date`
-       - **MANDATORY**: Update time_scheduled in database with `update_sessions_time_scheduled_by_date`
+       - **MANDATORY**: Update the database with UPDATED events and the new time_scheduled in a single `update_session_schedule_by_date` call
     
     5. **Log Finish**: `agent_log("scheduler_agent", "finish", "Successfully completed rescheduling workflow")`
 
@@ -484,6 +506,11 @@ scheduler_agent = LlmAgent(
     - Always update ChromaDB after retrieving calendar and weather data
     - Be concise and only provide the requested information
     - The time_scheduled data must be a list of dictionaries with all required fields
+    - When updating several dates at once (e.g. a whole week), use ONE call to `update_sessions_weather_by_dates`
+      or `update_session_schedules_by_dates` with all dates instead of one call per date
+    - For the weather of several days, call `get_weather_forecasts(start_date, days)` ONCE instead of
+      `get_weather_forecast` per date; to only refresh the weather stored on a week's sessions use
+      `update_weekly_weather(start_date, 7)`
     
     ## Critical Rescheduling Logic
     **MANDATORY**: When you find an existing AI Coach Session, you MUST:
@@ -514,13 +541,21 @@ scheduler_agent = LlmAgent(
     
     """,
     tools=[get_weather_forecast,
+           get_weather_forecasts,
+           update_weekly_weather,
            list_events,
            create_event,
            edit_event,
+           create_events,
+           edit_events,
+           delete_events,
            get_session_by_date,
            update_sessions_calendar_by_date,
            update_sessions_weather_by_date,
            update_sessions_time_scheduled_by_date,
+           update_session_schedule_by_date,
+           update_sessions_weather_by_dates,
+           update_session_schedules_by_dates,
            agent_log]
 )
 
@@ -552,6 +587,14 @@ strava_agent = LlmAgent(
                 - data_points: the data_points from the response
         3. **Log Finish and Respond**: Call `agent_log("strava_agent", "finish", "Successfully completed strava_agent workflow")`
         4. **Error Handling**: In case the workflow fails, Call `agent_log("strava_agent", "finish", "Finished with error: [describe the error]")`
+
+    ## Workflow: Several dates at once
+    When asked about more than one date (e.g. "sync this week's runs"):
+        1. Call `get_activities_with_laps_by_dates` ONCE with the list of dates instead of calling `get_activity_with_laps` per date.
+        2. The response has a `results` object mapping each date to the same response `get_activity_with_laps` returns.
+        3. For every date whose result has status "success", call `mark_session_completed_by_date` as in step 2c above.
+        4. Log finish as in steps 3 and 4 above.
+
     * Response Structure from get_activity_with_laps
     The `get_activity_with_laps` tool returns a response with this structure:
     ```json
@@ -615,6 +658,7 @@ strava_agent = LlmAgent(
 
     """,
     tools=[get_activity_with_laps,
+           get_activities_with_laps_by_dates,
            mark_session_completed_by_date,
            write_activity_data,
            agent_log],
@@ -925,18 +969,13 @@ rag_agent = Agent(
     instruction=f"""
     You are a RAG (Retrieval Augmented Generation) agent specialized in processing research documents for running training and analysis.
     
-    ## CRITICAL: Multi-Modal Document Analysis Capabilities
-    **You have multi-modal capabilities** that allow you to directly analyze documents as attachments, including:
-    - PDF documents with text, images, charts, and tables
-    - Images containing text (OCR capabilities)
-    - Complex document layouts with mixed content
-    - Research papers with figures, graphs, and data visualizations
+    ## CRITICAL: Document Text Comes From `file_reader`
+    **The document is not attached to the conversation**. The tool `file_reader` extracts its text for you:
+    - PDF pages come back as text, separated by "--- Page N ---" lines
+    - Word, text and markdown documents come back as plain text
+    - Tables and figure captions are included only as far as they exist as text in the file
     
-    **IMPORTANT**: You can analyze documents directly without needing them to be converted to text first. Use your multi-modal capabilities to:
-    - Read and understand the full document content including visual elements
-    - Extract text from images, charts, and tables within documents
-    - Analyze document structure and layout
-    - Process complex research papers with multiple content types
+    **IMPORTANT**: Base the analysis, metadata and chunks only on the text `file_reader` returns. Do not guess content that is not in that text.
     
     ## CRITICAL: Why RAG Chunks Matter
     **RAG chunks are the foundation of enhanced AI capabilities**. They enable:
@@ -960,21 +999,22 @@ rag_agent = Agent(
     ### Step 1: Log Start
     Call `agent_log("rag_agent", "start", "Starting document analysis")`
     
-    ### Step 2: Multi-Modal Document Analysis
+    ### Step 2: Document Analysis
     You will receive a message like "RAG Document Processing: app/uploads/rag_test.pdf". 
     
     **File Path Extraction**: Extract the file path from the message. The message format is:
     "RAG Document Processing: [file_path]"
     
-    **CRITICAL**: Use your multi-modal capabilities to directly analyze the document as an attachment. You can:
-    - Read PDF documents with complex layouts, images, and tables
-    - Extract text from visual elements within the document
-    - Understand document structure and content organization
-    - Process research papers with figures, graphs, and data visualizations
+    **Reading the document**: Use the tool `file_reader` with the file path to get the document text.
+    PDF pages are separated by "--- Page N ---" lines; for very long PDFs read them in parts with
+    `file_reader(file_path, start_page, max_pages)`.
+    
+    **CRITICAL**: Work from the text `file_reader` returns. If it returns "Error reading file", a base64 binary
+    payload or no text (e.g. a scanned PDF without a text layer), log the error with `agent_log` and stop instead of inventing content.
     
     **Document Analysis Process**:
-    1. **Direct Analysis**: Use your multi-modal capabilities to read and understand the entire document content
-    2. **Content Extraction**: Extract all relevant text, including text from images, charts, and tables
+    1. **Read**: Read the full extracted text, calling `file_reader` again for the remaining pages of long PDFs
+    2. **Content Extraction**: Keep all relevant text, including table contents and figure captions present in the text
     3. **Structure Understanding**: Identify document sections, headers, and content organization
     4. **Metadata Extraction**: Extract the following information:
       - **Title**: Document title (from headers, title pages, or prominent text)
@@ -1047,7 +1087,7 @@ rag_agent = Agent(
     - Ensure chunks can be retrieved independently for specific queries
     - Focus on practical applications and actionable insights
     
-    **CRITICAL**: After analyzing the document with your multi-modal capabilities, use the tool `create_rag_chunks` with the extracted document content to:
+    **CRITICAL**: After analyzing the extracted document text, use the tool `create_rag_chunks` with the extracted document content to:
     - Break the document into meaningful chunks following the strategy above
     - Extract key insights, findings, and actionable information
     - Create chunk titles that clearly describe the content
@@ -1114,7 +1154,7 @@ rag_agent = Agent(
     - **Knowledge Integration**: Ensure chunks are useful for both agents
     - **Practical Focus**: Prioritize content that can be directly applied in training scenarios
     """,
-    tools=[create_rag_chunks, agent_log],
+    tools=[file_reader, create_rag_chunks, agent_log],
 )
 
 root_agent = Agent(
@@ -2,36 +2,87 @@
 Calendar tools for Google Calendar integration.
 """
 
-from .calendar_utils import get_current_time
-from .create_event import create_event
-from .delete_event import delete_event
-from .edit_event import edit_event
-from .list_events import list_events
-from .strava_list_activities import get_activity_with_laps
-from .get_weather import get_weather_forecast
-from .training_plan_parser import file_reader
-from .chromaDB_tools import write_chromaDB,get_session_by_date,update_sessions_calendar_by_date,update_sessions_weather_by_date,update_sessions_time_scheduled_by_date,mark_session_completed_by_date,write_activity_data,get_weekly_sessions,get_activity_by_id,update_session_with_analysis
-from .plot_running_chart import plot_running_chart, plot_running_chart_laps
-from .agent_logger import agent_log
-from .activity_classifier import segment_activity_by_pace
-from .rag_knowledge import initialize_rag_knowledge, retrieve_rag_knowledge, get_all_rag_categories
-from .document_analyzer import create_rag_chunks
+import importlib
+
+# Tools are imported from their module on first access, so importing the package
+# (or a single tool, as scripts and the webhook worker do) does not load every tool
+# module. The server still imports every agent tool at startup through agent.py,
+# because ADK reads each tool's signature and docstring when the agents are built;
+# there the heavy libraries (NumPy, pandas, matplotlib, chromadb, stravalib) stay
+# deferred by importing them inside the functions that use them
+_TOOL_MODULES = {
+    "get_current_time": "calendar_utils",
+    "create_event": "create_event",
+    "delete_event": "delete_event",
+    "edit_event": "edit_event",
+    "list_events": "list_events",
+    "create_events": "batch_events",
+    "edit_events": "batch_events",
+    "delete_events": "batch_events",
+    "get_activity_with_laps": "strava_list_activities",
+    "get_activities_with_laps_by_dates": "strava_list_activities",
+    "get_weather_forecast": "get_weather",
+    "get_weather_forecasts": "get_weather",
+    "update_weekly_weather": "get_weather",
+    "file_reader": "training_plan_parser",
+    "import_training_plan": "training_plan_parser",
+    "write_chromaDB": "chromaDB_tools",
+    "get_session_by_date": "chromaDB_tools",
+    "update_sessions_calendar_by_date": "chromaDB_tools",
+    "update_sessions_weather_by_date": "chromaDB_tools",
+    "update_sessions_time_scheduled_by_date": "chromaDB_tools",
+    "update_session_schedule_by_date": "chromaDB_tools",
+    "update_sessions_weather_by_dates": "chromaDB_tools",
+    "update_session_schedules_by_dates": "chromaDB_tools",
+    "mark_session_completed_by_date": "chromaDB_tools",
+    "write_activity_data": "chromaDB_tools",
+    "get_weekly_sessions": "chromaDB_tools",
+    "get_activity_by_id": "chromaDB_tools",
+    "update_session_with_analysis": "chromaDB_tools",
+    "plot_running_chart": "plot_running_chart",
+    "plot_running_chart_laps": "plot_running_chart",
+    "agent_log": "agent_logger",
+    "segment_activity_by_pace": "activity_classifier",
+    "initialize_rag_knowledge": "rag_knowledge",
+    "retrieve_rag_knowledge": "rag_knowledge",
+    "get_all_rag_categories": "rag_knowledge",
+    "create_rag_chunks": "document_analyzer",
+}
+
+
+def __getattr__(name):
+    module_name = _TOOL_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     "create_event",
     "delete_event",
     "edit_event",
     "list_events",
+    "create_events",
+    "edit_events",
+    "delete_events",
     "get_current_time",
     "get_activity_with_laps",
+    "get_activities_with_laps_by_dates",
     "get_weather_forecast",
+    "get_weather_forecasts",
+    "update_weekly_weather",
     "file_reader",
+    "import_training_plan",
     "read_image_as_binary",
     "write_chromaDB",
     "get_session_by_date",
     "update_sessions_calendar_by_date",
     "update_sessions_weather_by_date",
     "update_sessions_time_scheduled_by_date",
+    "update_session_schedule_by_date",
+    "update_sessions_weather_by_dates",
+    "update_session_schedules_by_dates",
     "update_session_with_analysis",
     "get_weekly_sessions",
     "mark_session_completed_by_date",
@@ -4,6 +4,68 @@ import json
 from typing import Dict, List, Any
 from .chromaDB_tools import chroma_service
 
+# Attempts to write segmented laps when another writer changes the session in between
+MAX_WRITE_ATTEMPTS = 3
+
+def _store_segmented_laps(date: str, segmented_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace the laps in the data_points of the session on date, keeping its other data_points keys.
+
+    The session is written only if its version is still the one read, and is
+    re-read and merged again when a concurrent update got there first.
+    """
+    if 'laps' in segmented_data:
+        laps = segmented_data['laps']
+    elif 'data_points' in segmented_data and 'laps' in segmented_data['data_points']:
+        laps = segmented_data['data_points']['laps']
+    else:
+        print(f"[ActivityClassifier_tool] Warning: No 'laps' key found in segmented_data")
+        laps = None
+    
+    for _ in range(MAX_WRITE_ATTEMPTS):
+        results = chroma_service.get_session_by_date(date)
+        if not results or not results['ids']:
+            return {
+                "status": "error",
+                "message": f"No session found for date: {date}"
+            }
+        
+        # Get the single session (there's only one per day)
+        session_id = results['ids'][0]
+        current_metadata = results['metadatas'][0]
+        
+        data_points = current_metadata.get('data_points')
+        if isinstance(data_points, dict):
+            if laps is not None:
+                data_points['laps'] = laps
+                print(f"[ActivityClassifier_tool] Updated {len(laps)} laps with segment information")
+        else:
+            # If no existing data_points, create new one with segmented_data
+            data_points = segmented_data
+            print(f"[ActivityClassifier_tool] Created new data_points with segmented data")
+        
+        result = chroma_service.patch_sessions(
+            {session_id: {'data_points': data_points}},
+            expected_versions={session_id: current_metadata.get('version', 0)}
+        )
+        if result["status"] == "error":
+            return {
+                "status": "error",
+                "message": f"Error storing segmented data: {result.get('message')}"
+            }
+        if result["updated"]:
+            return {"status": "success"}
+        if result["missing"]:
+            return {
+                "status": "error",
+                "message": f"No session found for date: {date}"
+            }
+        print(f"[ActivityClassifier_tool] Session for {date} changed while storing laps, retrying")
+    
+    return {
+        "status": "error",
+        "message": f"Session for {date} kept changing, segmented data not stored"
+    }
+
 def segment_activity_by_pace(activity_data: Dict[str, Any], date: str) -> Dict[str, Any]:
     """
     Segments a running activity's laps into 'Warm up', 'Main', and 'Cool down' 
@@ -56,50 +118,9 @@ def segment_activity_by_pace(activity_data: Dict[str, Any], date: str) -> Dict[s
                 print(f"[ActivityClassifier_tool] Storing pre-segmented data in database for date: {date}")
                 print(f"[ActivityClassifier_tool] Pre-segmented data structure: {segmented_data}")
                 
-                # Get the session for the specified date
-                results = chroma_service.collection.get(where={"date": date})
-                if not results['ids']:
-                    return {
-                        "status": "error",
-                        "message": f"No session found for date: {date}"
-                    }
-                
-                # Get the single session (there's only one per day)
-                session_id = results['ids'][0]
-                current_metadata = results['metadatas'][0]
-                
-                # Update the data_points with pre-segmented data
-                if 'data_points' in current_metadata:
-                    try:
-                        # Parse existing data_points if it's a JSON string
-                        existing_data_points = json.loads(current_metadata['data_points']) if isinstance(current_metadata['data_points'], str) else current_metadata['data_points']
-                        
-                        # Update the laps with segment information from segmented_data
-                        if 'laps' in segmented_data:
-                            existing_data_points['laps'] = segmented_data['laps']
-                            print(f"[ActivityClassifier_tool] Updated {len(segmented_data['laps'])} laps with existing segment information")
-                        elif 'data_points' in segmented_data and 'laps' in segmented_data['data_points']:
-                            existing_data_points['laps'] = segmented_data['data_points']['laps']
-                            print(f"[ActivityClassifier_tool] Updated {len(segmented_data['data_points']['laps'])} laps with existing segment information")
-                        else:
-                            print(f"[ActivityClassifier_tool] Warning: No 'laps' key found in segmented_data")
-                        
-                        # Store updated data_points
-                        current_metadata['data_points'] = json.dumps(existing_data_points)
-                    except (json.JSONDecodeError, KeyError) as e:
-                        print(f"Warning: Could not update existing data_points: {e}")
-                        # If parsing fails, create new data_points structure with segmented_data
-                        current_metadata['data_points'] = json.dumps(segmented_data)
-                else:
-                    # If no existing data_points, create new one with segmented_data
-                    current_metadata['data_points'] = json.dumps(segmented_data)
-                    print(f"[ActivityClassifier_tool] Created new data_points with pre-segmented data")
-                
-                # Update the session
-                chroma_service.collection.update(
-                    ids=[session_id],
-                    metadatas=[current_metadata]
-                )
+                stored = _store_segmented_laps(date, segmented_data)
+                if stored["status"] != "success":
+                    return {**stored, "segmented_data": segmented_data}
                 
                 print(f"[ActivityClassifier_tool] Successfully stored pre-segmented data for {date}")
                 return {
@@ -230,50 +251,9 @@ def segment_activity_by_pace(activity_data: Dict[str, Any], date: str) -> Dict[s
             print(f"[ActivityClassifier_tool] Storing segmented data in database for date: {date}")
             print(f"[ActivityClassifier_tool] Segmented data structure: {segmented_data}")
             
-            # Get the session for the specified date
-            results = chroma_service.collection.get(where={"date": date})
-            if not results['ids']:
-                return {
-                    "status": "error",
-                    "message": f"No session found for date: {date}"
-                }
-            
-            # Get the single session (there's only one per day)
-            session_id = results['ids'][0]
-            current_metadata = results['metadatas'][0]
-            
-            # Update the data_points with segmented data
-            if 'data_points' in current_metadata:
-                try:
-                    # Parse existing data_points if it's a JSON string
-                    existing_data_points = json.loads(current_metadata['data_points']) if isinstance(current_metadata['data_points'], str) else current_metadata['data_points']
-                    
-                    # Update the laps with segment information from segmented_data
-                    if 'laps' in segmented_data:
-                        existing_data_points['laps'] = segmented_data['laps']
-                        print(f"[ActivityClassifier_tool] Updated {len(segmented_data['laps'])} laps with segment information")
-                    elif 'data_points' in segmented_data and 'laps' in segmented_data['data_points']:
-                        existing_data_points['laps'] = segmented_data['data_points']['laps']
-                        print(f"[ActivityClassifier_tool] Updated {len(segmented_data['data_points']['laps'])} laps with segment information")
-                    else:
-                        print(f"[ActivityClassifier_tool] Warning: No 'laps' key found in segmented_data")
-                    
-                    # Store updated data_points
-                    current_metadata['data_points'] = json.dumps(existing_data_points)
-                except (json.JSONDecodeError, KeyError) as e:
-                    print(f"Warning: Could not update existing data_points: {e}")
-                    # If parsing fails, create new data_points structure with segmented_data
-                    current_metadata['data_points'] = json.dumps(segmented_data)
-            else:
-                # If no existing data_points, create new one with segmented_data
-                current_metadata['data_points'] = json.dumps(segmented_data)
-                print(f"[ActivityClassifier_tool] Created new data_points with segmented_data")
-            
-            # Update the session
-            chroma_service.collection.update(
-                ids=[session_id],
-                metadatas=[current_metadata]
-            )
+            stored = _store_segmented_laps(date, segmented_data)
+            if stored["status"] != "success":
+                return {**stored, "segmented_data": segmented_data}
             
             print(f"[ActivityClassifier_tool] Successfully stored segmented data for {date}")
             return {
@@ -0,0 +1,247 @@
+"""
+Bulk create, edit and delete tools for Google Calendar integration.
+
+Operations are sent through the Google API batch endpoint, up to
+BATCH_SIZE calls per HTTP request, so scheduling a whole training plan
+takes a few round-trips instead of one (or two) per session.
+"""
+
+import time
+from typing import Callable, Dict, List, Tuple
+
+from googleapiclient.errors import HttpError
+
+from .calendar_utils import build_event_body, get_calendar_service, get_calendar_timezone
+from .calendar_sync import record_event_change
+
+# Calls per batch request (Google accepts up to 1000, Calendar recommends 50)
+BATCH_SIZE = 50
+
+# Rate-limited calls are retried in a later batch this many times
+MAX_RETRIES = 3
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    if not isinstance(error, HttpError):
+        return False
+    if error.resp.status == 429:
+        return True
+    return error.resp.status == 403 and "ratelimitexceeded" in str(error).lower()
+
+
+def _execute_batched(service, requests: List[Tuple[int, Callable]]) -> Tuple[Dict[int, dict], Dict[int, str]]:
+    """
+    Execute API calls through the batch endpoint.
+
+    Args:
+        service: Calendar service
+        requests: (index, factory) pairs; factory() returns the HttpRequest to send
+
+    Returns:
+        tuple: (responses by index, error messages by index)
+    """
+    responses: Dict[int, dict] = {}
+    errors: Dict[int, str] = {}
+    pending = list(requests)
+
+    for attempt in range(MAX_RETRIES + 1):
+        retry = []
+        for offset in range(0, len(pending), BATCH_SIZE):
+            chunk = dict(pending[offset:offset + BATCH_SIZE])
+
+            def callback(request_id, response, exception, chunk=chunk):
+                index = int(request_id)
+                if exception is None:
+                    responses[index] = response or {}
+                elif _is_rate_limited(exception) and attempt < MAX_RETRIES:
+                    retry.append((index, chunk[index]))
+                else:
+                    errors[index] = str(exception)
+
+            batch = service.new_batch_http_request(callback=callback)
+            for index, factory in chunk.items():
+                batch.add(factory(), request_id=str(index))
+            batch.execute()
+
+        if not retry:
+            break
+        print(f"[CalendarAPI_tool] {len(retry)} calls rate limited, retrying")
+        time.sleep(2 ** attempt)
+        pending = retry
+
+    return responses, errors
+
+
+def create_events(events: list) -> dict:
+    """
+    Create several events in Google Calendar with batched requests.
+
+    Args:
+        events (list): Events to create, each a dict with:
+            - date (str): Date in YYYY-MM-DD format
+            - start_time (str): Start time in HH:MM format (24-hour)
+            - end_time (str): End time in HH:MM format (24-hour)
+            - title (str): Event title
+
+    Returns:
+        dict: status, message, the created events (date, title, event_id) and
+              the events that failed with their error
+    """
+    try:
+        print(f"[CalendarAPI_tool] START: Creating {len(events)} events")
+        service = get_calendar_service()
+        if not service:
+            return {
+                "status": "error",
+                "message": "Failed to authenticate with Google Calendar. Please check credentials.",
+            }
+
+        calendar_id = "primary"
+        timezone_id = get_calendar_timezone(service)
+
+        requests = []
+        failed = []
+        for index, event in enumerate(events):
+            body = build_event_body(event.get("date"), event.get("start_time"), event.get("end_time"),
+                                    event.get("title"), timezone_id)
+            if not body:
+                failed.append({**event, "message": "Invalid date/time format. Use YYYY-MM-DD and HH:MM."})
+                continue
+            requests.append((index, lambda body=body: service.events().insert(calendarId=calendar_id, body=body)))
+
+        responses, errors = _execute_batched(service, requests)
+
+        created = []
+        for index, response in sorted(responses.items()):
+            record_event_change(event=response, calendar_id=calendar_id)
+            created.append({
+                "date": events[index].get("date"),
+                "title": events[index].get("title"),
+                "event_id": response.get("id"),
+            })
+        failed.extend({**events[index], "message": message} for index, message in sorted(errors.items()))
+
+        print(f"[CalendarAPI_tool] FINISH: {len(created)} events created, {len(failed)} failed")
+        return {
+            "status": "error" if failed and not created else "success",
+            "message": f"Created {len(created)} event(s), {len(failed)} failed",
+            "created": created,
+            "failed": failed,
+        }
+
+    except Exception as e:
+        print(f"[CalendarAPI_tool] ERROR: Error creating events: {str(e)}")
+        return {"status": "error", "message": f"Error creating events: {str(e)}"}
+
+
+def edit_events(events: list) -> dict:
+    """
+    Edit several existing events in Google Calendar with batched requests.
+
+    Args:
+        events (list): Events to update, each a dict with:
+            - event_id (str): The ID of the event to edit
+            - date (str): Date in YYYY-MM-DD format
+            - start_time (str): Start time in HH:MM format (24-hour)
+            - end_time (str): End time in HH:MM format (24-hour)
+            - title (str): Event title
+
+    Returns:
+        dict: status, message, the updated event_ids and the events that failed
+    """
+    try:
+        print(f"[CalendarAPI_tool] START: Editing {len(events)} events")
+        service = get_calendar_service()
+        if not service:
+            return {
+                "status": "error",
+                "message": "Failed to authenticate with Google Calendar. Please check credentials.",
+            }
+
+        calendar_id = "primary"
+        timezone_id = get_calendar_timezone(service)
+
+        requests = []
+        failed = []
+        for index, event in enumerate(events):
+            body = build_event_body(event.get("date"), event.get("start_time"), event.get("end_time"),
+                                    event.get("title"), timezone_id)
+            if not body or not event.get("event_id"):
+                failed.append({**event, "message": "Missing event_id or invalid date/time format."})
+                continue
+            body["id"] = event["event_id"]
+            requests.append((index, lambda body=body: service.events().update(
+                calendarId=calendar_id, eventId=body["id"], body=body)))
+
+        responses, errors = _execute_batched(service, requests)
+
+        updated = []
+        for index, response in sorted(responses.items()):
+            record_event_change(event=response, calendar_id=calendar_id)
+            updated.append(events[index]["event_id"])
+        failed.extend({**events[index], "message": message} for index, message in sorted(errors.items()))
+
+        print(f"[CalendarAPI_tool] FINISH: {len(updated)} events updated, {len(failed)} failed")
+        return {
+            "status": "error" if failed and not updated else "success",
+            "message": f"Updated {len(updated)} event(s), {len(failed)} failed",
+            "updated": updated,
+            "failed": failed,
+        }
+
+    except Exception as e:
+        print(f"[CalendarAPI_tool] ERROR: Error updating events: {str(e)}")
+        return {"status": "error", "message": f"Error updating events: {str(e)}"}
+
+
+def delete_events(event_ids: list, confirm: bool) -> dict:
+    """
+    Delete several events from Google Calendar with batched requests.
+
+    Args:
+        event_ids (list): IDs of the events to delete
+        confirm (bool): Confirmation flag (must be set to True to delete)
+
+    Returns:
+        dict: status, message, the deleted event_ids and the ones that failed
+    """
+    # Safety check - require explicit confirmation
+    if not confirm:
+        return {
+            "status": "error",
+            "message": "Please confirm deletion by setting confirm=True",
+        }
+
+    try:
+        print(f"[CalendarAPI_tool] START: Deleting {len(event_ids)} events")
+        service = get_calendar_service()
+        if not service:
+            return {
+                "status": "error",
+                "message": "Failed to authenticate with Google Calendar. Please check credentials.",
+            }
+
+        calendar_id = "primary"
+        requests = [
+            (index, lambda event_id=event_id: service.events().delete(calendarId=calendar_id, eventId=event_id))
+            for index, event_id in enumerate(event_ids)
+        ]
+        responses, errors = _execute_batched(service, requests)
+
+        deleted = []
+        for index in sorted(responses):
+            record_event_change(deleted_event_id=event_ids[index], calendar_id=calendar_id)
+            deleted.append(event_ids[index])
+        failed = [{"event_id": event_ids[index], "message": message} for index, message in sorted(errors.items())]
+
+        print(f"[CalendarAPI_tool] FINISH: {len(deleted)} events deleted, {len(failed)} failed")
+        return {
+            "status": "error" if failed and not deleted else "success",
+            "message": f"Deleted {len(deleted)} event(s), {len(failed)} failed",
+            "deleted": deleted,
+            "failed": failed,
+        }
+
+    except Exception as e:
+        print(f"[CalendarAPI_tool] ERROR: Error deleting events: {str(e)}")
+        return {"status": "error", "message": f"Error deleting events: {str(e)}"}
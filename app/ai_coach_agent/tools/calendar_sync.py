@@ -0,0 +1,159 @@
+"""
+Incremental sync of the local Google Calendar mirror.
+
+The first sync lists every event from MIRROR_DAYS_BACK days ago onwards
+and stores the nextSyncToken; later syncs send that token and only receive
+what changed. Reads go to the mirror and trigger a delta sync only when the
+mirror is older than MIRROR_MAX_AGE_SECONDS; reads before the mirrored range
+extend it further back.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from googleapiclient.errors import HttpError
+
+from db.chroma_service import chroma_service
+from .calendar_utils import get_calendar_service
+
+# How old the mirror may be before a read triggers a delta sync
+MIRROR_MAX_AGE_SECONDS = 60
+
+# How far back the initial full sync reaches
+MIRROR_DAYS_BACK = 30
+
+_sync_lock = threading.Lock()
+
+
+def _list_pages(service, calendar_id: str, **params):
+    """Yield every page of events().list and return the final nextSyncToken."""
+    page_token = None
+    while True:
+        response = (
+            service.events()
+            .list(calendarId=calendar_id, singleEvents=True, maxResults=2500, pageToken=page_token, **params)
+            .execute()
+        )
+        yield response.get("items", []), response.get("nextSyncToken")
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return
+
+
+def sync_calendar(calendar_id: str = "primary", force: bool = False) -> dict:
+    """
+    Bring the local event mirror up to date
+
+    Args:
+        calendar_id (str): Calendar to sync
+        force (bool): Sync even if the mirror is younger than MIRROR_MAX_AGE_SECONDS
+
+    Returns:
+        dict: status, message and number of changed events
+    """
+    store = chroma_service.calendar
+    with _sync_lock:
+        state = store.get_sync_state(calendar_id)
+        if not force and state and time.time() - state["synced_at"] < MIRROR_MAX_AGE_SECONDS:
+            return {"status": "success", "message": "Calendar mirror is up to date", "changed": 0}
+
+        service = get_calendar_service()
+        if not service:
+            return {"status": "error", "message": "Failed to authenticate with Google Calendar.", "changed": 0}
+
+        window_start = state["window_start"] if state else None
+        sync_token = state["sync_token"] if state else None
+        try:
+            if sync_token:
+                try:
+                    changed, sync_token = _apply_pages(
+                        calendar_id, _list_pages(service, calendar_id, syncToken=sync_token)
+                    )
+                except HttpError as e:
+                    # 410 Gone means the token expired and a full sync is required
+                    if e.resp.status != 410:
+                        raise
+                    print("[CalendarAPI_tool] Calendar sync token expired")
+                    sync_token = None
+
+            if not sync_token:
+                store.clear(calendar_id)
+                window_start = (datetime.utcnow() - timedelta(days=MIRROR_DAYS_BACK)).strftime("%Y-%m-%dT00:00:00Z")
+                print(f"[CalendarAPI_tool] Full calendar sync from {window_start}")
+                changed, sync_token = _apply_pages(
+                    calendar_id, _list_pages(service, calendar_id, timeMin=window_start)
+                )
+        except HttpError as e:
+            print(f"[CalendarAPI_tool] ERROR: Calendar sync failed: {str(e)}")
+            return {"status": "error", "message": f"Calendar sync failed: {str(e)}", "changed": 0}
+
+        store.set_sync_state(calendar_id, sync_token, window_start, time.time())
+        print(f"[CalendarAPI_tool] Calendar mirror synced, {changed} events changed")
+        return {"status": "success", "message": f"Synced {changed} changed events", "changed": changed}
+
+
+def _apply_pages(calendar_id: str, pages):
+    changed = 0
+    sync_token = None
+    for items, next_sync_token in pages:
+        changed += chroma_service.calendar.upsert_events(calendar_id, items)
+        sync_token = next_sync_token or sync_token
+    return changed, sync_token
+
+
+def _extend_window(calendar_id: str, time_min: str, state: dict) -> bool:
+    """List events from time_min up to the mirrored range into the mirror."""
+    service = get_calendar_service()
+    if not service:
+        return False
+    print(f"[CalendarAPI_tool] Extending calendar mirror back to {time_min}")
+    with _sync_lock:
+        # The sync token reports changes to any event, so the older events stay current too
+        _apply_pages(calendar_id, _list_pages(service, calendar_id, timeMin=time_min, timeMax=state["window_start"]))
+        chroma_service.calendar.set_sync_state(calendar_id, state["sync_token"], time_min, state["synced_at"])
+    return True
+
+
+def get_mirrored_events(time_min: str, time_max: str, calendar_id: str = "primary") -> Optional[List[dict]]:
+    """
+    Read events overlapping a window from the mirror, syncing it first if stale
+
+    A window that starts before the mirrored range first extends the mirror
+    back to its start. If a sync fails, the last synced mirror is served.
+
+    Args:
+        time_min (str): Window start, "YYYY-MM-DDTHH:MM:SSZ"
+        time_max (str): Window end, "YYYY-MM-DDTHH:MM:SSZ"
+        calendar_id (str): Calendar to read
+
+    Returns:
+        list: Calendar API event dicts, or None if the mirror cannot answer
+              (it was never synced, or the window could not be mirrored)
+    """
+    try:
+        result = sync_calendar(calendar_id)
+        if result["status"] != "success":
+            print(f"[CalendarAPI_tool] ERROR: {result['message']}, serving the last synced mirror")
+        state = chroma_service.calendar.get_sync_state(calendar_id)
+        if not state:
+            return None
+        if time_min < (state["window_start"] or "") and not _extend_window(calendar_id, time_min, state):
+            return None
+    except Exception as e:
+        print(f"[CalendarAPI_tool] ERROR: Calendar sync failed: {str(e)}")
+        return None
+    return chroma_service.calendar.events_between(calendar_id, time_min, time_max)
+
+
+def record_event_change(event: Optional[dict] = None, deleted_event_id: Optional[str] = None,
+                        calendar_id: str = "primary") -> None:
+    """Write an event the tools just created, updated or deleted through to the mirror."""
+    try:
+        if event:
+            chroma_service.calendar.upsert_events(calendar_id, [event])
+        if deleted_event_id:
+            chroma_service.calendar.delete_event(calendar_id, deleted_event_id)
+    except Exception as e:
+        print(f"[CalendarAPI_tool] ERROR: Could not update calendar mirror: {str(e)}")
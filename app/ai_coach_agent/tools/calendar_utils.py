@@ -4,13 +4,18 @@ Utility functions for Google Calendar integration.
 
 import json
 import os
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
+import google_auth_httplib2
+import httplib2
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.http import HttpRequest
 
 # Define scopes needed for Google Calendar
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
@@ -19,14 +24,26 @@ SCOPES = ["https://www.googleapis.com/auth/calendar"]
 TOKEN_PATH = Path(os.path.expanduser("~/.credentials/calendar_token.json"))
 CREDENTIALS_PATH = Path("credentials.json")
 
+# Refresh credentials this many seconds before the access token expires
+REFRESH_MARGIN_SECONDS = 300
 
-def get_calendar_service():
-    """
-    Authenticate and create a Google Calendar service object.
+# Used when the calendar timezone setting cannot be read
+DEFAULT_TIMEZONE = "America/New_York"
 
-    Returns:
-        A Google Calendar service object or None if authentication fails
-    """
+# Process-wide service built once from the static discovery document
+_service = None
+_creds = None
+_service_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+_refresher = None
+# httplib2.Http is not thread-safe, so each thread gets its own authorized connection
+_thread_http = threading.local()
+# Calendar timezone, read from the calendar settings once per process
+_timezone = None
+
+
+def _load_credentials():
+    """Load, refresh or obtain OAuth credentials and save them to TOKEN_PATH."""
     creds = None
 
     # Check if token exists and is valid
@@ -54,8 +71,140 @@ def get_calendar_service():
         TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
         TOKEN_PATH.write_text(creds.to_json())
 
-    # Create and return the Calendar service
-    return build("calendar", "v3", credentials=creds)
+    return creds
+
+
+def _refresh_credentials():
+    """Refresh the shared credentials if they are close to expiry and save them."""
+    with _refresh_lock:
+        if _creds is None or not _creds.refresh_token:
+            return
+        if _creds.expiry and (_creds.expiry - datetime.utcnow()).total_seconds() > REFRESH_MARGIN_SECONDS:
+            return
+        _creds.refresh(Request())
+        TOKEN_PATH.write_text(_creds.to_json())
+        print("[CalendarAPI_tool] Calendar credentials refreshed")
+
+
+def _refresh_loop():
+    """Background thread keeping the access token valid so tool calls never wait on a refresh."""
+    while True:
+        try:
+            expiry = _creds.expiry if _creds else None
+            wait = (expiry - datetime.utcnow()).total_seconds() - REFRESH_MARGIN_SECONDS if expiry else 600
+            time.sleep(max(wait, 30))
+            _refresh_credentials()
+        except Exception as e:
+            print(f"[CalendarAPI_tool] ERROR: Background credential refresh failed: {str(e)}")
+            time.sleep(60)
+
+
+def _authorized_http():
+    """Return this thread's authorized HTTP connection, creating it on first use."""
+    http = getattr(_thread_http, "http", None)
+    if http is None or http.credentials is not _creds:
+        http = google_auth_httplib2.AuthorizedHttp(_creds, http=httplib2.Http())
+        _thread_http.http = http
+    return http
+
+
+def _build_request(http, *args, **kwargs):
+    """Bind every API request to the calling thread's connection."""
+    return HttpRequest(_authorized_http(), *args, **kwargs)
+
+
+def get_calendar_service():
+    """
+    Return the shared Google Calendar service object, creating it on first use.
+
+    The service is built once from the discovery document bundled with
+    googleapiclient and reused by every tool call. Requests run on a
+    per-thread connection, so concurrent sessions can share it safely, and
+    a background thread refreshes the credentials before they expire.
+
+    Returns:
+        A Google Calendar service object or None if authentication fails
+    """
+    global _service, _creds, _refresher
+
+    with _service_lock:
+        if _service is None:
+            creds = _load_credentials()
+            if creds is None:
+                return None
+            _creds = creds
+
+            # Create the Calendar service
+            _service = build(
+                "calendar",
+                "v3",
+                http=_authorized_http(),
+                requestBuilder=_build_request,
+                static_discovery=True,
+                cache_discovery=False,
+            )
+
+            if _refresher is None:
+                _refresher = threading.Thread(target=_refresh_loop, name="calendar-refresh", daemon=True)
+                _refresher.start()
+
+    # Refresh inline only if the background refresh fell behind
+    if not _creds.valid:
+        _refresh_credentials()
+
+    return _service
+
+
+def get_calendar_timezone(service=None) -> str:
+    """
+    Return the timezone of the user's calendar, reading it once per process.
+
+    Args:
+        service: Optional Calendar service to use for the first lookup
+
+    Returns:
+        str: IANA timezone name, DEFAULT_TIMEZONE if the setting cannot be read
+    """
+    global _timezone
+
+    if _timezone is None:
+        timezone_id = DEFAULT_TIMEZONE
+        try:
+            service = service or get_calendar_service()
+            setting = service.settings().get(setting="timezone").execute()
+            timezone_id = setting.get("value") or DEFAULT_TIMEZONE
+        except Exception as e:
+            # Fall back to the default without caching it, so the next call retries
+            print(f"[CalendarAPI_tool] Could not read calendar timezone, using {DEFAULT_TIMEZONE}: {str(e)}")
+            return timezone_id
+        _timezone = timezone_id
+    return _timezone
+
+
+def build_event_body(date, start_time, end_time, title, timezone_id):
+    """
+    Build the Calendar API body of a timed event.
+
+    Args:
+        date (str): Date in YYYY-MM-DD format
+        start_time (str): Start time in HH:MM format (24-hour)
+        end_time (str): End time in HH:MM format (24-hour)
+        title (str): Event title
+        timezone_id (str): Timezone the times are expressed in
+
+    Returns:
+        dict: Event body, or None if the date or times cannot be parsed
+    """
+    start_dt = parse_datetime(f"{date} {start_time}")
+    end_dt = parse_datetime(f"{date} {end_time}")
+    if not start_dt or not end_dt:
+        return None
+
+    return {
+        "summary": title,
+        "start": {"dateTime": start_dt.isoformat(), "timeZone": timezone_id},
+        "end": {"dateTime": end_dt.isoformat(), "timeZone": timezone_id},
+    }
 
 
 def format_event_time(event_time):
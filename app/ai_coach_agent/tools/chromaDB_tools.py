@@ -122,6 +122,54 @@ def get_session_by_date(date: str):
     else:
         return {"session": "No session found for today."}
 
+def _extract_calendar_events(calendar_events) -> list:
+    """Extract the events array from the different structures calendar tools return."""
+    if isinstance(calendar_events, dict):
+        # If calendar_events has a nested "calendar" key with "events"
+        if "calendar" in calendar_events and isinstance(calendar_events["calendar"], dict):
+            return calendar_events["calendar"].get("events", [])
+        # If calendar_events directly has "events"
+        if "events" in calendar_events:
+            return calendar_events["events"]
+        return []
+    if isinstance(calendar_events, list):
+        # If calendar_events is already the events array
+        return calendar_events
+    return []
+
+def _filter_weather_hours(weather_data) -> dict:
+    """Extract the hours array from weather API data, keeping only 06:00, 09:00, 12:00, 15:00 and 18:00."""
+    hours_data = []
+    if isinstance(weather_data, dict):
+        # If weather_data has a nested "weather" key with "hours"
+        if "weather" in weather_data and isinstance(weather_data["weather"], dict):
+            hours_data = weather_data["weather"].get("hours", [])
+        # If weather_data directly has "hours"
+        elif "hours" in weather_data:
+            hours_data = weather_data["hours"]
+    elif isinstance(weather_data, list):
+        # If weather_data is already the hours array
+        hours_data = weather_data
+    
+    target_hours = ["06:00", "09:00", "12:00", "15:00", "18:00"]
+    filtered_hours = [
+        hour_data for hour_data in hours_data
+        if isinstance(hour_data, dict) and hour_data.get("time") in target_hours
+    ]
+    return {
+        "hours": filtered_hours
+    }
+
+def _validate_time_scheduled(time_scheduled_data) -> list:
+    """Keep only time_scheduled items that have all required fields."""
+    required_fields = ["title", "start", "end", "tempC", "desc", "status"]
+    if not isinstance(time_scheduled_data, list):
+        return []
+    return [
+        item for item in time_scheduled_data
+        if isinstance(item, dict) and all(field in item for field in required_fields)
+    ]
+
 def update_sessions_calendar_by_date(date: str, calendar_events: list):
     """Update calendar events for all sessions on a specific date.
     
@@ -133,53 +181,22 @@ def update_sessions_calendar_by_date(date: str, calendar_events: list):
         Dict with status and message
     """
     try:
-        # Get all sessions for the specified date
-        results = chroma_service.collection.get(where={"date": date})
+        # Extract the events array from the calendar data
+        events_data = _extract_calendar_events(calendar_events)
         
-        if not results['ids']:
+        # Update every session on the date in one batched write
+        result = chroma_service.patch_sessions_by_date({date: {'calendar': {"events": events_data}}})
+        if result["status"] != "success":
+            raise RuntimeError(result.get("message"))
+        if not result["updated"]:
             return {
                 "status": "error",
                 "message": f"No sessions found for date: {date}"
             }
         
-        # Extract the events array from the calendar data
-        # Handle different possible structures from calendar APIs
-        events_data = []
-        if isinstance(calendar_events, dict):
-            # If calendar_events has a nested "calendar" key with "events"
-            if "calendar" in calendar_events and isinstance(calendar_events["calendar"], dict):
-                events_data = calendar_events["calendar"].get("events", [])
-            # If calendar_events directly has "events"
-            elif "events" in calendar_events:
-                events_data = calendar_events["events"]
-            # If calendar_events is already the events array
-            elif isinstance(calendar_events, list):
-                events_data = calendar_events
-        elif isinstance(calendar_events, list):
-            # If calendar_events is already the events array
-            events_data = calendar_events
-        
-        # Create the expected calendar structure
-        calendar_structure = {
-            "events": events_data
-        }
-        
-        # Update each session's calendar metadata
-        for i, session_id in enumerate(results['ids']):
-            current_metadata = results['metadatas'][i]
-            
-            # Update calendar events with the simplified structure
-            current_metadata['calendar'] = json.dumps(calendar_structure)
-            
-            # Update the session
-            chroma_service.collection.update(
-                ids=[session_id],
-                metadatas=[current_metadata]
-            )
-        
         return {
             "status": "success",
-            "message": f"Successfully updated calendar for {len(results['ids'])} sessions on {date}"
+            "message": f"Successfully updated calendar for {len(result['updated'])} sessions on {date}"
         }
         
     except Exception as e:
@@ -200,57 +217,19 @@ def update_sessions_weather_by_date(date: str, weather_data: dict):
     """
     try:
         print(f"[chromaDB_tools] Updating weather for {date}")
-        # Get all sessions for the specified date
-        results = chroma_service.collection.get(where={"date": date})
-        
-        if not results['ids']:
+        # Extract and filter the hours array from the weather data
+        weather_structure = _filter_weather_hours(weather_data)
+        
+        # Update every session on the date in one batched write
+        result = chroma_service.patch_sessions_by_date({date: {'weather': weather_structure}})
+        if result["status"] != "success":
+            raise RuntimeError(result.get("message"))
+        if not result["updated"]:
             return {
                 "status": "error",
                 "message": f"No sessions found for date: {date}"
             }
-        
-        # Extract the hours array from the weather data
-        # Handle different possible structures from the weather API
-        hours_data = []
-        if isinstance(weather_data, dict):
-            # If weather_data has a nested "weather" key with "hours"
-            if "weather" in weather_data and isinstance(weather_data["weather"], dict):
-                hours_data = weather_data["weather"].get("hours", [])
-            # If weather_data directly has "hours"
-            elif "hours" in weather_data:
-                hours_data = weather_data["hours"]
-            # If weather_data is already the hours array
-            elif isinstance(weather_data, list):
-                hours_data = weather_data
-        
-        # Filter hours to only include specific times: 06:00, 09:00, 12:00, 15:00, 18:00
-        target_hours = ["06:00", "09:00", "12:00", "15:00", "18:00"]
-        filtered_hours = []
-        
-        for hour_data in hours_data:
-            if isinstance(hour_data, dict) and "time" in hour_data:
-                # Check if the time matches any of our target hours
-                if hour_data["time"] in target_hours:
-                    filtered_hours.append(hour_data)
-        
-        # Create the expected weather structure with filtered hours
-        weather_structure = {
-            "hours": filtered_hours
-        }
-        
-        # Update each session's weather metadata
-        for i, session_id in enumerate(results['ids']):
-            current_metadata = results['metadatas'][i]
-            
-            # Update weather data with the filtered structure
-            current_metadata['weather'] = json.dumps(weather_structure)
-            
-            # Update the session
-            chroma_service.collection.update(
-                ids=[session_id],
-                metadatas=[current_metadata]
-            )
-        print(f"[chromaDB_tools] Successfully updated weather for {len(results['ids'])} sessions on {date}")
+        print(f"[chromaDB_tools] Successfully updated weather for {len(result['updated'])} sessions on {date}")
         return {
             "status": "success",
             "message": f"success"
@@ -284,41 +263,22 @@ def update_sessions_time_scheduled_by_date(date: str, time_scheduled_data: list)
         Dict with status and message
     """
     try:
-        # Get all sessions for the specified date
-        results = chroma_service.collection.get(where={"date": date})
+        # Validate and prepare time_scheduled data
+        validated_time_scheduled = _validate_time_scheduled(time_scheduled_data)
         
-        if not results['ids']:
+        # Update every session on the date in one batched write
+        result = chroma_service.patch_sessions_by_date({date: {'time_scheduled': validated_time_scheduled}})
+        if result["status"] != "success":
+            raise RuntimeError(result.get("message"))
+        if not result["updated"]:
             return {
                 "status": "error",
                 "message": f"No sessions found for date: {date}"
             }
         
-        # Validate and prepare time_scheduled data
-        validated_time_scheduled = []
-        if isinstance(time_scheduled_data, list):
-            for item in time_scheduled_data:
-                if isinstance(item, dict):
-                    # Ensure all required fields are present
-                    required_fields = ["title", "start", "end", "tempC", "desc", "status"]
-                    if all(field in item for field in required_fields):
-                        validated_time_scheduled.append(item)
-        
-        # Update each session's time_scheduled metadata
-        for i, session_id in enumerate(results['ids']):
-            current_metadata = results['metadatas'][i]
-            
-            # Update time_scheduled data
-            current_metadata['time_scheduled'] = json.dumps(validated_time_scheduled)
-            
-            # Update the session
-            chroma_service.collection.update(
-                ids=[session_id],
-                metadatas=[current_metadata]
-            )
-        
         return {
             "status": "success",
-            "message": f"Successfully updated time_scheduled for {len(results['ids'])} sessions on {date}"
+            "message": f"Successfully updated time_scheduled for {len(result['updated'])} sessions on {date}"
         }
         
     except Exception as e:
@@ -327,6 +287,146 @@ def update_sessions_time_scheduled_by_date(date: str, time_scheduled_data: list)
             "message": f"Error updating sessions time_scheduled by date: {str(e)}"
         }
 
+def update_session_schedule_by_date(date: str,
+                                    weather_data: Optional[dict] = None,
+                                    calendar_events: Optional[list] = None,
+                                    time_scheduled_data: Optional[list] = None):
+    """Update weather, calendar events and time_scheduled for a date in a single write.
+    
+    Use this instead of calling update_sessions_weather_by_date,
+    update_sessions_calendar_by_date and update_sessions_time_scheduled_by_date
+    one after another. Only the arguments provided are updated.
+    
+    Args:
+        date: The date in YYYY-MM-DD format
+        weather_data: Weather data from get_weather_forecast (optional)
+        calendar_events: Calendar events from list_events (optional)
+        time_scheduled_data: List of time scheduled items with title, start, end,
+            tempC, desc and status (optional)
+        
+    Returns:
+        Dict with status and message
+    """
+    try:
+        print(f"[chromaDB_tools] Updating schedule for {date}")
+        updates = {}
+        if weather_data is not None:
+            updates['weather'] = _filter_weather_hours(weather_data)
+        if calendar_events is not None:
+            updates['calendar'] = {"events": _extract_calendar_events(calendar_events)}
+        if time_scheduled_data is not None:
+            updates['time_scheduled'] = _validate_time_scheduled(time_scheduled_data)
+        
+        if not updates:
+            return {
+                "status": "error",
+                "message": "Nothing to update: provide weather_data, calendar_events or time_scheduled_data"
+            }
+        
+        result = chroma_service.patch_sessions_by_date({date: updates})
+        if result["status"] != "success":
+            return {
+                "status": "error",
+                "message": f"Error updating session schedule: {result.get('message')}"
+            }
+        if not result["updated"]:
+            return {
+                "status": "error",
+                "message": f"No sessions found for date: {date}"
+            }
+        
+        print(f"[chromaDB_tools] Successfully updated {', '.join(updates)} for {len(result['updated'])} sessions on {date}")
+        return {
+            "status": "success",
+            "message": f"Successfully updated {', '.join(updates)} for {len(result['updated'])} sessions on {date}"
+        }
+        
+    except Exception as e:
+        print(f"[chromaDB_tools] Error updating session schedule by date: {str(e)}")
+        return {
+            "status": "error",
+            "message": f"Error updating session schedule by date: {str(e)}"
+        }
+
+def update_sessions_weather_by_dates(weather_by_date: dict):
+    """Update weather data for the sessions on several dates (e.g. a whole week) in one write.
+    
+    Args:
+        weather_by_date: Mapping of date (YYYY-MM-DD) to the weather data returned by
+            get_weather_forecast for that date, e.g. {"2025-06-16": {...}, "2025-06-17": {...}}
+        
+    Returns:
+        Dict with status, message, updated session count and dates without a session
+    """
+    try:
+        print(f"[chromaDB_tools] Updating weather for {len(weather_by_date)} dates")
+        patches = {
+            date: {'weather': _filter_weather_hours(weather_data)}
+            for date, weather_data in weather_by_date.items()
+        }
+        result = chroma_service.patch_sessions_by_date(patches)
+        if result["status"] != "success":
+            raise RuntimeError(result.get("message"))
+        
+        print(f"[chromaDB_tools] Successfully updated weather for {len(result['updated'])} sessions")
+        return {
+            "status": "success",
+            "message": f"Successfully updated weather for {len(result['updated'])} sessions",
+            "sessions_updated": len(result['updated']),
+            "dates_without_session": result['missing']
+        }
+        
+    except Exception as e:
+        print(f"[chromaDB_tools] Error updating sessions weather by dates: {str(e)}")
+        return {
+            "status": "error",
+            "message": f"Error updating sessions weather by dates: {str(e)}"
+        }
+
+def update_session_schedules_by_dates(schedules_by_date: dict):
+    """Update weather, calendar events and time_scheduled for several dates in one write.
+    
+    Args:
+        schedules_by_date: Mapping of date (YYYY-MM-DD) to a dict with any of
+            "weather_data", "calendar_events" and "time_scheduled_data", e.g.
+            {"2025-06-16": {"weather_data": {...}, "calendar_events": [...]}}
+        
+    Returns:
+        Dict with status, message, updated session count and dates without a session
+    """
+    try:
+        print(f"[chromaDB_tools] Updating schedules for {len(schedules_by_date)} dates")
+        patches = {}
+        for date, schedule in schedules_by_date.items():
+            updates = {}
+            if schedule.get("weather_data") is not None:
+                updates['weather'] = _filter_weather_hours(schedule["weather_data"])
+            if schedule.get("calendar_events") is not None:
+                updates['calendar'] = {"events": _extract_calendar_events(schedule["calendar_events"])}
+            if schedule.get("time_scheduled_data") is not None:
+                updates['time_scheduled'] = _validate_time_scheduled(schedule["time_scheduled_data"])
+            if updates:
+                patches[date] = updates
+        
+        result = chroma_service.patch_sessions_by_date(patches)
+        if result["status"] != "success":
+            raise RuntimeError(result.get("message"))
+        
+        print(f"[chromaDB_tools] Successfully updated schedules for {len(result['updated'])} sessions")
+        return {
+            "status": "success",
+            "message": f"Successfully updated schedules for {len(result['updated'])} sessions",
+            "sessions_updated": len(result['updated']),
+            "dates_without_session": result['missing']
+        }
+        
+    except Exception as e:
+        print(f"[chromaDB_tools] Error updating session schedules by dates: {str(e)}")
+        return {
+            "status": "error",
+            "message": f"Error updating session schedules by dates: {str(e)}"
+        }
+
 def mark_session_completed_by_date(date: str, id: int, actual_distance: int, actual_start: str, data_points: dict):
     """Mark the session as completed and optionally update the actual start time in time_scheduled and actual distance.
     
@@ -357,46 +457,33 @@ def mark_session_completed_by_date(date: str, id: int, actual_distance: int, act
         Dict with status and message
     """
     try:
-        # Get the session for the specified date (only one session per day)
-        results = chroma_service.collection.get(where={"date": date})
-        if not results['ids']:
+        updates = {
+            # Mark session as completed
+            'session_completed': True,
+            # Link the session to the activity
+            'activity_id': id,
+            # Update the actual distance
+            'actual_distance': actual_distance,
+            'data_points': data_points
+        }
+        
+        # Update actual start time of the first time_scheduled slot if provided
+        if actual_start:
+            updates['actual_start'] = actual_start
+        
+        # Update the session in a single write (only one session per day)
+        result = chroma_service.patch_sessions_by_date({date: updates})
+        if result["status"] != "success":
+            return {
+                "status": "error",
+                "message": f"Error marking session as completed: {result.get('message')}"
+            }
+        if not result["updated"]:
             return {
                 "status": "error",
                 "message": f"No session found for date: {date}"
             }
         
-        # Get the single session (there's only one per day)
-        session_id = results['ids'][0]
-        current_metadata = results['metadatas'][0]
-        
-        # Mark session as completed
-        current_metadata['session_completed'] = True
-
-        # Link the session to the activity
-        current_metadata['activity_id'] = id
-
-        # Update the actual distance
-        current_metadata['actual_distance'] = actual_distance
-
-        current_metadata['data_points'] = json.dumps(data_points)
-        
-        # Update actual start time in time_scheduled if provided
-        if actual_start and 'time_scheduled' in current_metadata:
-            try:
-                time_scheduled_data = json.loads(current_metadata['time_scheduled'])
-                if isinstance(time_scheduled_data, list) and len(time_scheduled_data) > 0:
-                    # Update the first time_scheduled item with actual_start
-                    time_scheduled_data[0]['actual_start'] = actual_start
-                    current_metadata['time_scheduled'] = json.dumps(time_scheduled_data)
-            except (json.JSONDecodeError, KeyError, IndexError) as e:
-                print(f"Warning: Could not update time_scheduled with actual_start: {e}")
-        
-        # Update the session
-        chroma_service.collection.update(
-            ids=[session_id],
-            metadatas=[current_metadata]
-        )
-        
         print(f"Updated successfully session status for {date} and linking to activity {id}")
         return {
             "status": "success",
@@ -411,7 +498,7 @@ def mark_session_completed_by_date(date: str, id: int, actual_distance: int, act
         }
 
 def write_activity_data(activity_data: Dict[str, Any]):
-    """Store activity data with combined laps and streams in ChromaDB.
+    """Store activity data with combined laps and streams in the activity store.
     
     Args:
         activity_data: Dictionary containing activity data with structure:
@@ -454,45 +541,16 @@ def write_activity_data(activity_data: Dict[str, Any]):
                 "activity_id": None
             }
         
-        # Convert activity_id to string for ChromaDB
-        activity_id_str = str(activity_id)
-        
-        # Prepare the document content (use activity name as document)
         metadata = activity_data.get("metadata", {})
-        document_text = metadata.get("name", f"Activity {activity_id}")
-        
-        # Prepare metadata for ChromaDB - convert complex types to JSON strings
-        # BUT exclude data_points from metadata to avoid duplication
-        metadata_for_storage = {}
-        for key, value in metadata.items():
-            if key == "data_points":
-                # Skip data_points - it will be stored separately
-                continue
-            elif isinstance(value, (list, dict)):
-                # Convert lists and dicts to JSON strings for ChromaDB compatibility
-                metadata_for_storage[key] = json.dumps(value)
-            else:
-                # Keep primitive types as-is
-                metadata_for_storage[key] = value
-        
-        # Add data_points as a separate field (not in metadata)
-        data_points = activity_data.get("data_points")
-        if data_points:
-            # Store the complete data_points structure with both laps and streams
-            metadata_for_storage["data_points"] = json.dumps(data_points)
-            
-            # Also store individual counts for easy access
-            if isinstance(data_points, dict):
-                metadata_for_storage["laps_count"] = len(data_points.get("laps", []))
-                metadata_for_storage["streams_count"] = len(data_points.get("streams", []))
-        
-        # Store in ChromaDB using the activity_id as the unique identifier
-        # Store data_points separately from metadata to avoid duplication
-        chroma_service.collection.add(
-            documents=[document_text],
-            metadatas=[metadata_for_storage],
-            ids=[activity_id_str]
-        )
+        data_points = activity_data.get("data_points") or {}
+        
+        # Activities go to their own store, streams apart from the summary and laps
+        if not chroma_service.store_activity(activity_id, metadata, data_points):
+            return {
+                "status": "error",
+                "message": f"Error storing activity data for activity_id: {activity_id}",
+                "activity_id": None
+            }
         print(f"Successfully stored data for activity_id: {activity_id}")
         return {
             "status": "success",
@@ -520,48 +578,13 @@ def get_activity_by_id(activity_id: int):
     """
     try:
         print(f"Getting activity data by ID: {activity_id}")
-        activity_id_str = str(activity_id)
-        results = chroma_service.collection.get(ids=[activity_id_str])
+        result = chroma_service.get_activity_by_id(activity_id)
         
-        if not results['ids']:
-            return {
-                "status": "error",
-                "message": f"No activity found with ID: {activity_id}",
-                "activity_data": None
-            }
+        if result["status"] != "success":
+            return result
         
-        # Reconstruct the activity data structure
-        document = results['documents'][0]
-        metadata = results['metadatas'][0]
-        
-        # Parse JSON strings back to their original types
-        parsed_metadata = {}
-        data_points = {}
-        
-        for key, value in metadata.items():
-            if key == "data_points" and value:
-                # Parse data_points back to dict and store separately
-                # DO NOT add to parsed_metadata to avoid duplication
-                data_points = json.loads(value)
-            elif isinstance(value, str) and (value.startswith('[') or value.startswith('{')):
-                # Try to parse other JSON strings (lists and dicts)
-                try:
-                    parsed_metadata[key] = json.loads(value)
-                except json.JSONDecodeError:
-                    # If it's not valid JSON, keep as string
-                    parsed_metadata[key] = value
-            else:
-                # Keep primitive types as-is
-                parsed_metadata[key] = value
-        
-        # No need to remove data_points from metadata since we never added it
-        # The data_points is already handled separately above
-        
-        activity_data = {
-            "activity_id": activity_id,
-            "metadata": parsed_metadata,  # metadata without data_points
-            "data_points": data_points    # data_points as separate field
-        }
+        activity_data = result["activity_data"]
+        activity_data["activity_id"] = activity_id
         
         return {
             "status": "success",
@@ -589,128 +612,7 @@ def get_weekly_sessions(start_date: str) -> Dict:
             - summary: Weekly summary statistics
             - message: Description of the result
     """
-    try:
-        from datetime import datetime, timedelta
-            
-        # Validate start_date format
-        try:
-            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-        except ValueError:
-            return {
-                "status": "error",
-                "data": None,
-                "summary": None,
-                "message": "Invalid date format. Use YYYY-MM-DD"
-            }
-            
-        days_since_monday = start_dt.weekday()
-        # Calculate the Monday of the current week
-        monday_dt = start_dt - timedelta(days=days_since_monday)
-        # Calculate the Sunday of the current week (6 days after Monday)
-        sunday_dt = monday_dt + timedelta(days=6)
-        # Format the datetime objects back into 'YYYY-MM-%d' strings
-        start_date_of_week = monday_dt.strftime("%Y-%m-%d")
-        end_date_of_week = sunday_dt.strftime("%Y-%m-%d")   
-        # Get all sessions for the week by querying each day individually
-        daily_sessions = {}
-      
-        for i in range(7):
-            current_date = (monday_dt + timedelta(days=i)).strftime("%Y-%m-%d")               
-            # Get sessions for this specific date
-            results = chroma_service.collection.get(
-                    where={"date": current_date}
-            )           
-            # Check if we have any results for this date
-            if (results and 'ids' in results and results['ids'] and 
-                len(results['ids']) > 0):
-                    
-                # Deserialize JSON strings in metadata
-                if 'metadatas' in results and results['metadatas'] and len(results['metadatas']) > 0:
-                    for j, metadata in enumerate(results['metadatas']):
-                        results['metadatas'][j] = chroma_service._deserialize_metadata(metadata)                  
-                # Process the results for this date
-                for j in range(len(results['ids'])):
-                    session_date = results['metadatas'][j].get('date', '')
-                    daily_sessions[session_date] = {
-                        'id': results['ids'][j],
-                        'session': results['documents'][j],
-                        'metadata': results['metadatas'][j]
-                    }
-            
-        # Create a complete week structure (Monday to Sunday)
-        week_data = []
-        total_distance_planned = 0
-        total_distance_completed = 0
-        total_sessions = 0
-        completed_sessions = 0
-            
-        for i in range(7):
-            current_date = (monday_dt + timedelta(days=i)).strftime("%Y-%m-%d")
-            day_name = (monday_dt + timedelta(days=i)).strftime("%A")
-                
-            if current_date in daily_sessions:
-                session_data = daily_sessions[current_date]
-                metadata = session_data['metadata']               
-                # Extract session information
-                session_type = metadata.get('type', 'No Session')
-                actual_distance = metadata.get('actual_distance', 0)
-                planned_distance = metadata.get('distance', 0)
-                session_completed = metadata.get('session_completed', False)          
-                # Update totals
-                if session_type != 'Rest Day' and planned_distance > 0:
-                    total_sessions += 1
-                    total_distance_planned += planned_distance
-                    total_distance_completed += actual_distance            
-                if session_completed:
-                    completed_sessions += 1     
-                week_data.append({
-                    'date': current_date,
-                    'day_name': day_name,
-                    'session_type': session_type,
-                    'planned_distance': planned_distance,
-                    'actual_distance': actual_distance,
-                    'session_completed': session_completed,
-                    'has_activity': session_type != 'Rest Day' and actual_distance > 0,
-                    'is_today': current_date == datetime.now().strftime("%Y-%m-%d")
-                })
-            else:
-                # No session data for this day
-                week_data.append({
-                    'date': current_date,
-                    'day_name': day_name,
-                    'session_type': 'No Session',
-                    'planned_distance': 0,
-                    'actual_distance': 0,
-                    'session_completed': False,
-                    'has_activity': False,
-                    'is_today': current_date == datetime.now().strftime("%Y-%m-%d")
-                })  
-        # Create weekly summary
-        summary = {
-            'total_distance_planned': total_distance_planned,
-            'total_distance_completed': total_distance_completed,
-            'total_sessions': total_sessions,
-            'completed_sessions': completed_sessions,
-            'completion_rate': (completed_sessions / total_sessions * 100) if total_sessions > 0 else 0,
-            'week_start': start_date_of_week,
-            'week_end': end_date_of_week
-        }
-            
-        return {
-            "status": "success",
-            "data": week_data,
-            "summary": summary,
-            "message": f"Weekly data retrieved for {start_date_of_week} to {end_date_of_week}"
-        }
-            
-    except Exception as e:
-        print(f"Error in get_weekly_sessions: {str(e)}")
-        return {
-            "status": "error",
-            "data": None,
-            "summary": None,
-            "message": f"Error retrieving weekly sessions: {str(e)}"
-        }
+    return chroma_service.get_weekly_sessions(start_date)
 
 def update_session_with_analysis(date: str, coach_feedback: str):
     """Update session data with coach feedback.
@@ -725,26 +627,18 @@ def update_session_with_analysis(date: str, coach_feedback: str):
     try:
         # Get the session for the specified date
         print(f"[chromaDB_tools] Updating session with coach feedback for {date}")
-        results = chroma_service.collection.get(where={"date": date})        
-        if not results['ids']:
+        result = chroma_service.patch_sessions_by_date({date: {'coach_feedback': coach_feedback}})
+        if result["status"] != "success":
+            return {
+                "status": "error",
+                "message": f"Error updating session analysis: {result.get('message')}"
+            }
+        if not result["updated"]:
             return {
                 "status": "error",
                 "message": f"No session found for date: {date}"
             }
         
-        # Get the single session (there's only one per day)
-        session_id = results['ids'][0]
-        current_metadata = results['metadatas'][0]
-        
-        # Add coach feedback
-        current_metadata['coach_feedback'] = coach_feedback
-        
-        # Update the session
-        chroma_service.collection.update(
-            ids=[session_id],
-            metadatas=[current_metadata]
-        )
-        
         print(f"Successfully updated session with coach feedback for {date}")
         return {
             "status": "success",
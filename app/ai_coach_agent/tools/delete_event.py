@@ -3,6 +3,7 @@ Delete event tool for Google Calendar integration.
 """
 
 from .calendar_utils import get_calendar_service
+from .calendar_sync import record_event_change
 
 
 def delete_event(
@@ -42,6 +43,8 @@ def delete_event(
         # Call the Calendar API to delete the event
         service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
 
+        record_event_change(deleted_event_id=event_id, calendar_id=calendar_id)
+
         print(f"[CalendarAPI_tool] FINISH: Event deleted")
         return {
             "status": "success",
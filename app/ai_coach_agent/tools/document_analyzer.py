@@ -4,9 +4,15 @@ RAG knowledge chunking tools for processing document content and creating search
 
 import json
 import hashlib
-from typing import Dict, List, Any, Optional
+import re
+from collections import deque
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from datetime import datetime
 from .chromaDB_tools import chroma_service
+from .rag_embeddings import EMBED_BATCH_SIZE, EMBED_WORKERS, embed_texts
+
+# Chunks handed to the embedding stage at a time: one batch per embedding worker
+STREAM_BATCH_CHUNKS = EMBED_BATCH_SIZE * EMBED_WORKERS
 
 def create_rag_chunks(
     content: str, 
@@ -29,7 +35,7 @@ def create_rag_chunks(
         Dict containing:
             - status: "success" or "error"
             - chunks_created: Number of chunks created
-            - chunks: List of created chunks
+            - chunks: List of created chunks (id, title, section)
     """
     try:
         print(f"[RAG_AGENT tool] Creating RAG chunks for category: {category}")
@@ -44,15 +50,26 @@ def create_rag_chunks(
                 'uploaded_at': datetime.now().isoformat()
             }
         
-        # Split content into chunks (200-500 words each)
-        chunks = _split_into_chunks(content, target_size=300)
+        # Document metadata shared by every chunk
+        document_metadata = {}
+        if metadata.get('title'):
+            document_metadata['document_title'] = metadata['title']
+        if metadata.get('author') or metadata.get('authors'):
+            document_metadata['authors'] = metadata.get('author') or metadata.get('authors')
+        if metadata.get('year'):
+            document_metadata['document_year'] = metadata['year']
+        if metadata.get('journal'):
+            document_metadata['journal'] = metadata['journal']
+        if metadata.get('doi'):
+            document_metadata['doi'] = metadata['doi']
+        if metadata.get('abstract'):
+            document_metadata['abstract'] = metadata['abstract']
         
-        # Prepare chunks for storage
+        # Chunks are stored in groups as the chunker produces them, so the
+        # embedding stage starts before the whole document is chunked
         rag_chunks = []
-        for i, chunk_content in enumerate(chunks):
-            if not chunk_content.strip():
-                continue
-                
+        pending_chunks = []
+        for i, (chunk_content, section) in enumerate(_iter_chunks(content, target_tokens=300, overlap_tokens=50)):
             chunk_id = f"{file_info['doc_id']}_chunk_{i+1:03d}"
             
             # Extract title from chunk (first sentence or first 50 chars)
@@ -67,33 +84,28 @@ def create_rag_chunks(
                 "source": file_info['file_name'],
                 "document_id": file_info['doc_id'],
                 "chunk_index": i + 1,
-                "total_chunks": len(chunks),
-                "created_at": datetime.now().isoformat()
+                "created_at": datetime.now().isoformat(),
+                **document_metadata
             }
+            if section:
+                chunk_metadata['section'] = section
             
-            # Add document metadata if available
-            if metadata.get('title'):
-                chunk_metadata['document_title'] = metadata['title']
-            if metadata.get('author') or metadata.get('authors'):
-                chunk_metadata['authors'] = metadata.get('author') or metadata.get('authors')
-            if metadata.get('year'):
-                chunk_metadata['document_year'] = metadata['year']
-            if metadata.get('journal'):
-                chunk_metadata['journal'] = metadata['journal']
-            if metadata.get('doi'):
-                chunk_metadata['doi'] = metadata['doi']
-            if metadata.get('abstract'):
-                chunk_metadata['abstract'] = metadata['abstract']
-            
-            rag_chunks.append({
+            pending_chunks.append({
                 "id": chunk_id,
                 "content": chunk_content,
                 "metadata": chunk_metadata
             })
+            rag_chunks.append({"id": chunk_id, "title": title, "section": section})
+            
+            if len(pending_chunks) >= STREAM_BATCH_CHUNKS:
+                _store_chunks_in_rag_knowledge(pending_chunks)
+                pending_chunks = []
         
-        # Store chunks in ChromaDB
+        # Store the remaining chunks in ChromaDB
+        if pending_chunks:
+            _store_chunks_in_rag_knowledge(pending_chunks)
         if rag_chunks:
-            _store_chunks_in_rag_knowledge(rag_chunks)
+            _finalize_document_chunks(file_info['doc_id'], [chunk["id"] for chunk in rag_chunks])
         
         print(f"[RAG_AGENT] Successfully created {len(rag_chunks)} RAG chunks")
         
@@ -113,46 +125,143 @@ def create_rag_chunks(
             "message": f"Error creating RAG chunks: {str(e)}"
         }
 
-def _split_into_chunks(content: str, target_size: int = 300) -> List[str]:
-    """Split content into chunks of approximately target_size words."""
-    words = content.split()
-    chunks = []
+# Markdown headings, numbered headings ("2.1 Results") and short ALL-CAPS lines
+_HEADING = re.compile(
+    r"^(#{1,6}\s+\S.*|(\d+(\.\d+)*\.?|[IVX]+\.)\s+[A-Z][^.!?]*|[A-Z][A-Z0-9 ,:&/()'-]{2,})$"
+)
+_MAX_HEADING_WORDS = 12
+# "1. Warm up" / "2) Intervals": a list item rather than a heading when a neighbouring line is one too
+_LIST_ITEM = re.compile(r"^\d+[.)]\s+\S")
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+
+
+class _ChunkBuffer:
+    """Sentences of the chunk being built, with the overlap carried from the previous chunk."""
     
-    current_chunk = []
-    current_size = 0
+    def __init__(self, target_tokens: int, overlap_tokens: int):
+        self.target_tokens = target_tokens
+        self.overlap_tokens = overlap_tokens
+        self.sentences = deque()
+        self.size = 0
+        self.fresh = 0  # tokens not carried over from the previous chunk
     
-    for word in words:
-        current_chunk.append(word)
-        current_size += 1
-        
-        # Check if we should create a chunk
-        if current_size >= target_size:
-            # Look for sentence boundary
-            chunk_text = " ".join(current_chunk)
-            
-            # Try to break at sentence boundary
-            last_period = chunk_text.rfind('.')
-            last_exclamation = chunk_text.rfind('!')
-            last_question = chunk_text.rfind('?')
-            
-            break_point = max(last_period, last_exclamation, last_question)
-            
-            if break_point > target_size // 2:  # If we found a good break point
-                chunks.append(chunk_text[:break_point + 1].strip())
-                remaining_text = chunk_text[break_point + 1:].strip()
-                current_chunk = remaining_text.split() if remaining_text else []
-                current_size = len(current_chunk)
-            else:
-                # No good break point, create chunk as is
-                chunks.append(chunk_text.strip())
-                current_chunk = []
-                current_size = 0
+    def add(self, sentence: str, tokens: int) -> Optional[str]:
+        """Append a sentence; returns the finished chunk if the sentence starts a new one."""
+        chunk = None
+        if self.fresh and self.size + tokens > self.target_tokens:
+            chunk = self.flush(keep_overlap=True)
+        self.sentences.append((sentence, tokens))
+        self.size += tokens
+        self.fresh += tokens
+        return chunk
     
-    # Add remaining words as final chunk
-    if current_chunk:
-        chunks.append(" ".join(current_chunk).strip())
+    def flush(self, keep_overlap: bool) -> Optional[str]:
+        """Finish the current chunk, keeping its last sentences as overlap if requested."""
+        if not self.fresh:
+            # Only overlap left: it is already part of the previous chunk
+            if not keep_overlap:
+                self.sentences.clear()
+                self.size = 0
+            return None
+        
+        text = " ".join(sentence for sentence, _ in self.sentences)
+        kept = deque()
+        kept_size = 0
+        while (keep_overlap and self.sentences
+               and kept_size + self.sentences[-1][1] <= self.overlap_tokens):
+            sentence = self.sentences.pop()
+            kept.appendleft(sentence)
+            kept_size += sentence[1]
+        self.sentences = kept
+        self.size = kept_size
+        self.fresh = 0
+        return text
+
+
+def _iter_chunks(content: str,
+                 target_tokens: int = 300,
+                 overlap_tokens: int = 50) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Split content into chunks in a single pass, yielding each chunk as soon as it is complete.
+    
+    Chunks end on sentence boundaries once they reach target_tokens (whitespace-separated
+    words), start with the last sentences of the previous chunk up to overlap_tokens, and
+    never cross a section heading; the heading opens the first chunk of its section.
+    Consecutive numbered lines are list items, each kept as its own sentence.
     
-    return [chunk for chunk in chunks if chunk.strip()]
+    Args:
+        content: Extracted text content
+        target_tokens: Token budget per chunk
+        overlap_tokens: Tokens repeated from the end of the previous chunk
+        
+    Yields:
+        (chunk_text, section) tuples, section being the current heading or None
+    """
+    overlap_tokens = max(0, min(overlap_tokens, target_tokens // 2))
+    buffer = _ChunkBuffer(target_tokens, overlap_tokens)
+    section = None
+    pending = ""  # sentence continued on the next line
+    
+    def add_sentence(sentence):
+        words = sentence.split()
+        if len(words) <= target_tokens:
+            return [chunk for chunk in [buffer.add(sentence, len(words))] if chunk]
+        # A sentence longer than the budget is cut into word windows
+        step = max(target_tokens - overlap_tokens, 1)
+        chunks = []
+        for i in range(0, len(words), step):
+            chunk = buffer.add(" ".join(words[i:i + step]), len(words[i:i + step]))
+            if chunk:
+                chunks.append(chunk)
+        return chunks
+    
+    lines = [line.strip() for line in content.splitlines() if line.strip()]
+    for i, line in enumerate(lines):
+        is_list_item = bool(_LIST_ITEM.match(line)) and any(
+            0 <= j < len(lines) and _LIST_ITEM.match(lines[j]) for j in (i - 1, i + 1)
+        )
+        if is_list_item:
+            if pending:
+                for chunk in add_sentence(pending):
+                    yield chunk, section
+                pending = ""
+            for chunk in add_sentence(line):
+                yield chunk, section
+            continue
+        
+        # Only markdown headings may interrupt a sentence continued from the previous line
+        is_heading = (len(line.split()) <= _MAX_HEADING_WORDS and _HEADING.match(line)
+                      and (not pending or line.startswith("#")))
+        if is_heading:
+            if pending:
+                for chunk in add_sentence(pending):
+                    yield chunk, section
+                pending = ""
+            # A previous heading with no text stays in the buffer and opens this chunk
+            if not (buffer.fresh and len(buffer.sentences) == 1 and buffer.sentences[0][0] == section):
+                chunk = buffer.flush(keep_overlap=False)
+                if chunk:
+                    yield chunk, section
+            section = line.lstrip("#").strip()
+            for chunk in add_sentence(section):
+                yield chunk, section
+            continue
+        
+        parts = _SENTENCE_BREAK.split(f"{pending} {line}" if pending else line)
+        pending = parts.pop()
+        if pending[-1] in ".!?" or len(pending.split()) >= target_tokens:
+            parts.append(pending)
+            pending = ""
+        for sentence in parts:
+            for chunk in add_sentence(sentence):
+                yield chunk, section
+    
+    if pending:
+        for chunk in add_sentence(pending):
+            yield chunk, section
+    chunk = buffer.flush(keep_overlap=False)
+    if chunk:
+        yield chunk, section
 
 def _extract_chunk_title(chunk_content: str) -> str:
     """Extract a title from chunk content."""
@@ -170,26 +279,41 @@ def _extract_chunk_title(chunk_content: str) -> str:
             title = title[:47] + "..."
         return title
 
+def _rag_collection():
+    """Get or create the RAG knowledge collection."""
+    return chroma_service.client.get_or_create_collection(
+        name="rag_knowledge",
+        metadata={"description": "RAG knowledge base for running training insights"}
+    )
+
+def _finalize_document_chunks(doc_id: str, chunk_ids: List[str]) -> None:
+    """Record the chunk count on every chunk and drop chunks left from an earlier, longer version."""
+    rag_collection = _rag_collection()
+    rag_collection.update(ids=chunk_ids, metadatas=[{"total_chunks": len(chunk_ids)}] * len(chunk_ids))
+    rag_collection.delete(where={"$and": [{"document_id": doc_id}, {"chunk_index": {"$gt": len(chunk_ids)}}]})
+    chroma_service.rag_index.delete_document(doc_id, keep=chunk_ids)
+
 def _store_chunks_in_rag_knowledge(chunks: List[Dict[str, Any]]) -> None:
     """Store chunks in the RAG knowledge ChromaDB collection."""
     try:
-        # Get or create RAG knowledge collection
-        rag_collection = chroma_service.client.get_or_create_collection(
-            name="rag_knowledge",
-            metadata={"description": "RAG knowledge base for running training insights"}
-        )
+        rag_collection = _rag_collection()
         
         # Prepare data for ChromaDB
         documents = [chunk["content"] for chunk in chunks]
         metadatas = [chunk["metadata"] for chunk in chunks]
         ids = [chunk["id"] for chunk in chunks]
         
-        # Add chunks to collection
-        rag_collection.add(
+        # Embed outside Chroma so cached vectors are reused and new ones are batched
+        embeddings = embed_texts(documents)
+        
+        # Upsert so re-ingesting a document refreshes its chunks instead of being skipped
+        rag_collection.upsert(
             documents=documents,
+            embeddings=embeddings,
             metadatas=metadatas,
             ids=ids
         )
+        chroma_service.rag_index.upsert(ids, documents, metadatas)
         
         print(f"[RAG_AGENT] Successfully stored {len(chunks)} chunks in RAG knowledge base")
         
@@ -2,7 +2,8 @@
 Edit event tool for Google Calendar integration.
 """
 
-from .calendar_utils import get_calendar_service, parse_datetime
+from .calendar_utils import build_event_body, get_calendar_service, get_calendar_timezone
+from .calendar_sync import record_event_change
 
 
 def edit_event(
@@ -37,46 +38,13 @@ def edit_event(
         # Always use primary calendar
         calendar_id = "primary"
 
-        # Combine date and times
-        start_datetime = f"{date} {start_time}"
-        end_datetime = f"{date} {end_time}"
-
-        # Parse times
-        start_dt = parse_datetime(start_datetime)
-        end_dt = parse_datetime(end_datetime)
-
-        if not start_dt or not end_dt:
+        # Build the event in the calendar's timezone (read once per process)
+        event_body = build_event_body(date, start_time, end_time, title, get_calendar_timezone(service))
+        if not event_body:
             return {
                 "status": "error",
                 "message": "Invalid date/time format. Please use YYYY-MM-DD for date and HH:MM for time.",
             }
-
-        # Dynamically determine timezone
-        timezone_id = "America/New_York"  # Default to Eastern Time
-
-        try:
-            # Try to get the timezone from the calendar settings
-            settings = service.settings().list().execute()
-            for setting in settings.get("items", []):
-                if setting.get("id") == "timezone":
-                    timezone_id = setting.get("value")
-                    break
-        except Exception:
-            # If we can't get it from settings, we'll use the default
-            pass
-
-        # Create event body without type annotations
-        event_body = {}
-
-        # Add title
-        event_body["summary"] = title
-
-        # Add start and end times with the dynamically determined timezone
-        event_body["start"] = {
-            "dateTime": start_dt.isoformat(),
-            "timeZone": timezone_id,
-        }
-        event_body["end"] = {"dateTime": end_dt.isoformat(), "timeZone": timezone_id}
         event_body["id"] = event_id
 
         # Update the event
@@ -86,6 +54,8 @@ def edit_event(
             .execute()
         )
 
+        record_event_change(event=updated_event, calendar_id=calendar_id)
+
         print(f"[CalendarAPI_tool] FINISH: Event updated")
         return {
             "status": "success",
@@ -0,0 +1,159 @@
+"""
+Local text extraction for uploaded documents.
+
+PDFs are read page by page from their text layer (pypdf), DOCX files
+paragraph by paragraph with headings marked in markdown style
+(python-docx), and spreadsheets row by row (openpyxl, read-only). Parsed
+results are cached as JSON under data/parsed, keyed by the SHA-256 of the
+file content, so re-reading an upload costs a hash instead of a parse.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+PARSED_DIR = Path(__file__).resolve().parents[2] / "data" / "parsed"
+
+# Bump when the extracted format changes so old cache entries are ignored
+EXTRACTOR_VERSION = 1
+
+PDF_EXTENSIONS = {".pdf"}
+DOCX_EXTENSIONS = {".docx"}
+SPREADSHEET_EXTENSIONS = {".xlsx", ".xlsm"}
+SUPPORTED_EXTENSIONS = PDF_EXTENSIONS | DOCX_EXTENSIONS | SPREADSHEET_EXTENSIONS
+
+
+def file_hash(path: str) -> str:
+    """SHA-256 of the file content, read in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def iter_pdf_pages(path: str) -> Iterator[Tuple[int, str]]:
+    """Yield (page_number, text) for each page of a PDF's text layer."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    for number, page in enumerate(reader.pages, start=1):
+        text = page.extract_text() or ""
+        # Collapse the runs of spaces the text layer often contains
+        yield number, "\n".join(" ".join(line.split()) for line in text.splitlines() if line.strip())
+
+
+def iter_docx_blocks(path: str) -> Iterator[str]:
+    """Yield the paragraphs of a DOCX file, headings prefixed with '#', then its tables as rows."""
+    import docx
+
+    document = docx.Document(path)
+    for paragraph in document.paragraphs:
+        text = paragraph.text.strip()
+        if not text:
+            continue
+        style = paragraph.style.name if paragraph.style is not None else ""
+        if style.startswith("Heading") and style[7:].strip().isdigit():
+            text = f"{'#' * int(style[7:])} {text}"
+        elif style == "Title":
+            text = f"# {text}"
+        yield text
+    for table in document.tables:
+        for row in table.rows:
+            cells = [cell.text.strip() for cell in row.cells]
+            if any(cells):
+                yield " | ".join(cells)
+
+
+def _cell_value(value: Any) -> Any:
+    if isinstance(value, datetime.datetime):
+        return value.strftime("%Y-%m-%d") if value.time() == datetime.time() else value.isoformat()
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def iter_sheet_rows(path: str) -> Iterator[Tuple[str, List[Any]]]:
+    """Yield (sheet_name, row_values) for every non-empty row of a workbook."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            for row in sheet.iter_rows(values_only=True):
+                values = [_cell_value(value) for value in row]
+                while values and values[-1] in (None, ""):
+                    values.pop()
+                if values:
+                    yield sheet.title, values
+    finally:
+        workbook.close()
+
+
+def _rows_to_records(rows: List[List[Any]]) -> List[Dict[str, Any]]:
+    """Use the first row as the header and turn the following rows into dicts."""
+    if not rows:
+        return []
+    header = [str(name).strip() if name not in (None, "") else f"column_{i + 1}" for i, name in enumerate(rows[0])]
+    records = []
+    for row in rows[1:]:
+        record = {header[i] if i < len(header) else f"column_{i + 1}": value
+                  for i, value in enumerate(row) if value not in (None, "")}
+        if record:
+            records.append(record)
+    return records
+
+
+def _parse(path: str, extension: str) -> Dict[str, Any]:
+    if extension in PDF_EXTENSIONS:
+        pages = [text for _, text in iter_pdf_pages(path)]
+        return {"format": "pdf", "pages": pages}
+    if extension in DOCX_EXTENSIONS:
+        return {"format": "docx", "text": "\n".join(iter_docx_blocks(path))}
+    sheets: Dict[str, List[List[Any]]] = {}
+    for sheet_name, values in iter_sheet_rows(path):
+        sheets.setdefault(sheet_name, []).append(values)
+    return {"format": "xlsx", "sheets": {name: _rows_to_records(rows) for name, rows in sheets.items()}}
+
+
+def extract_file(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract a PDF, DOCX or spreadsheet, using the parsed-result cache.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        dict: {"format": "pdf", "pages": [...]}, {"format": "docx", "text": ...} or
+              {"format": "xlsx", "sheets": {name: [row dicts]}}, plus "file_hash";
+              None if the file type is not supported
+    """
+    extension = Path(path).suffix.lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        return None
+
+    digest = file_hash(path)
+    cache_path = PARSED_DIR / f"{digest}.json"
+    if cache_path.exists():
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            if cached.get("version") == EXTRACTOR_VERSION:
+                print(f"[FileReader_tool] Using cached extraction of {path}")
+                return cached["result"]
+        except (OSError, ValueError):
+            pass
+
+    result = {**_parse(path, extension), "file_hash": digest}
+
+    PARSED_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=PARSED_DIR, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"version": EXTRACTOR_VERSION, "result": result}, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, cache_path)
+    return result
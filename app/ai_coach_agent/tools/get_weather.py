@@ -1,111 +1,90 @@
-import requests
-import xml.etree.ElementTree as ET
-import os
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from dotenv import load_dotenv
+from datetime import datetime
+from typing import Dict, Optional
 
-# Load environment variables
-load_dotenv()
+from .weather_provider import date_range, get_forecasts
+from .chromaDB_tools import update_sessions_weather_by_dates
 
 def get_weather_forecast(date: Optional[str] = None) -> Dict:
     """
     Get weather forecast for a specific date.
-    
+
     Args:
         date: Date in YYYY-MM-DD format. If None, uses today's date.
-        
+
     Returns:
         Dict containing weather forecast data with current conditions and hourly forecast
     """
     print(f"[WeatherAPI_tool] START: Getting weather forecast for {date}")
-    # Get API key from environment variable or use fallback
-    api_key = os.getenv("WORLDWEATHER_API_KEY")
 
-    # Hardcoded coordinates for London
-    lat = "51.59"
-    lon = "-0.24"
-    
     # Use today's date if none provided
     if date is None:
         date = datetime.now().strftime("%Y-%m-%d")
-    
-    # Build URL with parameters
-    url = f"http://api.worldweatheronline.com/premium/v1/weather.ashx"
-    params = {
-        "key": api_key,
-        "date": date,
-        "q": f"{lat},{lon}",
-        "num_of_days": "1",
-        "tp": "1",  # 1-hour intervals
-        "format": "xml"
-    }
-    
+
     try:
-        response = requests.get(url, params=params)
-        
-        if response.status_code != 200:
-            return {
-                "status": "error", 
-                "message": f"Failed to retrieve data. Status code: {response.status_code}"
-            }
-        
-        root = ET.fromstring(response.content)
-        
-        # Get current conditions
-        current_condition = root.find("current_condition")
-        current_data = {}
-        if current_condition is not None:
-            current_data = {
-                "observation_time": current_condition.findtext("observation_time"),
-                "tempC": current_condition.findtext("temp_C"),
-                "weatherDesc": current_condition.findtext("weatherDesc"),
-            }
-        
-        # Get hourly forecasts
-        weather = root.find("weather")
-        if weather is None:
+        forecast = get_forecasts([date]).get(date)
+        if forecast is None:
             return {
                 "status": "error",
                 "message": "No weather data found in response"
             }
-        
-        hourly_data = weather.findall("hourly")
-        
-        forecast_hours = []
-        for hour in hourly_data:
-            time_str = hour.findtext("time")
-            if time_str is None:
-                continue
-                
-            # Convert time format (e.g., "2200" to hour 22)
-            try:
-                hour_int = int(time_str) // 100
-            except ValueError:
-                continue
-            
-            temp = hour.findtext("tempC")
-            condition = hour.findtext("weatherDesc")
-                
-            forecast_hours.append({
-                "time": f"{hour_int:02d}:00",
-                "tempC": temp,
-                "desc": condition.strip() if condition else "",
-            })
-        
+
         print(f"[WeatherAPI_tool] FINISH: Getting weather forecast for {date}")
+        return forecast
+
+    except Exception as e:
+        print(f"[WeatherAPI_tool] ERROR: Error retrieving weather data: {str(e)}")
         return {
-            "status": "success",
-            "date": date,
-            "current_condition": current_data,
-            "weather": {
-                "hours": forecast_hours
-            }
+            "status": "error",
+            "message": f"Error retrieving weather data: {str(e)}"
+        }
+
+def get_weather_forecasts(start_date: str, days: int = 7) -> Dict:
+    """
+    Get weather forecasts for several consecutive days in one call.
+
+    Args:
+        start_date: First date in YYYY-MM-DD format
+        days: Number of days, e.g. 7 for a week
+
+    Returns:
+        Dict with status and "forecasts", a mapping of date to the same forecast
+        structure get_weather_forecast returns. Dates without a forecast are listed
+        in "dates_without_forecast".
+    """
+    print(f"[WeatherAPI_tool] START: Getting weather forecasts for {days} days from {start_date}")
+    try:
+        dates = date_range(start_date, max(days, 1))
+        forecasts = get_forecasts(dates)
+
+        print(f"[WeatherAPI_tool] FINISH: Got weather forecasts for {len(forecasts)} days")
+        return {
+            "status": "success" if forecasts else "error",
+            "forecasts": forecasts,
+            "dates_without_forecast": [date for date in dates if date not in forecasts]
         }
-        
+
     except Exception as e:
         print(f"[WeatherAPI_tool] ERROR: Error retrieving weather data: {str(e)}")
         return {
             "status": "error",
             "message": f"Error retrieving weather data: {str(e)}"
-        }
\ No newline at end of file
+        }
+
+def update_weekly_weather(start_date: str, days: int = 7) -> Dict:
+    """
+    Fetch the forecasts of several days and write them to the sessions on those days in one update.
+
+    Args:
+        start_date: First date in YYYY-MM-DD format
+        days: Number of days, e.g. 7 for a week
+
+    Returns:
+        Dict with status, message, sessions_updated and dates_without_session
+    """
+    result = get_weather_forecasts(start_date, days)
+    if result["status"] != "success":
+        return {
+            "status": "error",
+            "message": result.get("message", "No weather data found for the requested dates")
+        }
+    return update_sessions_weather_by_dates(result["forecasts"])
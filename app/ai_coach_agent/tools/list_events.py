@@ -4,7 +4,8 @@ List events tool for Google Calendar integration.
 
 import datetime
 
-from .calendar_utils import format_event_time, get_calendar_service
+from .calendar_utils import format_event_time
+from .calendar_sync import get_mirrored_events
 
 def list_events(
     start_date: str,
@@ -24,7 +25,7 @@ def list_events(
             "message": "Found X event(s).",
             "calendar": {
                 "events": [
-                    {"title": "Event Title", "start": "10:00", "end": "11:00"},
+                    {"event_id": "abc123", "date": "2025-06-16", "title": "Event Title", "start": "10:00", "end": "11:00"},
                     ...
                 ]
             }
@@ -32,18 +33,6 @@ def list_events(
     """
     try:
         print(f"[CalendarAPI_tool] START: Retrieving calendar events with start_date {start_date} and days {days}") 
-        # Get calendar service
-        service = get_calendar_service()
-        if not service:
-            return {
-                "status": "error",
-                "message": "Failed to authenticate with Google Calendar. Please check credentials.",
-                "events": [],
-            }
-
-        # Always use a large max_results value to return all events
-        max_results = 100
-
         # Always use primary calendar
         calendar_id = "primary"
 
@@ -59,7 +48,9 @@ def list_events(
             try:
                 # Parse the provided start_date
                 start_time = datetime.datetime.strptime(start_date, "%Y-%m-%d")
-                end_time = start_time.replace(hour=23, minute=59, second=59, microsecond=999999)
+                if not days or days < 1:
+                    days = 1
+                end_time = start_time + datetime.timedelta(days=days) - datetime.timedelta(seconds=1)
             except ValueError:
                 return {
                     "status": "error",
@@ -68,25 +59,17 @@ def list_events(
                 }
 
         # Format times for API call
-        time_min = start_time.isoformat() + "Z"
-        time_max = end_time.isoformat() + "Z"
+        time_min = start_time.strftime("%Y-%m-%dT%H:%M:%SZ")
+        time_max = end_time.strftime("%Y-%m-%dT%H:%M:%SZ")
 
-        # Call the Calendar API
-        events_result = (
-            service.events()
-            .list(
-                calendarId=calendar_id,
-                eventTypes="default",
-                timeMin=time_min,
-                timeMax=time_max,
-                maxResults=max_results,
-                singleEvents=True,
-                orderBy="startTime",
-            )
-            .execute()
-        )
-
-        events = events_result.get("items", [])
+        # Read from the local mirror, which is kept in sync with the Calendar API
+        events = get_mirrored_events(time_min, time_max, calendar_id)
+        if events is None:
+            return {
+                "status": "error",
+                "message": "Could not sync Google Calendar. Please check credentials.",
+                "events": [],
+            }
 
         if not events:
             return {
@@ -124,6 +107,7 @@ def list_events(
             
             formatted_event = {
                 "event_id": event.get("id", " "),
+                "date": (start_raw.get("dateTime") or start_raw.get("date") or "")[:10],
                 "title": event.get("summary", "Untitled Event"),
                 "start": start_time,
                 "end": end_time,
@@ -147,5 +131,3 @@ def list_events(
             "message": f"Error fetching events: {str(e)}",
             "events": [],
         }
-
-print(list_events(start_date="2025-09-18", days=1))
\ No newline at end of file
@@ -1,11 +1,18 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
-import numpy as np
-import matplotlib.ticker as ticker
+from functools import lru_cache
 from typing import Dict, Any, Optional
 import os
-from .chromaDB_tools import get_activity_by_id
+from db.chroma_service import chroma_service
+
+
+@lru_cache(maxsize=None)
+def _plotting_libraries():
+    """Import matplotlib, seaborn and pandas on the first chart instead of at server start."""
+    import matplotlib.pyplot as plt
+    import matplotlib.ticker as ticker
+    import pandas as pd
+    import seaborn as sns
+    return plt, sns, pd, ticker
+
 
 def plot_running_chart(activity_id: int, save_path: Optional[str] = None) -> Dict[str, Any]:
     """
@@ -25,9 +32,10 @@ def plot_running_chart(activity_id: int, save_path: Optional[str] = None) -> Dic
     """
     try:
         print(f"[ChartCreator_tool] START: Creating running chart for activity {activity_id}")
+        plt, sns, pd, ticker = _plotting_libraries()
         
-        # Get activity data from ChromaDB
-        result = get_activity_by_id(activity_id)
+        # Get activity data with the streams as column arrays
+        result = chroma_service.get_activity_by_id(activity_id, streams_as_arrays=True)
         
         if result["status"] != "success":
             return {
@@ -41,16 +49,16 @@ def plot_running_chart(activity_id: int, save_path: Optional[str] = None) -> Dic
         data_points_streams = activity_data["data_points"]['streams']
         data_points_laps = activity_data["data_points"]['laps']
         
-        if not data_points_streams:
+        # Convert data points to DataFrame
+        df = pd.DataFrame(data_points_streams)
+        
+        if df.empty:
             return {
                 "status": "error",
                 "message": "No data points available for this activity",
                 "chart_path": None,
                 "activity_info": None
             }
-        
-        # Convert data points to DataFrame
-        df = pd.DataFrame(data_points_streams)
 
         ####################### Creating 1st chart
 
@@ -299,6 +307,7 @@ def plot_running_chart_laps(activity_data: Dict[str, Any], save_path: Optional[s
     try:
         activity_id = activity_data.get("activity_id")
         print(f"[ChartCreator_tool] START: Creating running chart for activity {activity_id}")
+        plt, sns, pd, ticker = _plotting_libraries()
         
         # Extract laps data from the input
         laps_data = activity_data.get("laps", [])
@@ -0,0 +1,79 @@
+"""
+Batched, cached embedding stage for RAG ingestion.
+
+Texts are looked up in the content-hash embedding cache first; only the
+misses are embedded, in batches of RAG_EMBED_BATCH_SIZE texts spread over
+RAG_EMBED_WORKERS threads (the ONNX model releases the GIL while it runs).
+The vectors come from the same embedding function Chroma uses for queries,
+so stored and query embeddings stay comparable.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from db.chroma_service import chroma_service
+from db.embedding_cache import content_hash
+
+EMBED_BATCH_SIZE = int(os.getenv("RAG_EMBED_BATCH_SIZE", "32"))
+EMBED_WORKERS = int(os.getenv("RAG_EMBED_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Part of the cache key, so vectors of a different model are never mixed in
+EMBEDDING_MODEL = "chroma-default-all-MiniLM-L6-v2"
+
+
+def _embed_batch(texts: List[str]) -> List[List[float]]:
+    return [list(map(float, vector)) for vector in chroma_service.embedding_function(texts)]
+
+
+def embed_texts(texts: List[str],
+                batch_size: Optional[int] = None,
+                workers: Optional[int] = None) -> List[List[float]]:
+    """
+    Embed texts, reusing cached vectors and batching the rest over worker threads.
+
+    Args:
+        texts: Texts to embed
+        batch_size: Texts per model call (default RAG_EMBED_BATCH_SIZE)
+        workers: Threads running model calls (default RAG_EMBED_WORKERS)
+
+    Returns:
+        List of embedding vectors in the order of texts
+    """
+    batch_size = batch_size or EMBED_BATCH_SIZE
+    workers = workers or EMBED_WORKERS
+
+    keys = [content_hash(EMBEDDING_MODEL, text) for text in texts]
+    vectors = chroma_service.embedding_cache.get_many(keys)
+
+    # Embed each distinct missing text once
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in vectors:
+            missing.setdefault(key, text)
+
+    if missing:
+        missing_keys = list(missing)
+        batches = [missing_keys[i:i + batch_size] for i in range(0, len(missing_keys), batch_size)]
+        print(f"[RAG_AGENT] Embedding {len(missing_keys)} new chunks in {len(batches)} batches "
+              f"({len(texts) - len(missing_keys)} from cache)")
+
+        def run(batch):
+            return _embed_batch([missing[key] for key in batch])
+
+        # The first batch runs alone so the model is loaded once, not by every worker
+        results = [run(batches[0])]
+        if workers > 1 and len(batches) > 2:
+            with ThreadPoolExecutor(max_workers=min(workers, len(batches) - 1), thread_name_prefix="rag-embed") as pool:
+                results.extend(pool.map(run, batches[1:]))
+        else:
+            results.extend(run(batch) for batch in batches[1:])
+
+        embedded = {key: vector for batch, batch_vectors in zip(batches, results)
+                    for key, vector in zip(batch, batch_vectors)}
+        chroma_service.embedding_cache.put_many(embedded)
+        vectors.update(embedded)
+    else:
+        print(f"[RAG_AGENT] All {len(texts)} chunk embeddings served from cache")
+
+    return [vectors[key] for key in keys]
@@ -3,6 +3,18 @@ from db.chroma_service import chroma_service
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 
+# Reciprocal-rank fusion constant; 60 is the usual choice and damps the weight of the top ranks
+RRF_K = 60
+
+# Lexical hits considered per query
+LEXICAL_CANDIDATES = 50
+
+# The vector search only ranks the lexical candidates when the query's keywords
+# are selective: at least PREFILTER_MIN_CANDIDATES hits, all of them among the
+# candidates, and no more than PREFILTER_MAX_FRACTION of the collection
+PREFILTER_MIN_CANDIDATES = 20
+PREFILTER_MAX_FRACTION = 0.2
+
 class RAGKnowledgeChunk(BaseModel):
     chunk_id: str
     category: str
@@ -139,6 +151,7 @@ def initialize_rag_knowledge():
             metadatas=metadatas,
             ids=ids
         )
+        chroma_service.rag_index.upsert(ids, documents, metadatas)
         
         return {
             "status": "success",
@@ -151,9 +164,26 @@ def initialize_rag_knowledge():
             "message": f"Error initializing RAG knowledge base: {str(e)}"
         }
 
+def _is_selective(query: str, category: Optional[str], rag_collection) -> bool:
+    """Whether the lexical matches are few enough to restrict the vector search to them."""
+    matches = chroma_service.rag_index.match_count(query, category=category)
+    return matches <= LEXICAL_CANDIDATES and matches <= rag_collection.count() * PREFILTER_MAX_FRACTION
+
+def _sync_lexical_index(rag_collection) -> None:
+    """Rebuild the BM25 index from the collection if they hold a different number of chunks."""
+    if rag_collection.count() == chroma_service.rag_index.count():
+        return
+    print("[RAG_knowledge_base] Rebuilding lexical index from the RAG knowledge collection")
+    results = rag_collection.get(include=["documents", "metadatas"])
+    chroma_service.rag_index.clear()
+    chroma_service.rag_index.upsert(results['ids'], results['documents'], results['metadatas'])
+
 def retrieve_rag_knowledge(query: str, n_results: int = 3, category: Optional[str] = None) -> Dict[str, Any]:
     """Retrieve relevant knowledge chunks from the RAG knowledge base.
     
+    Chunks are ranked by both vector similarity and BM25 keyword relevance, and
+    the two rankings are merged with reciprocal-rank fusion.
+    
     Args:
         query: The search query
         n_results: Number of results to return (default: 3)
@@ -169,30 +199,65 @@ def retrieve_rag_knowledge(query: str, n_results: int = 3, category: Optional[st
         print(f"[RAG_knowledge_base] START: Retrieving RAG knowledge for query: {query}, category: {category}")
         # Get the RAG knowledge collection
         rag_collection = chroma_service.client.get_collection("rag_knowledge")
+        _sync_lexical_index(rag_collection)
+        
+        # Each retriever contributes a deeper list than requested so fusion has overlap to work with
+        depth = max(n_results * 3, 10)
+        lexical_hits = chroma_service.rag_index.search(query, limit=LEXICAL_CANDIDATES, category=category)
         
         # Prepare where clause for category filtering
         where_clause = None
         if category:
             where_clause = {"category": category}
+        if len(lexical_hits) >= PREFILTER_MIN_CANDIDATES and _is_selective(query, category, rag_collection):
+            candidates = {"chunk_id": {"$in": [chunk_id for chunk_id, _ in lexical_hits]}}
+            where_clause = {"$and": [where_clause, candidates]} if where_clause else candidates
         
         # Search for relevant chunks
         results = rag_collection.query(
             query_texts=[query],
-            n_results=n_results,
+            n_results=depth,
             where=where_clause
         )
         
-        # Format the results
-        chunks = []
+        vector_hits = {}
         if results['ids'] and results['ids'][0]:
-            for i in range(len(results['ids'][0])):
-                chunk = {
-                    'id': results['ids'][0][i],
+            for i, chunk_id in enumerate(results['ids'][0]):
+                vector_hits[chunk_id] = {
                     'content': results['documents'][0][i],
                     'metadata': results['metadatas'][0][i],
-                    'distance': results['distances'][0][i] if 'distances' in results else None
+                    'distance': results['distances'][0][i] if results.get('distances') else None
                 }
-                chunks.append(chunk)
+        
+        # Reciprocal-rank fusion of the vector and lexical rankings
+        scores: Dict[str, float] = {}
+        for rank, chunk_id in enumerate(vector_hits, start=1):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (RRF_K + rank)
+        for rank, (chunk_id, _) in enumerate(lexical_hits[:depth], start=1):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (RRF_K + rank)
+        top_ids = sorted(scores, key=scores.get, reverse=True)[:n_results]
+        
+        # Chunks found only by keyword still need their text and metadata
+        lexical_only = [chunk_id for chunk_id in top_ids if chunk_id not in vector_hits]
+        if lexical_only:
+            fetched = rag_collection.get(ids=lexical_only, include=["documents", "metadatas"])
+            for chunk_id, document, metadata in zip(fetched['ids'], fetched['documents'], fetched['metadatas']):
+                vector_hits[chunk_id] = {'content': document, 'metadata': metadata, 'distance': None}
+        
+        # Format the results
+        chunks = []
+        for chunk_id in top_ids:
+            hit = vector_hits.get(chunk_id)
+            if hit is None:
+                # Indexed but no longer in the collection
+                continue
+            chunks.append({
+                'id': chunk_id,
+                'content': hit['content'],
+                'metadata': hit['metadata'],
+                'distance': hit['distance'],
+                'score': round(scores[chunk_id], 6)
+            })
         print(f"[RAG_knowledge_base] FINISH: Retrieved {len(chunks)} relevant knowledge chunks")
         
         return {
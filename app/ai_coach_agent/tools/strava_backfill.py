@@ -0,0 +1,171 @@
+"""
+Bulk import of historical Strava runs into the activity store.
+
+The backfill pages the athlete's activity list into the local index, then
+fetches laps and streams for every run not stored yet, at BACKFILL priority
+so interactive requests keep going first. Activities are written in batches
+and a checkpoint is saved after each batch, so an interrupted run resumes
+where it stopped. The checkpoint never moves past a run that failed to
+import, so failed runs are retried by the next backfill.
+
+Usage (from the app directory):
+    python -m ai_coach_agent.tools.strava_backfill [--after 2024-10-01] [--batch-size 20] [--restart]
+"""
+
+import argparse
+import threading
+from datetime import datetime
+from typing import Optional
+
+from db.chroma_service import chroma_service
+from .strava_utils import get_strava_client
+from .strava_sync import sync_activities
+from .strava_rate_limit import strava_priority, BACKFILL
+from .strava_list_activities import fetch_activity_complete
+
+CHECKPOINT_KEY = "backfill_checkpoint"
+
+_backfill_lock = threading.Lock()
+_backfill_status = {
+    "running": False,
+    "started_at": None,
+    "finished_at": None,
+    "total": 0,
+    "stored": 0,
+    "failed": [],
+    "checkpoint": None,
+    "message": "Backfill has not run yet",
+}
+
+
+def get_backfill_status() -> dict:
+    """Progress of the current or last backfill run."""
+    status = dict(_backfill_status)
+    status["checkpoint"] = chroma_service.activities.get_sync_state(CHECKPOINT_KEY)
+    return status
+
+
+def run_backfill(after: Optional[str] = None,
+                 batch_size: int = 20,
+                 limit: Optional[int] = None,
+                 restart: bool = False) -> dict:
+    """
+    Import laps and streams of all past runs that are not stored yet
+
+    Args:
+        after (str): Only import runs after this date (YYYY-MM-DD)
+        batch_size (int): Number of activities written per storage transaction
+        limit (int): Stop after this many activities
+        restart (bool): Ignore the saved checkpoint and start from the oldest run
+
+    Returns:
+        dict: status, message and counts of stored and failed activities
+    """
+    if not _backfill_lock.acquire(blocking=False):
+        return {"status": "error", "message": "A backfill is already running"}
+
+    store = chroma_service.activities
+    try:
+        _backfill_status.update({
+            "running": True,
+            "started_at": datetime.now().isoformat(),
+            "finished_at": None,
+            "total": 0,
+            "stored": 0,
+            "failed": [],
+            "message": "Syncing activity list",
+        })
+
+        with strava_priority(BACKFILL):
+            client = get_strava_client()
+            if not client:
+                raise RuntimeError("Failed to authenticate with Strava API")
+
+            sync = sync_activities(client, force=True)
+            if sync["status"] != "success":
+                raise RuntimeError(sync["message"])
+
+            checkpoint = None if restart else store.get_sync_state(CHECKPOINT_KEY)
+            start_after = max(filter(None, [after, checkpoint]), default=None)
+            pending = store.summaries_without_activity(sport_type="Run", after=start_after)
+            if limit:
+                pending = pending[:limit]
+            _backfill_status["total"] = len(pending)
+            print(f"[StravaBackfill] {len(pending)} runs to import after {start_after or 'the first activity'}")
+
+            # (summary, activity_data, before_first_failure) of the runs not stored yet
+            batch = []
+            # Start of the last run stored before the first failure of this run
+            safe_checkpoint = None
+            for position, summary in enumerate(pending, start=1):
+                activity_data = None
+                try:
+                    activity_data = fetch_activity_complete(client, summary["activity_id"])
+                except Exception as e:
+                    print(f"[StravaBackfill] ERROR: activity {summary['activity_id']}: {str(e)}")
+                if activity_data:
+                    batch.append((summary, activity_data, not _backfill_status["failed"]))
+                else:
+                    _backfill_status["failed"].append(summary["activity_id"])
+
+                if len(batch) >= batch_size or position == len(pending):
+                    if batch:
+                        stored = chroma_service.store_activities([activity_data for _, activity_data, _ in batch])
+                        if stored < len(batch):
+                            # The batch is written in one transaction: none of its runs were stored
+                            print(f"[StravaBackfill] ERROR: storing a batch of {len(batch)} runs failed")
+                            _backfill_status["failed"].extend(summary["activity_id"] for summary, _, _ in batch)
+                        else:
+                            _backfill_status["stored"] += stored
+                            for summary, _, before_first_failure in batch:
+                                if before_first_failure:
+                                    safe_checkpoint = summary["start_date_local"]
+                        batch = []
+                    if safe_checkpoint:
+                        store.set_sync_state(CHECKPOINT_KEY, safe_checkpoint)
+                    _backfill_status["message"] = f"Imported {_backfill_status['stored']} of {len(pending)} runs"
+                    print(f"[StravaBackfill] {_backfill_status['message']}")
+
+        message = f"Backfill finished: {_backfill_status['stored']} runs imported, {len(_backfill_status['failed'])} failed"
+        _backfill_status["message"] = message
+        print(f"[StravaBackfill] {message}")
+        return {
+            "status": "success",
+            "message": message,
+            "stored": _backfill_status["stored"],
+            "failed": list(_backfill_status["failed"]),
+        }
+
+    except Exception as e:
+        _backfill_status["message"] = f"Backfill failed: {str(e)}"
+        print(f"[StravaBackfill] ERROR: {str(e)}")
+        return {"status": "error", "message": _backfill_status["message"]}
+
+    finally:
+        _backfill_status["running"] = False
+        _backfill_status["finished_at"] = datetime.now().isoformat()
+        _backfill_lock.release()
+
+
+def start_backfill(**kwargs) -> dict:
+    """Run the backfill on a background thread and return immediately."""
+    if _backfill_status["running"]:
+        return {"status": "error", "message": "A backfill is already running"}
+    threading.Thread(target=run_backfill, kwargs=kwargs, name="strava-backfill", daemon=True).start()
+    return {"status": "success", "message": "Backfill started"}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import historical Strava runs into the activity store.")
+    parser.add_argument("--after", help="only import runs after this date (YYYY-MM-DD)")
+    parser.add_argument("--batch-size", type=int, default=20, help="activities written per transaction")
+    parser.add_argument("--limit", type=int, help="stop after this many activities")
+    parser.add_argument("--restart", action="store_true", help="ignore the saved checkpoint")
+    args = parser.parse_args()
+
+    result = run_backfill(after=args.after, batch_size=args.batch_size, limit=args.limit, restart=args.restart)
+    print(result["message"])
+
+
+if __name__ == "__main__":
+    main()
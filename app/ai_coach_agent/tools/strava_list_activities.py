@@ -1,5 +1,96 @@
-from datetime import timedelta, datetime
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING
+from db.activity_store import columns_from_streams, streams_from_columns
+from db.chroma_service import chroma_service
+from .strava_rate_limit import StravaRateLimited
 from .strava_utils import get_strava_client, format_activity_distance, format_activity_duration, format_activity_pace
+from .strava_sync import find_run_on_date, index_activity
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Single requests for one activity run on _request_pool, whole dates on _date_pool,
+# so a date task waiting on its own requests can never starve the pool it runs on
+_request_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="strava-request")
+_date_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="strava-date")
+
+def _submit(pool, fn, *args, **kwargs):
+    """Submit work to a pool, carrying the caller's request priority along."""
+    return pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+def _run_for_dates(fetch, dates: list) -> dict:
+    """Run a single-date fetch function for several dates in parallel."""
+    futures = {date: _submit(_date_pool, fetch, date) for date in dict.fromkeys(dates)}
+    results = {date: future.result() for date, future in futures.items()}
+    found = sum(1 for result in results.values() if result["status"] == "success")
+    return {
+        "status": "success" if found else "error",
+        "message": f"Retrieved activities for {found} of {len(results)} dates",
+        "results": results,
+    }
+
+def _lap_point(lap, position: int) -> dict:
+    """Lap summary in the data_points format stored on sessions."""
+    # Get velocity in m/s and convert to pace format
+    velocity_ms = lap.average_speed if lap.average_speed else None
+    velocity_min_km = format_activity_pace(velocity_ms) if velocity_ms and velocity_ms > 0 else None
+    
+    # Get cadence in rpm and convert to spm (1 rpm = 2 spm)
+    cadence_rpm = lap.average_cadence if lap.average_cadence else None
+    cadence_spm = cadence_rpm * 2 if cadence_rpm and cadence_rpm > 0 else None
+    
+    return {
+        "lap_index": lap.lap_index if lap.lap_index else position + 1,
+        "distance_meters": float(lap.distance) if lap.distance else None,
+        "pace_ms": velocity_ms,
+        "pace_min_km": velocity_min_km,
+        "heartrate_bpm": lap.average_heartrate if lap.average_heartrate else None,
+        "cadence": cadence_spm,
+        "elapsed_time": lap.elapsed_time if lap.elapsed_time else None,
+    }
+
+def _stream_array(streams, key: str, length: int) -> "np.ndarray":
+    """Return a Strava stream as a float64 array of the given length, NaN-padded."""
+    # NumPy is imported when the first streams are processed, not at server start
+    import numpy as np
+
+    out = np.full(length, np.nan)
+    stream = streams.get(key) if streams else None
+    if stream is None or not stream.data:
+        return out
+    data = stream.data[:length]
+    try:
+        values = np.asarray(data, dtype=np.float64)
+    except (TypeError, ValueError):
+        values = np.array([np.nan if v is None else v for v in data], dtype=np.float64)
+    out[:len(values)] = values
+    return out
+
+def assemble_stream_columns(streams) -> dict:
+    """
+    Align the distance, velocity, heart rate, altitude and cadence streams into columns
+
+    Args:
+        streams: Stream dict returned by client.get_activity_streams
+
+    Returns:
+        dict: Column name -> NumPy array, all the length of the distance stream. Uses the
+              storage dtypes, with cadence converted to spm
+    """
+    import numpy as np
+
+    length = len(streams['distance'].data)
+    # Cadence comes in rpm; 1 rpm = 2 spm
+    cadence_rpm = _stream_array(streams, 'cadence', length)
+    return columns_from_streams({
+        "distance_meters": _stream_array(streams, 'distance', length),
+        "velocity_ms": _stream_array(streams, 'velocity_smooth', length),
+        "heartrate_bpm": _stream_array(streams, 'heartrate', length),
+        "altitude_meters": _stream_array(streams, 'altitude', length),
+        "cadence": np.where(cadence_rpm > 0, cadence_rpm * 2, np.nan),
+    })
 
 def get_activity_with_streams(start_date: str) -> dict:
     """
@@ -9,7 +100,7 @@ def get_activity_with_streams(start_date: str) -> dict:
         start_date (str): Start date in YYYY-MM-DD format
 
     Returns:
-        dict: Complete activity data with metadata and stream data points
+        dict: Complete activity data with metadata and stream data points (missing samples are None)
     """
     try:
         print(f"[StravaAPI_tool] START: get_activity_with_streams() for date {start_date}")
@@ -23,36 +114,17 @@ def get_activity_with_streams(start_date: str) -> dict:
                 "activity_data": None,
             }
         
-        # Calculate end_date as the next day after start_date
-        start_datetime = datetime.strptime(start_date, "%Y-%m-%d")
-        end_datetime = start_datetime + timedelta(days=1)
-        end_date = end_datetime.strftime("%Y-%m-%d")
-        
-        # Get activities for the specified date
-        activities = client.get_activities(after=start_date, before=end_date, limit=5)
+        # Find the first run on the date in the local activity index
+        summary = find_run_on_date(start_date, client)
         
-        if not activities:
-            return {
-                "status": "error",
-                "message": f"No activities found for {start_date}",
-                "activity_data": None,
-            }
-
-        # Find the first run activity
-        target_activity = None
-        for activity in activities:
-            if activity.sport_type == "Run":
-                target_activity = activity
-                break
-        
-        if not target_activity:
+        if not summary:
             return {
                 "status": "error",
                 "message": f"No running activities found for {start_date}",
                 "activity_data": None,
             }
 
-        activity_id = target_activity.id
+        activity_id = summary["activity_id"]
         print(f"Found activity ID: {activity_id}")
 
         # Get activity streams
@@ -75,14 +147,14 @@ def get_activity_with_streams(start_date: str) -> dict:
         activity_data = {
             "activity_id": activity_id,
             "metadata": {
-                "type": target_activity.sport_type.root if target_activity.sport_type else "Unknown",
-                "name": target_activity.name if target_activity.name else "Untitled Activity",
-                "actual_distance": format_activity_distance(float(target_activity.distance)) if target_activity.distance else "N/A",
-                "duration": format_activity_duration(target_activity.moving_time) if target_activity.moving_time else "N/A",
-                "start_date": target_activity.start_date_local.strftime("%Y-%m-%d %H:%M") if target_activity.start_date_local else "N/A",
-                "actual_start": target_activity.start_date_local.strftime("%H:%M") if target_activity.start_date_local else "N/A",
-                "pace": format_activity_pace(target_activity.average_speed) if target_activity.average_speed else "N/A",
-                "total_distance_meters": float(target_activity.distance) if target_activity.distance else 0,
+                "type": summary["sport_type"] or "Unknown",
+                "name": summary["name"] or "Untitled Activity",
+                "actual_distance": format_activity_distance(summary["distance"]) if summary["distance"] else "N/A",
+                "duration": format_activity_duration(summary["moving_time"]) if summary["moving_time"] else "N/A",
+                "start_date": summary["start_date_local"][:16] if summary["start_date_local"] else "N/A",
+                "actual_start": summary["start_date_local"][11:16] if summary["start_date_local"] else "N/A",
+                "pace": format_activity_pace(summary["average_speed"]) if summary["average_speed"] else "N/A",
+                "total_distance_meters": summary["distance"] or 0,
                 "total_data_points": 0,
                 "resolution": "low",
                 "series_type": "distance"
@@ -102,25 +174,8 @@ def get_activity_with_streams(start_date: str) -> dict:
         total_data_points = len(distance_stream.data)
         activity_data["metadata"]["total_data_points"] = total_data_points
 
-        # Create synchronized data points
-        for i in range(total_data_points):
-            # Get velocity in m/s and convert to pace format
-            velocity_ms = streams.get('velocity_smooth').data[i] if streams.get('velocity_smooth') and i < len(streams['velocity_smooth'].data) else None
-            pace = format_activity_pace(velocity_ms) if velocity_ms and velocity_ms > 0 else None
-            
-            # Get cadence in rpm and convert to spm (1 rpm = 2 spm)
-            cadence_rpm = streams.get('cadence').data[i] if streams.get('cadence') and i < len(streams['cadence'].data) else None
-            cadence_spm = cadence_rpm * 2 if cadence_rpm and cadence_rpm > 0 else None
-            
-            data_point = {
-                "index": i,
-                "distance_meters": distance_stream.data[i] if i < len(distance_stream.data) else None,
-                "velocity_ms": velocity_ms,
-                "heartrate_bpm": streams.get('heartrate').data[i] if streams.get('heartrate') and i < len(streams['heartrate'].data) else None,
-                "altitude_meters": streams.get('altitude').data[i] if streams.get('altitude') and i < len(streams['altitude'].data) else None,
-                "cadence": cadence_spm,
-            }
-            activity_data["data_points"].append(data_point)
+        # Align all streams into columns in one vectorized pass, then hand out JSON-safe points
+        activity_data["data_points"] = streams_from_columns(assemble_stream_columns(streams))
 
         print(f"Successfully processed {total_data_points} data points for activity {activity_id}")
         return {
@@ -129,6 +184,14 @@ def get_activity_with_streams(start_date: str) -> dict:
             "activity_data": activity_data
         }
 
+    except StravaRateLimited as e:
+        print(f"[StravaAPI_tool] ERROR: {str(e)}")
+        return {
+            "status": "error",
+            "message": str(e),
+            "retry_after": e.retry_after,
+            "activity_data": None,
+        }
     except Exception as e:
         return {
             "status": "error",
@@ -158,37 +221,28 @@ def get_activity_with_laps(start_date: str) -> dict:
                 "activity_data": None,
             }
         
-        # Calculate end_date as the next day after start_date
-        start_datetime = datetime.strptime(start_date, "%Y-%m-%d")
-        end_datetime = start_datetime + timedelta(days=1)
-        end_date = end_datetime.strftime("%Y-%m-%d")
-        
-        # Get activities for the specified date
-        activities = client.get_activities(after=start_date, before=end_date, limit=5)
+        # Find the first run on the date in the local activity index
+        summary = find_run_on_date(start_date, client)
         
-        if not activities:
+        if not summary:
             return {
                 "status": "error",
-                "message": f"No activities found for {start_date}",
+                "message": f"No running activities found for {start_date}",
                 "activity_data": None,
             }
 
-        # Find the first run activity
-        target_activity = None
-        for activity in activities:
-            if activity.sport_type == "Run":
-                target_activity = activity
-                break
-        
-        if not target_activity:
+        activity_id = summary["activity_id"]
+
+        # Lap data of an activity is served from the cache once fetched
+        cached = chroma_service.activities.get_laps_payload(activity_id)
+        if cached:
+            print(f"[StravaAPI_tool] Using cached lap data for activity {activity_id}")
             return {
-                "status": "error",
-                "message": f"No running activities found for {start_date}",
-                "activity_data": None,
+                "status": "success",
+                "message": f"Retrieved complete lap data for activity {activity_id}",
+                "activity_data": cached
             }
 
-        activity_id = target_activity.id
-
         # Get activity by ID
         activity = client.get_activity(activity_id)
         
@@ -238,25 +292,9 @@ def get_activity_with_laps(start_date: str) -> dict:
 
         # Create data points from laps
         for i, lap in enumerate(activity.laps):
-            # Get velocity in m/s and convert to pace format
-            velocity_ms = lap.average_speed if lap.average_speed else None
-            velocity_min_km = format_activity_pace(velocity_ms) if velocity_ms and velocity_ms > 0 else None
-            
-            # Get cadence in rpm and convert to spm (1 rpm = 2 spm)
-            cadence_rpm = lap.average_cadence if lap.average_cadence else None
-            cadence_spm = cadence_rpm * 2 if cadence_rpm and cadence_rpm > 0 else None
-            
-            data_point = {
-                "lap_index": lap.lap_index if lap.lap_index else i + 1,
-                "distance_meters": float(lap.distance) if lap.distance else None,
-                "pace_ms": velocity_ms,
-                "pace_min_km": velocity_min_km,
-                "heartrate_bpm": lap.average_heartrate if lap.average_heartrate else None,
-                "cadence": cadence_spm,
-                "elapsed_time": lap.elapsed_time if lap.elapsed_time else None,
-            }
-            activity_data["data_points"].append(data_point)
+            activity_data["data_points"].append(_lap_point(lap, i))
 
+        chroma_service.activities.set_laps_payload(activity_id, activity_data)
         print(f"[StravaAPI_tool] Successfully processed {total_data_points} lap data points for activity {activity_id}")
         return {
             "status": "success",
@@ -264,6 +302,14 @@ def get_activity_with_laps(start_date: str) -> dict:
             "activity_data": activity_data
         }
 
+    except StravaRateLimited as e:
+        print(f"[StravaAPI_tool] ERROR: {str(e)}")
+        return {
+            "status": "error",
+            "message": str(e),
+            "retry_after": e.retry_after,
+            "activity_data": None,
+        }
     except Exception as e:
         print(f"[StravaAPI_tool] ERROR: Error fetching activity data: {str(e)}")
         return {
@@ -272,6 +318,81 @@ def get_activity_with_laps(start_date: str) -> dict:
             "activity_data": None,
         }
 
+def fetch_activity_complete(client, activity_id: int):
+    """
+    Fetch details (with laps) and streams of one activity from Strava, refreshing its
+    summary in the local activity index
+
+    Args:
+        client: Strava client
+        activity_id (int): The Strava activity ID
+
+    Returns:
+        dict: Activity data in the format expected by write_activity_data, with streams as
+              NumPy column arrays in the storage dtypes, or None if not found
+    """
+    # Get detailed activity data (includes laps)
+    # Details and streams are independent once the id is known, so fetch them concurrently
+    types = ["distance", "velocity_smooth", "heartrate", "altitude", "cadence"]
+    detail_future = _submit(_request_pool, client.get_activity, activity_id)
+    streams_future = _submit(
+        _request_pool,
+        client.get_activity_streams,
+        activity_id=activity_id,
+        types=types,
+        resolution="low",
+        series_type="distance",
+    )
+    detailed_activity = detail_future.result()
+    streams = streams_future.result()
+    
+    if not detailed_activity:
+        return None
+    index_activity(detailed_activity)
+
+    # Structure the complete data
+    activity_data = {
+        "activity_id": activity_id,
+        "metadata": {
+            "type": detailed_activity.sport_type.root if detailed_activity.sport_type else "Unknown",
+            "name": detailed_activity.name if detailed_activity.name else "Untitled Activity",
+            "distance": format_activity_distance(float(detailed_activity.distance)) if detailed_activity.distance else "N/A",
+            "duration": format_activity_duration(detailed_activity.moving_time) if detailed_activity.moving_time else "N/A",
+            "start_date": detailed_activity.start_date_local.strftime("%Y-%m-%d %H:%M") if detailed_activity.start_date_local else "N/A",
+            "actual_start": detailed_activity.start_date_local.strftime("%H:%M") if detailed_activity.start_date_local else "N/A",
+            "pace": format_activity_pace(detailed_activity.average_speed) if detailed_activity.average_speed else "N/A",
+            "total_distance_meters": float(detailed_activity.distance) if detailed_activity.distance else 0,
+            "total_laps": len(detailed_activity.laps) if detailed_activity.laps else 0,
+            "total_stream_points": 0,
+            "resolution": "low",
+            "series_type": "distance"
+        },
+        "data_points": {
+            "laps": [],
+            "streams": {}
+        }
+    }
+
+    # Process laps data ('pace' is the velocity in m/s the lap chart plots)
+    if detailed_activity.laps:
+        for i, lap in enumerate(detailed_activity.laps):
+            lap_data = _lap_point(lap, i)
+            lap_data["pace"] = lap_data["pace_ms"]
+            activity_data["data_points"]["laps"].append(lap_data)
+
+    # Process streams data
+    if streams:
+        # Get the distance stream as our primary reference
+        distance_stream = streams.get('distance')
+        if distance_stream and distance_stream.data:
+            total_stream_points = len(distance_stream.data)
+            activity_data["metadata"]["total_stream_points"] = total_stream_points
+
+            # Align all streams into columns in one vectorized pass
+            activity_data["data_points"]["streams"] = assemble_stream_columns(streams)
+
+    return activity_data
+
 def get_activity_complete(start_date: str) -> dict:
     """
     Get complete activity data including both lap and stream data for the first activity on a given date
@@ -281,6 +402,7 @@ def get_activity_complete(start_date: str) -> dict:
 
     Returns:
         dict: Complete activity data with metadata, lap data, and stream data points
+              (missing samples are None)
     """
     try:
         print(f"[StravaAPI_tool] START: get_activity_complete() for date {start_date}")
@@ -294,129 +416,47 @@ def get_activity_complete(start_date: str) -> dict:
                 "activity_data": None,
             }
         
-        # Calculate end_date as the next day after start_date
-        start_datetime = datetime.strptime(start_date, "%Y-%m-%d")
-        end_datetime = start_datetime + timedelta(days=1)
-        end_date = end_datetime.strftime("%Y-%m-%d")
-        
-        # Get activities for the specified date
-        activities = client.get_activities(after=start_date, before=end_date, limit=5)
+        # Find the first run on the date in the local activity index
+        summary = find_run_on_date(start_date, client)
         
-        if not activities:
-            return {
-                "status": "error",
-                "message": f"No activities found for {start_date}",
-                "activity_data": None,
-            }
-
-        # Find the first run activity
-        target_activity = None
-        for activity in activities:
-            if activity.sport_type == "Run":
-                target_activity = activity
-                break
-        
-        if not target_activity:
+        if not summary:
             return {
                 "status": "error",
                 "message": f"No running activities found for {start_date}",
                 "activity_data": None,
             }
 
-        activity_id = target_activity.id
+        activity_id = summary["activity_id"]
         print(f"[StravaAPI_tool] Found activity ID: {activity_id}")
 
-        # Get detailed activity data (includes laps)
-        detailed_activity = client.get_activity(activity_id)
+        # Activities already in the activity store are served locally
+        stored = chroma_service.activities.get_activity(activity_id, include_streams=False)
+        if stored and stored["metadata"].get("streams_count"):
+            print(f"[StravaAPI_tool] Using stored data for activity {activity_id}")
+            columns = chroma_service.activities.load_streams(activity_id, fill_missing=False)
+            stored["data_points"]["streams"] = streams_from_columns(columns) if columns else []
+            return {
+                "status": "success",
+                "message": f"Retrieved complete data for activity {activity_id} on {start_date}",
+                "activity_data": stored
+            }
+
+        activity_data = fetch_activity_complete(client, activity_id)
         
-        if not detailed_activity:
+        if not activity_data:
             return {
                 "status": "error",
                 "message": f"No detailed activity found with ID {activity_id}",
                 "activity_data": None,
             }
 
-        # Get activity streams
-        types = ["distance", "velocity_smooth", "heartrate", "altitude", "cadence"]
-        streams = client.get_activity_streams(
-            activity_id=activity_id,
-            types=types,
-            resolution="low",
-            series_type="distance",
-        )
-
-        # Structure the complete data
-        activity_data = {
-            "activity_id": activity_id,
-            "metadata": {
-                "type": detailed_activity.sport_type.root if detailed_activity.sport_type else "Unknown",
-                "name": detailed_activity.name if detailed_activity.name else "Untitled Activity",
-                "distance": format_activity_distance(float(detailed_activity.distance)) if detailed_activity.distance else "N/A",
-                "duration": format_activity_duration(detailed_activity.moving_time) if detailed_activity.moving_time else "N/A",
-                "start_date": detailed_activity.start_date_local.strftime("%Y-%m-%d %H:%M") if detailed_activity.start_date_local else "N/A",
-                "actual_start": detailed_activity.start_date_local.strftime("%H:%M") if detailed_activity.start_date_local else "N/A",
-                "pace": format_activity_pace(detailed_activity.average_speed) if detailed_activity.average_speed else "N/A",
-                "total_distance_meters": float(detailed_activity.distance) if detailed_activity.distance else 0,
-                "total_laps": len(detailed_activity.laps) if detailed_activity.laps else 0,
-                "total_stream_points": 0,
-                "resolution": "low",
-                "series_type": "distance"
-            },
-            "data_points": {
-                "laps": [],
-                "streams": []
-            }
-        }
-
-        # Process laps data
-        if detailed_activity.laps:
-            for i, lap in enumerate(detailed_activity.laps):
-                # Get velocity in m/s and convert to pace format
-                velocity_ms = lap.average_speed if lap.average_speed else None
-                pace = format_activity_pace(velocity_ms) if velocity_ms and velocity_ms > 0 else None
-                
-                # Get cadence in rpm and convert to spm (1 rpm = 2 spm)
-                cadence_rpm = lap.average_cadence if lap.average_cadence else None
-                cadence_spm = cadence_rpm * 2 if cadence_rpm and cadence_rpm > 0 else None
-                
-                lap_data = {
-                    "lap_index": lap.lap_index if lap.lap_index else i + 1,
-                    "distance_meters": float(lap.distance) if lap.distance else None,
-                    "pace": velocity_ms,
-                }
-                activity_data["data_points"]["laps"].append(lap_data)
-
-        # Process streams data
-        if streams:
-            # Get the distance stream as our primary reference
-            distance_stream = streams.get('distance')
-            if distance_stream and distance_stream.data:
-                total_stream_points = len(distance_stream.data)
-                activity_data["metadata"]["total_stream_points"] = total_stream_points
-
-                # Create synchronized data points
-                for i in range(total_stream_points):
-                    # Get velocity in m/s and convert to pace format
-                    velocity_ms = streams.get('velocity_smooth').data[i] if streams.get('velocity_smooth') and i < len(streams['velocity_smooth'].data) else None
-                    pace = format_activity_pace(velocity_ms) if velocity_ms and velocity_ms > 0 else None
-                    
-                    # Get cadence in rpm and convert to spm (1 rpm = 2 spm)
-                    cadence_rpm = streams.get('cadence').data[i] if streams.get('cadence') and i < len(streams['cadence'].data) else None
-                    cadence_spm = cadence_rpm * 2 if cadence_rpm and cadence_rpm > 0 else None
-                    
-                    stream_data = {
-                        "index": i,
-                        "distance_meters": distance_stream.data[i] if i < len(distance_stream.data) else None,
-                        "velocity_ms": velocity_ms,
-                        "heartrate_bpm": streams.get('heartrate').data[i] if streams.get('heartrate') and i < len(streams['heartrate'].data) else None,
-                        "altitude_meters": streams.get('altitude').data[i] if streams.get('altitude') and i < len(streams['altitude'].data) else None,
-                        "cadence": cadence_spm,
-                    }
-                    activity_data["data_points"]["streams"].append(stream_data)
+        # Column arrays stay internal; callers get JSON-serialisable points
+        streams = activity_data["data_points"]["streams"]
+        activity_data["data_points"]["streams"] = streams_from_columns(streams) if streams else []
 
         print(f"Successfully processed activity {activity_id}:")
         print(f"  - Laps: {len(activity_data['data_points']['laps'])}")
-        print(f"  - Stream points: {len(activity_data['data_points']['streams'])}")
+        print(f"  - Stream points: {activity_data['metadata']['total_stream_points']}")
         print(f"{activity_data}")
         
         return {
@@ -425,9 +465,43 @@ def get_activity_complete(start_date: str) -> dict:
             "activity_data": activity_data
         }
 
+    except StravaRateLimited as e:
+        print(f"[StravaAPI_tool] ERROR: {str(e)}")
+        return {
+            "status": "error",
+            "message": str(e),
+            "retry_after": e.retry_after,
+            "activity_data": None,
+        }
     except Exception as e:
         return {
             "status": "error",
             "message": f"Error fetching complete activity data: {str(e)}",
             "activity_data": None,
-        }
\ No newline at end of file
+        }
+
+def get_activities_with_laps_by_dates(dates: list) -> dict:
+    """
+    Get activity and lap data for the first run on each of several dates, fetched in parallel
+
+    Args:
+        dates (list): Dates in YYYY-MM-DD format, e.g. ["2025-07-14", "2025-07-15"]
+
+    Returns:
+        dict: status, message and "results" mapping each date to the get_activity_with_laps response
+    """
+    print(f"[StravaAPI_tool] START: get_activities_with_laps_by_dates() for {len(dates)} dates")
+    return _run_for_dates(get_activity_with_laps, dates)
+
+def get_activities_complete_by_dates(dates: list) -> dict:
+    """
+    Get lap and stream data for the first run on each of several dates, fetched in parallel
+
+    Args:
+        dates (list): Dates in YYYY-MM-DD format
+
+    Returns:
+        dict: status, message and "results" mapping each date to the get_activity_complete response
+    """
+    print(f"[StravaAPI_tool] START: get_activities_complete_by_dates() for {len(dates)} dates")
+    return _run_for_dates(get_activity_complete, dates)
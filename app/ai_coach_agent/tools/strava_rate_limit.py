@@ -0,0 +1,247 @@
+"""
+Rate-limit-aware scheduling for Strava API requests.
+
+Strava allows a fixed number of requests per 15-minute window (reset on the
+quarter hour) and per day (reset at midnight UTC), and reports current usage
+in the X-RateLimit-* / X-ReadRateLimit-* response headers. Every request made
+by the shared Strava client goes through StravaRateScheduler.acquire(), which
+spreads requests with a token bucket, keeps the header-reported usage under
+the limits, and lets interactive requests go ahead of backfill work.
+Interactive requests wait at most INTERACTIVE_MAX_WAIT_SECONDS; when the
+quota will not free up by then they fail fast with StravaRateLimited so
+tools can report when to retry instead of blocking an agent call.
+"""
+
+import contextlib
+import contextvars
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+import requests
+
+# Request priorities: lower value is served first
+INTERACTIVE = 0
+BACKFILL = 1
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKFILL: "backfill"}
+
+SHORT_WINDOW_SECONDS = 15 * 60
+
+# Longest an interactive request waits for budget unless a timeout is given
+INTERACTIVE_MAX_WAIT_SECONDS = 30
+
+_current_priority = contextvars.ContextVar("strava_request_priority", default=INTERACTIVE)
+
+
+@contextlib.contextmanager
+def strava_priority(priority: int):
+    """Run the enclosed Strava calls at the given priority (INTERACTIVE or BACKFILL)."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class StravaRateLimited(Exception):
+    """A Strava request was not sent because the quota would not free up in time."""
+
+    def __init__(self, retry_after: float):
+        self.retry_after = int(retry_after) + 1
+        super().__init__(f"Strava rate limit reached, retry after {self.retry_after} s")
+
+
+def _parse_pair(value: Optional[str]):
+    try:
+        short, daily = (int(part) for part in value.split(","))
+        return short, daily
+    except (AttributeError, ValueError):
+        return None
+
+
+class StravaRateScheduler:
+    """Token bucket plus header-driven quota tracking for Strava requests."""
+
+    def __init__(self, short_limit: int = 100, daily_limit: int = 1000, interactive_reserve: int = 10):
+        """
+        Args:
+            short_limit: Requests allowed per 15-minute window until headers say otherwise
+            daily_limit: Requests allowed per UTC day until headers say otherwise
+            interactive_reserve: Requests per window that backfill work may not use
+        """
+        self._cond = threading.Condition()
+        self.short_limit = short_limit
+        self.daily_limit = daily_limit
+        self.interactive_reserve = interactive_reserve
+        self.short_usage = 0
+        self.daily_usage = 0
+        now = datetime.now(timezone.utc)
+        self._short_window = self._window_start(now)
+        self._day = now.date()
+        self._tokens = float(short_limit)
+        self._last_refill = time.monotonic()
+        self._waiting = {INTERACTIVE: 0, BACKFILL: 0}
+        self.requests_sent = {INTERACTIVE: 0, BACKFILL: 0}
+        self.wait_seconds = {INTERACTIVE: 0.0, BACKFILL: 0.0}
+        self.throttled_responses = 0
+        self.last_headers_at = None
+
+    @staticmethod
+    def _window_start(now: datetime) -> datetime:
+        return now.replace(minute=now.minute - now.minute % 15, second=0, microsecond=0)
+
+    def _roll_windows(self) -> None:
+        now = datetime.now(timezone.utc)
+        window = self._window_start(now)
+        if window != self._short_window:
+            self._short_window = window
+            self.short_usage = 0
+        if now.date() != self._day:
+            self._day = now.date()
+            self.daily_usage = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        rate = self.short_limit / SHORT_WINDOW_SECONDS
+        self._tokens = min(float(self.short_limit), self._tokens + (now - self._last_refill) * rate)
+        self._last_refill = now
+
+    def _delay(self, priority: int) -> float:
+        """Seconds to wait before a request of this priority may go out (0 = now)."""
+        now = datetime.now(timezone.utc)
+        reserve = 0 if priority == INTERACTIVE else self.interactive_reserve
+        if self.daily_usage >= self.daily_limit - reserve:
+            midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), timezone.utc)
+            return (midnight - now).total_seconds()
+        if self.short_usage >= self.short_limit - reserve:
+            return (self._short_window + timedelta(seconds=SHORT_WINDOW_SECONDS) - now).total_seconds()
+        if priority != INTERACTIVE and self._waiting[INTERACTIVE]:
+            return 1.0
+        if self._tokens < 1:
+            return (1 - self._tokens) * SHORT_WINDOW_SECONDS / self.short_limit
+        return 0.0
+
+    def acquire(self, priority: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """Block until a request may be sent within the quota.
+
+        Args:
+            priority: INTERACTIVE or BACKFILL; defaults to the strava_priority() context
+            timeout: Give up after this many seconds; interactive requests default to
+                INTERACTIVE_MAX_WAIT_SECONDS, backfill requests wait as long as needed
+
+        Returns:
+            bool: True if the request may be sent, False on timeout (returned right
+                away when the quota will not free up within the timeout)
+        """
+        if priority is None:
+            priority = _current_priority.get()
+        if timeout is None and priority == INTERACTIVE:
+            timeout = INTERACTIVE_MAX_WAIT_SECONDS
+        started = time.monotonic()
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    self._roll_windows()
+                    self._refill()
+                    delay = self._delay(priority)
+                    if delay <= 0:
+                        self._tokens -= 1
+                        self.short_usage += 1
+                        self.daily_usage += 1
+                        self.requests_sent[priority] += 1
+                        self.wait_seconds[priority] += time.monotonic() - started
+                        return True
+                    if timeout is not None:
+                        remaining = timeout - (time.monotonic() - started)
+                        if remaining <= 0 or delay > remaining:
+                            return False
+                        delay = min(delay, remaining)
+                    self._cond.wait(delay)
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+    def retry_after(self, priority: Optional[int] = None) -> float:
+        """Seconds until a request of this priority could be sent."""
+        if priority is None:
+            priority = _current_priority.get()
+        with self._cond:
+            self._roll_windows()
+            self._refill()
+            return max(0.0, self._delay(priority))
+
+    def __call__(self, response_headers: Dict[str, str], method=None) -> None:
+        """Update usage from Strava's response headers (stravalib rate_limiter hook)."""
+        pairs = []
+        for prefix in ("X-RateLimit", "X-ReadRateLimit"):
+            limit = _parse_pair(response_headers.get(f"{prefix}-Limit"))
+            usage = _parse_pair(response_headers.get(f"{prefix}-Usage"))
+            if limit and usage:
+                pairs.append((limit, usage))
+        if not pairs:
+            return
+        with self._cond:
+            self._roll_windows()
+            # Track whichever quota (overall or read) has the least room left
+            short_limit, short_usage = min(((l[0], u[0]) for l, u in pairs), key=lambda p: p[0] - p[1])
+            daily_limit, daily_usage = min(((l[1], u[1]) for l, u in pairs), key=lambda p: p[0] - p[1])
+            self.short_limit, self.short_usage = short_limit, short_usage
+            self.daily_limit, self.daily_usage = daily_limit, daily_usage
+            self.last_headers_at = datetime.now(timezone.utc).isoformat()
+            self._cond.notify_all()
+
+    def record_throttled(self) -> None:
+        """A 429 came back: treat the current window as exhausted."""
+        with self._cond:
+            self.throttled_responses += 1
+            self.short_usage = max(self.short_usage, self.short_limit)
+            self._cond.notify_all()
+
+    def metrics(self) -> dict:
+        """Current budget and counters, for the metrics endpoint."""
+        with self._cond:
+            self._roll_windows()
+            self._refill()
+            return {
+                "short_window": {
+                    "limit": self.short_limit,
+                    "usage": self.short_usage,
+                    "remaining": max(0, self.short_limit - self.short_usage),
+                    "resets_at": (self._short_window + timedelta(seconds=SHORT_WINDOW_SECONDS)).isoformat(),
+                },
+                "daily": {
+                    "limit": self.daily_limit,
+                    "usage": self.daily_usage,
+                    "remaining": max(0, self.daily_limit - self.daily_usage),
+                },
+                "bucket_tokens": round(self._tokens, 2),
+                "interactive_reserve": self.interactive_reserve,
+                "waiting": {PRIORITY_NAMES[p]: n for p, n in self._waiting.items()},
+                "requests_sent": {PRIORITY_NAMES[p]: n for p, n in self.requests_sent.items()},
+                "wait_seconds": {PRIORITY_NAMES[p]: round(s, 2) for p, s in self.wait_seconds.items()},
+                "throttled_responses": self.throttled_responses,
+                "last_headers_at": self.last_headers_at,
+            }
+
+
+class RateLimitedSession(requests.Session):
+    """requests.Session that asks the scheduler before every request."""
+
+    def __init__(self, scheduler: StravaRateScheduler):
+        super().__init__()
+        self.scheduler = scheduler
+
+    def request(self, method, url, *args, **kwargs):
+        if not self.scheduler.acquire():
+            raise StravaRateLimited(self.scheduler.retry_after())
+        response = super().request(method, url, *args, **kwargs)
+        if response.status_code == 429:
+            self.scheduler.record_throttled()
+        return response
+
+
+# Process-wide scheduler shared by every Strava client
+strava_scheduler = StravaRateScheduler()
@@ -0,0 +1,156 @@
+"""
+Local index of the athlete's Strava activities.
+
+The activity list is synced incrementally (activities starting after the
+newest one seen, minus an overlap window that picks up late uploads and
+recent edits) and date lookups are answered from the local index, so tools
+no longer list activities on Strava for every call. Older changes reach the
+index through index_activity, which the webhook calls with the activity
+fetched by id.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from db.chroma_service import chroma_service
+from .strava_rate_limit import StravaRateLimited
+from .strava_utils import get_strava_client
+
+# Minimum number of seconds between two activity list requests
+SYNC_INTERVAL_SECONDS = 300
+
+# A date lookup that finds no run syncs again once the index is this many seconds old
+MISS_SYNC_INTERVAL_SECONDS = 60
+
+# Each incremental sync re-lists this many days before the newest indexed activity
+SYNC_OVERLAP_DAYS = 7
+
+_sync_lock = threading.Lock()
+
+
+def _activity_summary(activity) -> dict:
+    """Convert a stravalib activity summary to an index row."""
+    sport_type = activity.sport_type.root if hasattr(activity.sport_type, "root") else activity.sport_type
+    return {
+        "activity_id": activity.id,
+        "start_date_local": activity.start_date_local.strftime("%Y-%m-%d %H:%M:%S") if activity.start_date_local else "",
+        "sport_type": str(sport_type) if sport_type else None,
+        "name": activity.name,
+        "distance": float(activity.distance) if activity.distance else None,
+        "moving_time": int(activity.moving_time) if activity.moving_time else None,
+        "average_speed": float(activity.average_speed) if activity.average_speed else None,
+    }
+
+
+def index_activity(activity) -> dict:
+    """
+    Store the summary of one activity (e.g. fetched by id) in the local index
+
+    Args:
+        activity: stravalib activity summary or detailed activity
+
+    Returns:
+        dict: The index row that was written
+    """
+    summary = _activity_summary(activity)
+    chroma_service.activities.upsert_summaries([summary])
+    newest_local = chroma_service.activities.get_sync_state("newest_local") or ""
+    if summary["start_date_local"] > newest_local:
+        chroma_service.activities.set_sync_state("newest_local", summary["start_date_local"])
+    return summary
+
+
+def sync_activities(client=None, force: bool = False, interval: Optional[float] = None) -> dict:
+    """
+    Pull activities started since the last sync (minus SYNC_OVERLAP_DAYS) into the local index
+
+    Args:
+        client: Optional Strava client to reuse
+        force (bool): Sync even if the last sync is more recent than SYNC_INTERVAL_SECONDS
+        interval (float): Minimum seconds since the last sync, instead of SYNC_INTERVAL_SECONDS
+
+    Returns:
+        dict: status, message and number of activities synced
+    """
+    store = chroma_service.activities
+    with _sync_lock:
+        last_check = store.get_sync_state("last_check")
+        min_interval = SYNC_INTERVAL_SECONDS if interval is None else interval
+        if not force and last_check and time.time() - float(last_check) < min_interval:
+            return {"status": "success", "message": "Activity index is up to date", "synced": 0}
+
+        client = client or get_strava_client()
+        if not client:
+            return {"status": "error", "message": "Failed to authenticate with Strava API", "synced": 0}
+
+        try:
+            last_sync = store.get_sync_state("last_sync")
+            if last_sync:
+                after = datetime.fromtimestamp(float(last_sync), tz=timezone.utc) - timedelta(days=SYNC_OVERLAP_DAYS)
+                print(f"[StravaSync] Syncing activities after {after.isoformat()}")
+                activities = list(client.get_activities(after=after))
+            else:
+                print("[StravaSync] First sync: indexing the full activity list")
+                activities = list(client.get_activities())
+
+            if activities:
+                summaries = [_activity_summary(a) for a in activities]
+                store.upsert_summaries(summaries)
+                newest = max((a.start_date.timestamp() for a in activities if a.start_date), default=0.0)
+                store.set_sync_state("last_sync", str(max(newest, float(last_sync or 0))))
+                newest_local = max(summary["start_date_local"] for summary in summaries)
+                if newest_local > (store.get_sync_state("newest_local") or ""):
+                    store.set_sync_state("newest_local", newest_local)
+            store.set_sync_state("last_check", str(time.time()))
+
+            print(f"[StravaSync] Indexed {len(activities)} activities")
+            return {"status": "success", "message": f"Synced {len(activities)} activities", "synced": len(activities)}
+
+        except StravaRateLimited as e:
+            print(f"[StravaSync] Activity sync skipped: {str(e)}")
+            return {"status": "error", "message": str(e), "synced": 0, "retry_after": e.retry_after}
+        except Exception as e:
+            print(f"[StravaSync] ERROR: Error syncing activities: {str(e)}")
+            return {"status": "error", "message": f"Error syncing activities: {str(e)}", "synced": 0}
+
+
+def find_run_on_date(start_date: str, client=None) -> Optional[dict]:
+    """
+    Find the first run on a date using the local activity index
+
+    Args:
+        start_date (str): Date in YYYY-MM-DD format
+        client: Optional Strava client to reuse when a sync is needed
+
+    Returns:
+        dict: Index row of the run (activity_id, start_date_local, ...) or None
+
+    Raises:
+        StravaRateLimited: If the run is not indexed and the sync that could find it was rate limited
+    """
+    # Nothing can have been recorded on a future date
+    if start_date > datetime.now().strftime("%Y-%m-%d"):
+        return None
+
+    store = chroma_service.activities
+    sync_activities(client)
+    runs = store.summaries_on_date(start_date, sport_type="Run")
+    if runs:
+        return runs[0]
+
+    # A sync only re-lists the overlap window before the newest indexed run, so
+    # it can only find runs from then on (dates compared in the athlete's local time)
+    newest_local = store.get_sync_state("newest_local")
+    window_start = ""
+    if newest_local:
+        newest_date = datetime.strptime(newest_local[:10], "%Y-%m-%d")
+        window_start = (newest_date - timedelta(days=SYNC_OVERLAP_DAYS)).strftime("%Y-%m-%d")
+    if start_date >= window_start:
+        # Rest days miss too, so these syncs are throttled instead of forced
+        result = sync_activities(client, interval=MISS_SYNC_INTERVAL_SECONDS)
+        runs = store.summaries_on_date(start_date, sport_type="Run")
+        if not runs and result.get("retry_after"):
+            raise StravaRateLimited(result["retry_after"])
+    return runs[0] if runs else None
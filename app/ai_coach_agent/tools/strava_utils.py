@@ -4,11 +4,12 @@ Utility functions for Strava API integration.
 
 import json
 import os
+import threading
+import time
 from pathlib import Path
 import datetime
 from dotenv import load_dotenv
-from stravalib import Client
-from stravalib.exc import AccessUnauthorized
+from .strava_rate_limit import strava_scheduler, RateLimitedSession, StravaRateLimited
 
 # Load environment variables
 load_dotenv()
@@ -16,15 +17,20 @@ load_dotenv()
 # Path for token storage
 TOKEN_PATH = Path(os.path.expanduser("~/.credentials/strava_tokens.json"))
 
+STRAVA_CLIENT_ID = os.getenv("STRAVA_CLIENT_ID")
+STRAVA_CLIENT_SECRET = os.getenv("STRAVA_CLIENT_SECRET")
 
-def get_strava_client():
-    """
-    Authenticate and create a Strava client object.
+# Refresh the access token this many seconds before it expires
+REFRESH_MARGIN_SECONDS = 300
 
-    Returns:
-        A Strava client object or None if authentication fails
-    """
-    # Check if tokens exist and are valid
+# Process-wide client: one HTTP session and one in-memory copy of the tokens
+_client = None
+_token_data = None
+_client_lock = threading.Lock()
+
+
+def _read_token_file():
+    """Load tokens from TOKEN_PATH, or None if missing or invalid."""
     if not TOKEN_PATH.exists():
         print(f"Error: {TOKEN_PATH} not found.")
         print("Please run setup_strava_auth.py to set up OAuth authentication.")
@@ -45,50 +51,129 @@ def get_strava_client():
         print("Please run setup_strava_auth.py to re-authenticate.")
         return None
 
-    # Initialize client with tokens
+    return token_data
+
+
+def _save_tokens(client, token_data):
+    """Persist the client's current tokens and return the updated token data."""
+    updated_token_data = {
+        **token_data,
+        "access_token": client.access_token,
+        "refresh_token": client.refresh_token,
+        "expires_at": client.token_expires,
+    }
     try:
-        client = Client(
-            access_token=token_data["access_token"],
-            refresh_token=token_data["refresh_token"],
-            token_expires=token_data["expires_at"]
-        )
-
-        # Test the connection and trigger refresh if needed
-        #athlete = client.get_athlete()
-        #print(f"Connected to Strava as {athlete.firstname} {athlete.lastname}")
-
-        # Save refreshed tokens if they were updated
-        current_expires_timestamp = client.token_expires
-
-        if (client.access_token != token_data["access_token"] or
-            client.refresh_token != token_data["refresh_token"] or
-            current_expires_timestamp != token_data["expires_at"]):
-            print("Token refreshed! Saving new tokens...")
-            updated_token_data = {
-                "access_token": client.access_token,
-                "refresh_token": client.refresh_token,
-                "expires_at": current_expires_timestamp,
-                **{k: v for k, v in token_data.items() if k not in ["access_token", "refresh_token", "expires_at"]}
-            }
-            try:
-                with open(TOKEN_PATH, "w") as f:
-                    json.dump(updated_token_data, f, indent=4)
-                print("New tokens saved successfully.")
-            except Exception as e:
-                print(f"Error saving refreshed tokens: {e}")
-
-        return client
-
-    except AccessUnauthorized as e:
-        print(f"Authentication Error with Strava API: {e}")
-        print("Your tokens might be invalid or expired.")
-        print("Please run setup_strava_auth.py to re-authenticate.")
-        return None
+        with open(TOKEN_PATH, "w") as f:
+            json.dump(updated_token_data, f, indent=4)
+        print("New tokens saved successfully.")
     except Exception as e:
-        print(f"An unexpected error occurred during Strava API interaction: {e}")
+        print(f"Error saving refreshed tokens: {e}")
+    return updated_token_data
+
+
+def _refresh_tokens(client, token_data):
+    """Exchange the refresh token for a new access token before it expires."""
+    print("Access token about to expire, refreshing...")
+    response = client.refresh_access_token(
+        client_id=STRAVA_CLIENT_ID,
+        client_secret=STRAVA_CLIENT_SECRET,
+        refresh_token=token_data["refresh_token"],
+    )
+    client.access_token = response["access_token"]
+    client.refresh_token = response["refresh_token"]
+    client.token_expires = response["expires_at"]
+    return _save_tokens(client, token_data)
+
+
+def get_athlete_id():
+    """
+    Id of the athlete the app is authorized for: STRAVA_ATHLETE_ID, or the
+    athlete_id that setup_strava_auth.py saved with the tokens.
+
+    Returns:
+        int: The athlete id, or None if it is not known
+    """
+    athlete_id = os.getenv("STRAVA_ATHLETE_ID")
+    if not athlete_id:
+        token_data = _token_data or _read_token_file() or {}
+        athlete_id = token_data.get("athlete_id")
+    try:
+        return int(athlete_id) if athlete_id else None
+    except (TypeError, ValueError):
         return None
 
 
+def get_strava_client():
+    """
+    Return the shared Strava client, creating it on first use.
+
+    Tokens are read from disk once and kept in memory. The access token is
+    refreshed shortly before it expires, under a lock so concurrent tool
+    calls never refresh twice or race on the token file. The client's HTTP
+    session is reused across calls, and every request it sends waits for
+    budget from the shared rate-limit scheduler.
+
+    Returns:
+        A Strava client object or None if authentication fails
+    """
+    global _client, _token_data
+
+    # stravalib is imported on the first Strava call, not at server start
+    from stravalib import Client
+    from stravalib.exc import AccessUnauthorized
+
+    with _client_lock:
+        try:
+            if _client is None:
+                token_data = _read_token_file()
+                if token_data is None:
+                    return None
+                _client = Client(
+                    access_token=token_data["access_token"],
+                    refresh_token=token_data["refresh_token"],
+                    token_expires=token_data["expires_at"],
+                    rate_limiter=strava_scheduler,
+                    requests_session=RateLimitedSession(strava_scheduler)
+                )
+                _token_data = token_data
+
+            # The client may have refreshed on its own during a request; keep the file current
+            if (_client.access_token != _token_data["access_token"] or
+                _client.refresh_token != _token_data["refresh_token"]):
+                print("Token refreshed! Saving new tokens...")
+                _token_data = _save_tokens(_client, _token_data)
+
+            if float(_token_data["expires_at"]) - time.time() < REFRESH_MARGIN_SECONDS:
+                if STRAVA_CLIENT_ID and STRAVA_CLIENT_SECRET:
+                    _token_data = _refresh_tokens(_client, _token_data)
+                else:
+                    print("Warning: STRAVA_CLIENT_ID/STRAVA_CLIENT_SECRET not set, cannot refresh the access token.")
+
+            return _client
+
+        except AccessUnauthorized as e:
+            print(f"Authentication Error with Strava API: {e}")
+            print("Your tokens might be invalid or expired.")
+            print("Please run setup_strava_auth.py to re-authenticate.")
+            _client = None
+            _token_data = None
+            return None
+        except StravaRateLimited:
+            # A token refresh could not be sent; let the tool report when to retry
+            raise
+        except Exception as e:
+            print(f"An unexpected error occurred during Strava API interaction: {e}")
+            return None
+
+
+def reset_strava_client():
+    """Drop the shared client so the next call re-reads the token file (e.g. after re-authenticating)."""
+    global _client, _token_data
+    with _client_lock:
+        _client = None
+        _token_data = None
+
+
 def format_activity_distance(distance_meters):
     """
     Format activity distance from meters to a human-readable string.
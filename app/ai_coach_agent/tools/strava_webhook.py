@@ -0,0 +1,253 @@
+"""
+Strava push subscription (webhook) processing.
+
+Strava posts an event for every created, updated or deleted activity. The
+FastAPI receiver drops events that are not from the configured
+subscription and athlete, queues the activity id and answers at once; a
+background worker then fetches that activity by id, refreshes its summary
+and stored data, marks the planned session for its date as completed with
+the first run of that day and segments its laps, so the dashboard is
+current without anyone asking the strava agent.
+
+Local stand-in event source (from the app directory, with the server running):
+    python -m ai_coach_agent.tools.strava_webhook --activity-id 15162967332 [--aspect create]
+"""
+
+import argparse
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from db.chroma_service import chroma_service
+from .strava_rate_limit import BACKFILL, strava_priority
+from .strava_utils import get_athlete_id, get_strava_client
+from .strava_list_activities import fetch_activity_complete
+from .chromaDB_tools import mark_session_completed_by_date
+from .activity_classifier import segment_activity_by_pace
+
+# Token Strava echoes back when the subscription is created; the handshake is refused without it
+VERIFY_TOKEN = os.getenv("STRAVA_WEBHOOK_VERIFY_TOKEN")
+
+# Id Strava returned when the push subscription was created; events carry it as subscription_id
+SUBSCRIPTION_ID = os.getenv("STRAVA_WEBHOOK_SUBSCRIPTION_ID")
+
+_events = queue.Queue()
+_pending = set()
+_pending_lock = threading.Lock()
+_worker = None
+_status = {
+    "received": 0,
+    "processed": 0,
+    "failed": 0,
+    "last_event": None,
+    "last_result": None,
+}
+
+
+def verify_subscription(mode: Optional[str], token: Optional[str], challenge: Optional[str]) -> Optional[dict]:
+    """Answer Strava's subscription validation request.
+
+    Returns:
+        dict: {"hub.challenge": challenge} if the request is valid, otherwise None
+    """
+    if not VERIFY_TOKEN:
+        print("[StravaWebhook] STRAVA_WEBHOOK_VERIFY_TOKEN is not set, refusing the subscription")
+        return None
+    if mode == "subscribe" and token == VERIFY_TOKEN and challenge:
+        return {"hub.challenge": challenge}
+    return None
+
+
+def is_subscription_event(event: dict) -> bool:
+    """Whether an event comes from the configured subscription for the authorized athlete.
+
+    Anyone can post to the receiver, and every queued event costs Strava
+    requests, so events are only accepted when both ids match.
+    """
+    athlete_id = get_athlete_id()
+    if not SUBSCRIPTION_ID or not athlete_id:
+        print("[StravaWebhook] STRAVA_WEBHOOK_SUBSCRIPTION_ID or the athlete id is not configured, dropping event")
+        return False
+    try:
+        trusted = (int(event.get("subscription_id")) == int(SUBSCRIPTION_ID)
+                   and int(event.get("owner_id")) == athlete_id)
+    except (TypeError, ValueError):
+        trusted = False
+    if not trusted:
+        print(f"[StravaWebhook] Dropped event from subscription {event.get('subscription_id')}, "
+              f"owner {event.get('owner_id')}")
+    return trusted
+
+
+def enqueue_event(event: dict) -> bool:
+    """Queue an activity event for background processing.
+
+    Args:
+        event: Strava event payload with object_type, object_id and aspect_type
+
+    Returns:
+        bool: True if the event was queued, False if it was ignored
+    """
+    if event.get("object_type") != "activity" or not event.get("object_id"):
+        return False
+
+    aspect_type = event.get("aspect_type", "create")
+    activity_id = int(event["object_id"])
+    _status["received"] += 1
+    _status["last_event"] = {**event, "received_at": datetime.now().isoformat()}
+
+    # Several updates to the same activity in a row only need one fetch
+    with _pending_lock:
+        if (aspect_type, activity_id) in _pending:
+            return True
+        _pending.add((aspect_type, activity_id))
+    _ensure_worker()
+    _events.put((aspect_type, activity_id))
+    return True
+
+
+def process_activity_event(aspect_type: str, activity_id: int) -> dict:
+    """Bring local data in line with one Strava activity event.
+
+    Args:
+        aspect_type: "create", "update" or "delete"
+        activity_id: The Strava activity ID
+
+    Returns:
+        dict: status and message
+    """
+    store = chroma_service.activities
+    print(f"[StravaWebhook] Processing {aspect_type} event for activity {activity_id}")
+
+    if aspect_type == "delete":
+        linked = chroma_service.get_session_by_activity_id(activity_id)
+        store.delete_activity(activity_id)
+        store.delete_summary(activity_id)
+        for session_id, metadata in zip(linked["ids"], linked["metadatas"]):
+            result = _relink_session(session_id, metadata["date"])
+            if result["status"] != "success":
+                return result
+        return {"status": "success", "message": f"Removed activity {activity_id}"}
+
+    client = get_strava_client()
+    if not client:
+        return {"status": "error", "message": "Failed to authenticate with Strava API"}
+
+    # Fetch this activity by id, which also refreshes its index summary
+    activity_data = fetch_activity_complete(client, activity_id)
+    if not activity_data:
+        return {"status": "error", "message": f"Activity {activity_id} not found on Strava"}
+    summary = store.get_summary(activity_id)
+    if summary["sport_type"] != "Run":
+        return {"status": "success", "message": f"Activity {activity_id} is not a run, nothing to do"}
+
+    # Keep the stored activity current and drop lap data cached before an update
+    chroma_service.store_activities([activity_data])
+    store.set_laps_payload(activity_id, None)
+
+    # Like find_run_on_date, the session is completed with the first run of the day,
+    # so a later shakeout run does not replace the main one
+    date = summary["start_date_local"][:10]
+    first_run = store.summaries_on_date(date, sport_type="Run")[0]
+    if first_run["activity_id"] != activity_id:
+        return {
+            "status": "success",
+            "message": f"Activity {activity_id} is not the first run on {date}, session left linked to "
+                       f"activity {first_run['activity_id']}",
+        }
+
+    laps = activity_data["data_points"]["laps"]
+    completed = mark_session_completed_by_date(
+        date=date,
+        id=activity_id,
+        # Sessions keep actual_distance as a number of kilometres
+        actual_distance=round(activity_data["metadata"]["total_distance_meters"] / 1000, 2),
+        actual_start=activity_data["metadata"]["actual_start"],
+        data_points={"laps": laps},
+    )
+    if completed["status"] != "success":
+        return completed
+
+    segmented = segment_activity_by_pace({"laps": laps}, date)
+    return {
+        "status": "success",
+        "message": f"Session on {date} completed with activity {activity_id}",
+        "segmentation": segmented.get("message") if isinstance(segmented, dict) else None,
+    }
+
+
+def _relink_session(session_id: str, date: str) -> dict:
+    """Link a session whose activity was deleted to the next run of its day, or mark it not completed."""
+    remaining = chroma_service.activities.summaries_on_date(date, sport_type="Run")
+    if remaining:
+        return process_activity_event("update", remaining[0]["activity_id"])
+
+    result = chroma_service.patch_sessions({session_id: {
+        "session_completed": False,
+        "activity_id": None,
+        "actual_distance": None,
+        "actual_start": None,
+        "data_points": {"laps": []},
+    }})
+    if result["status"] != "success":
+        return {"status": "error", "message": f"Error unlinking session {session_id}: {result.get('message')}"}
+    return {"status": "success", "message": f"Session on {date} is no longer completed"}
+
+
+def _run_worker() -> None:
+    while True:
+        aspect_type, activity_id = _events.get()
+        with _pending_lock:
+            _pending.discard((aspect_type, activity_id))
+        try:
+            # Background work: wait for quota like the backfill instead of failing fast
+            with strava_priority(BACKFILL):
+                result = process_activity_event(aspect_type, activity_id)
+        except Exception as e:
+            result = {"status": "error", "message": f"Error processing activity {activity_id}: {str(e)}"}
+        _status["processed" if result["status"] == "success" else "failed"] += 1
+        _status["last_result"] = {**result, "activity_id": activity_id, "finished_at": datetime.now().isoformat()}
+        print(f"[StravaWebhook] {result['message']}")
+        _events.task_done()
+
+
+def _ensure_worker() -> None:
+    global _worker
+    with _pending_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run_worker, name="strava-webhook", daemon=True)
+            _worker.start()
+
+
+def get_webhook_status() -> dict:
+    """Counters and the most recent event/result, for monitoring."""
+    return {**_status, "queued": _events.qsize()}
+
+
+def main() -> None:
+    import requests
+
+    parser = argparse.ArgumentParser(description="Send a Strava-style webhook event to the local receiver.")
+    parser.add_argument("--activity-id", type=int, required=True, help="Strava activity ID")
+    parser.add_argument("--aspect", choices=["create", "update", "delete"], default="create")
+    parser.add_argument("--url", default="http://localhost:8000/api/strava/webhook")
+    args = parser.parse_args()
+
+    event = {
+        "object_type": "activity",
+        "object_id": args.activity_id,
+        "aspect_type": args.aspect,
+        "owner_id": get_athlete_id(),
+        "subscription_id": int(SUBSCRIPTION_ID or 0),
+        "event_time": int(time.time()),
+        "updates": {},
+    }
+    response = requests.post(args.url, json=event, timeout=10)
+    print(f"{response.status_code}: {response.text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,272 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from collections import Counter
+from datetime import datetime
 from pathlib import Path
+import csv
+import json
 import mimetypes
 import base64
+import re
 
-def file_reader(file_path: str) -> str:
+from .chromaDB_tools import write_chromaDB
+from .file_extraction import extract_file, iter_sheet_rows, SPREADSHEET_EXTENSIONS
+
+# Tabular plans (one session per row) are parsed by rules instead of the LLM
+PLAN_TABLE_EXTENSIONS = {".csv", ".tsv"} | SPREADSHEET_EXTENSIONS
+
+# Accepted header names per session field, compared lower-cased without punctuation
+_COLUMN_ALIASES = {
+    "date": {"date", "session date", "day date", "planned date"},
+    "day": {"day", "weekday", "day of week", "day of the week"},
+    "type": {"type", "session", "session type", "workout", "workout type", "activity"},
+    "distance": {"distance", "distance km", "distance kms", "km", "kms", "distance mi", "distance miles",
+                 "miles", "mi"},
+    "notes": {"notes", "note", "description", "details", "comments", "instructions"},
+}
+_REQUIRED_COLUMNS = ("date", "type", "distance")
+
+# Tried in order; the first format that parses every date of the plan is used,
+# so day-first is preferred but US month-first plans still parse
+_DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y", "%d.%m.%Y", "%Y/%m/%d",
+                 "%d/%m/%y", "%m/%d/%y", "%d %b %Y", "%d %B %Y", "%b %d, %Y", "%B %d, %Y",
+                 "%a %d %b %Y", "%A %d %B %Y")
+
+_DISTANCE = re.compile(r"^\s*(\d+(?:[.,]\d+)?)\s*(km|kms|k|kilometres|kilometers|mi|mile|miles|m)?\s*$", re.IGNORECASE)
+_KM_PER_MILE = 1.609344
+
+# Header rows are looked for in the first rows only, below any title lines
+_HEADER_SEARCH_ROWS = 10
+
+def file_reader(file_path: str, start_page: int = 1, max_pages: int = 0) -> str:
     """
-    Read the training plan file and return its content as text.
-    The actual parsing will be done by the LLM.
+    Read an uploaded file (training plan or research document) and return its content as text.
+    PDFs, Word documents and spreadsheets are extracted locally; the actual parsing
+    of the content will be done by the LLM.
 
     Args:
         file_path: Path to the uploaded file.
+        start_page: For PDFs, the first page to return (1-based).
+        max_pages: For PDFs, the number of pages to return; 0 returns every page from start_page.
 
     Returns:
-        The content of the file as text, or base64 encoded if binary.
+        The content of the file as text. PDF pages are separated by "--- Page N ---" lines,
+        spreadsheets are returned as JSON rows per sheet ({"sheet name": [{"Date": ..., ...}]}),
+        other binary files are base64 encoded.
     """
- 
+
     print(f"[FileReader_tool] START: Reading file: {file_path}")
     # Normalize the file path to handle different separators
     normalized_path = str(file_path).replace('\\', '/').strip()
 
     try:
         mime_type, _ = mimetypes.guess_type(normalized_path)
-        
+
         if mime_type and mime_type.startswith('text'):
             # Try to read as text
             with open(normalized_path, 'r', encoding='utf-8', errors='replace') as f:
                 content = f.read()
             return content
-        else:
-            # Binary file: return base64 string
-            with open(normalized_path, 'rb') as f:
-                encoded = base64.b64encode(f.read()).decode('utf-8')
-                content = f"[BINARY FILE - base64 encoded]\n{encoded}"
-                print(f"[FileReader_tool] FINISH: Binary file: {normalized_path}")
+
+        extracted = extract_file(normalized_path)
+        if extracted is not None:
+            if extracted["format"] == "pdf":
+                pages = extracted["pages"]
+                first = max(start_page, 1)
+                last = len(pages) if max_pages <= 0 else min(len(pages), first + max_pages - 1)
+                content = "\n".join(
+                    f"--- Page {number} ---\n{pages[number - 1]}" for number in range(first, last + 1)
+                )
+                if first > 1 or last < len(pages):
+                    content = f"[PDF pages {first}-{last} of {len(pages)}]\n{content}"
+            elif extracted["format"] == "docx":
+                content = extracted["text"]
+            else:
+                content = json.dumps(extracted["sheets"], ensure_ascii=False)
+            print(f"[FileReader_tool] FINISH: Extracted {extracted['format']} file: {normalized_path}")
             return content
+
+        # Other binary file: return base64 string
+        with open(normalized_path, 'rb') as f:
+            encoded = base64.b64encode(f.read()).decode('utf-8')
+            content = f"[BINARY FILE - base64 encoded]\n{encoded}"
+            print(f"[FileReader_tool] FINISH: Binary file: {normalized_path}")
+        return content
     except Exception as e:
         print(f"[FileReader_tool] ERROR: Error reading file: {str(e)}")
         return f"Error reading file: {str(e)}"
+
+
+def _normalize_header(name: Any) -> str:
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", str(name or "").lower()).split())
+
+
+def _match_columns(row: List[Any]) -> Optional[Dict[str, int]]:
+    """Map session fields to column indexes if the row is a plan header."""
+    columns: Dict[str, int] = {}
+    for index, name in enumerate(row):
+        header = _normalize_header(name)
+        for field, aliases in _COLUMN_ALIASES.items():
+            if field not in columns and header in aliases:
+                columns[field] = index
+                break
+    if all(field in columns for field in _REQUIRED_COLUMNS):
+        return columns
+    return None
+
+
+def _parse_dates(values: List[str]) -> Optional[List[str]]:
+    """Parse all plan dates with the first format that fits every one of them."""
+    for date_format in _DATE_FORMATS:
+        try:
+            return [datetime.strptime(value, date_format).strftime("%Y-%m-%d") for value in values]
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_distance(value: Any, header: str) -> Optional[float]:
+    """Distance in kilometres from a cell such as 10, "10km", "6.2 mi" or "5k"."""
+    if value in (None, ""):
+        return 0.0
+    if isinstance(value, (int, float)):
+        number, unit = float(value), ""
+    else:
+        match = _DISTANCE.match(str(value))
+        if not match:
+            return None
+        number, unit = float(match.group(1).replace(",", ".")), (match.group(2) or "").lower()
+    if unit == "m":
+        number /= 1000
+    elif unit.startswith("mi") or (not unit and header.split()[-1] in ("mi", "miles")):
+        number *= _KM_PER_MILE
+    return round(number, 2)
+
+
+def _read_table_rows(path: str) -> List[List[Any]]:
+    """Rows of a CSV/TSV file or of the first spreadsheet sheet that contains a plan header."""
+    extension = Path(path).suffix.lower()
+    if extension in SPREADSHEET_EXTENSIONS:
+        sheets: Dict[str, List[List[Any]]] = {}
+        for sheet_name, values in iter_sheet_rows(path):
+            sheets.setdefault(sheet_name, []).append(values)
+        for rows in sheets.values():
+            if any(_match_columns(row) for row in rows[:_HEADER_SEARCH_ROWS]):
+                return rows
+        return []
+
+    with open(path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        # European exports use ';' and TSV files tabs; the most frequent candidate wins
+        delimiter = max(",;\t", key=sample.count)
+        return [row for row in csv.reader(f, delimiter=delimiter) if any(cell.strip() for cell in row)]
+
+
+def parse_plan_table(path: str) -> Tuple[Optional[List[Dict[str, Any]]], str]:
+    """
+    Parse a tabular training plan (one session per row) without the LLM.
+
+    Args:
+        path: Path to a CSV, TSV or XLSX file with date, type and distance columns
+              (day and notes are optional)
+
+    Returns:
+        tuple: (sessions, reason) where sessions is the list expected by write_chromaDB,
+               or None with the reason the file needs the LLM parser instead
+    """
+    rows = _read_table_rows(path)
+    columns = None
+    for header_index, row in enumerate(rows[:_HEADER_SEARCH_ROWS]):
+        columns = _match_columns(row)
+        if columns:
+            break
+    if not columns:
+        return None, "no header with date, type and distance columns"
+
+    def cell(row: List[Any], field: str) -> Any:
+        index = columns.get(field)
+        if index is None or index >= len(row):
+            return None
+        value = row[index]
+        return value.strip() if isinstance(value, str) else value
+
+    body = [row for row in rows[header_index + 1:] if cell(row, "date") not in (None, "")]
+    if not body:
+        return None, "no sessions below the header"
+
+    dates = _parse_dates([str(cell(row, "date")) for row in body])
+    if dates is None:
+        return None, "dates in an unrecognised format"
+
+    distance_header = _normalize_header(rows[header_index][columns["distance"]])
+    sessions = []
+    for row, date in zip(body, dates):
+        distance = _parse_distance(cell(row, "distance"), distance_header)
+        if distance is None:
+            return None, f"unrecognised distance '{cell(row, 'distance')}' on {date}"
+        session_type = str(cell(row, "type") or "").strip()
+        if not session_type:
+            if distance:
+                return None, f"missing session type on {date}"
+            session_type = "Rest"
+        notes = cell(row, "notes")
+        sessions.append({
+            "date": date,
+            # Derived from the date so a mistyped day column cannot disagree with it
+            "day": datetime.strptime(date, "%Y-%m-%d").strftime("%A"),
+            "type": session_type,
+            "distance": distance,
+            "notes": "" if notes is None else str(notes),
+        })
+    sessions.sort(key=lambda session: session["date"])
+    return sessions, ""
+
+
+def _plan_summary(sessions: List[Dict[str, Any]]) -> str:
+    first = datetime.strptime(sessions[0]["date"], "%Y-%m-%d")
+    last = datetime.strptime(sessions[-1]["date"], "%Y-%m-%d")
+    types = Counter(session["type"] for session in sessions)
+    breakdown = ", ".join(f"{count} {session_type}" for session_type, count in types.most_common())
+    return (f"I've processed your training plan. It contains {len(sessions)} sessions from "
+            f"{first.strftime('%B %d')} to {last.strftime('%B %d, %Y')}. The plan includes {breakdown}.")
+
+
+def import_training_plan(file_path: str) -> Dict[str, Any]:
+    """
+    Parse a tabular training plan (CSV/XLSX with date, day, type, distance and notes
+    columns) by rules and store its sessions with write_chromaDB, without the LLM.
+
+    Args:
+        file_path: Path to the uploaded plan file.
+
+    Returns:
+        dict: status "success" with the number of sessions, their date range and a summary;
+              "unsupported" with the reason if the file is not a recognised table and has
+              to be read with file_reader instead; or "error"
+    """
+    normalized_path = str(file_path).replace('\\', '/').strip()
+    if Path(normalized_path).suffix.lower() not in PLAN_TABLE_EXTENSIONS:
+        return {"status": "unsupported", "message": "Not a tabular plan file, use file_reader"}
+
+    print(f"[FileReader_tool] START: Importing tabular plan: {normalized_path}")
+    try:
+        sessions, reason = parse_plan_table(normalized_path)
+    except Exception as e:
+        print(f"[FileReader_tool] ERROR: Error parsing plan table: {str(e)}")
+        return {"status": "unsupported", "message": f"Could not parse the plan table ({str(e)}), use file_reader"}
+    if sessions is None:
+        print(f"[FileReader_tool] FINISH: Not a recognised plan table ({reason}): {normalized_path}")
+        return {"status": "unsupported", "message": f"Not a recognised plan table ({reason}), use file_reader"}
+
+    result = write_chromaDB(sessions)
+    if result["status"] != "success":
+        return result
+    print(f"[FileReader_tool] FINISH: Imported {len(sessions)} sessions from {normalized_path}")
+    return {
+        "status": "success",
+        "message": result["message"],
+        "sessions": len(sessions),
+        "start_date": sessions[0]["date"],
+        "end_date": sessions[-1]["date"],
+        "summary": _plan_summary(sessions),
+    }
@@ -0,0 +1,203 @@
+"""
+Weather provider layer for WorldWeatherOnline.
+
+Responses are requested as JSON and only the fields of the WeatherHour
+schema (time, tempC, desc) are extracted. Forecasts are cached in compact
+form per (location, date) in the WeatherStore for
+WEATHER_CACHE_TTL_SECONDS. Dates missing from the cache are fetched as one
+contiguous range per request (up to MAX_DAYS_PER_REQUEST days) over a
+pooled HTTP session, so a week overview needs at most one upstream call
+per cache window.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+from pydantic import TypeAdapter
+
+from db.chroma_service import chroma_service
+from .chromaDB_tools import WeatherHour
+
+# Load environment variables
+load_dotenv()
+
+API_URL = "http://api.worldweatheronline.com/premium/v1/weather.ashx"
+
+# Hardcoded coordinates for London
+DEFAULT_LOCATION = "51.59,-0.24"
+
+# Forecasts younger than this are served from the cache
+WEATHER_CACHE_TTL_SECONDS = 3 * 60 * 60
+
+# Longest forecast range WorldWeatherOnline returns in one request
+MAX_DAYS_PER_REQUEST = 14
+
+REQUEST_TIMEOUT_SECONDS = 15
+
+_session = None
+_session_lock = threading.Lock()
+# One upstream fetch per location at a time, so concurrent lookups share the result
+_fetch_locks: Dict[str, threading.Lock] = {}
+
+_weather_hours = TypeAdapter(List[WeatherHour])
+
+
+def _get_session() -> requests.Session:
+    """Return the shared HTTP session, keeping connections to the API alive between calls."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=8))
+            _session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=8))
+        return _session
+
+
+def _description(entry: dict) -> str:
+    # weatherDesc is a list of {"value": ...} objects
+    desc = entry.get("weatherDesc")
+    return desc[0].get("value", "").strip() if desc else ""
+
+
+def parse_forecasts(content: bytes) -> Dict[str, dict]:
+    """
+    Extract the compact daily forecasts from a WorldWeatherOnline JSON response.
+
+    Args:
+        content: Raw response body
+
+    Returns:
+        dict: Mapping of date to {"current_condition": {...}, "hours": [[time, tempC, desc], ...]}
+
+    Raises:
+        RuntimeError: If the response reports an error
+    """
+    data = json.loads(content).get("data", {})
+    if data.get("error"):
+        raise RuntimeError(data["error"][0].get("msg", "Unknown weather API error"))
+
+    current_data = {}
+    if data.get("current_condition"):
+        current = data["current_condition"][0]
+        current_data = {
+            "observation_time": current.get("observation_time"),
+            "tempC": current.get("temp_C"),
+            "weatherDesc": _description(current),
+        }
+
+    forecasts = {}
+    for weather in data.get("weather", []):
+        date = weather.get("date")
+        if not date:
+            continue
+
+        hours = []
+        for hour in weather.get("hourly", []):
+            # Convert time format (e.g., "2200" to hour 22)
+            try:
+                hour_int = int(hour["time"]) // 100
+            except (KeyError, ValueError):
+                continue
+            hours.append({"time": f"{hour_int:02d}:00", "tempC": hour.get("tempC", ""), "desc": _description(hour)})
+
+        validated = _weather_hours.validate_python(hours)
+        forecasts[date] = {
+            "current_condition": current_data,
+            "hours": [[hour.time, hour.tempC, hour.desc] for hour in validated],
+        }
+    return forecasts
+
+
+def _expand(date: str, compact: dict) -> dict:
+    """Turn a cached compact forecast back into the get_weather_forecast structure."""
+    if "weather" in compact:
+        # Entry cached before the compact format
+        return compact
+    return {
+        "status": "success",
+        "date": date,
+        "current_condition": compact.get("current_condition", {}),
+        "weather": {
+            "hours": [{"time": time, "tempC": temp, "desc": desc} for time, temp, desc in compact["hours"]]
+        }
+    }
+
+
+def _fetch_range(location: str, start_date: str, num_days: int) -> Dict[str, dict]:
+    """Fetch the forecasts of num_days consecutive days in one request."""
+    params = {
+        "key": os.getenv("WORLDWEATHER_API_KEY"),
+        "date": start_date,
+        "q": location,
+        "num_of_days": str(num_days),
+        "tp": "1",  # 1-hour intervals
+        "format": "json"
+    }
+    print(f"[WeatherAPI_tool] Fetching {num_days} day(s) of forecast from {start_date}")
+    response = _get_session().get(API_URL, params=params, timeout=REQUEST_TIMEOUT_SECONDS)
+    if response.status_code != 200:
+        raise RuntimeError(f"Failed to retrieve data. Status code: {response.status_code}")
+    return parse_forecasts(response.content)
+
+
+def _missing_ranges(dates: List[str]) -> List[tuple]:
+    """Cover the sorted missing dates with as few (start_date, num_days) requests as possible."""
+    ranges = []
+    days = sorted(datetime.strptime(date, "%Y-%m-%d") for date in dates)
+    start = end = days[0]
+    for day in days[1:]:
+        # Fetching a gap of cached days is cheaper than a second request
+        if (day - start).days < MAX_DAYS_PER_REQUEST:
+            end = day
+            continue
+        ranges.append((start.strftime("%Y-%m-%d"), (end - start).days + 1))
+        start = end = day
+    ranges.append((start.strftime("%Y-%m-%d"), (end - start).days + 1))
+    return ranges
+
+
+def get_forecasts(dates: List[str], location: str = DEFAULT_LOCATION) -> Dict[str, dict]:
+    """
+    Forecasts for several dates, from the cache where fresh and fetched in ranges otherwise.
+
+    Args:
+        dates: Dates in YYYY-MM-DD format
+        location: "lat,lon" of the forecast
+
+    Returns:
+        dict: Mapping of date to forecast ({"status", "date", "current_condition",
+              "weather": {"hours": [...]}}) for every date the provider returned
+
+    Raises:
+        RuntimeError: If the upstream request fails
+    """
+    store = chroma_service.weather
+    dates = sorted(set(dates))
+    forecasts = store.get_forecasts(location, dates, WEATHER_CACHE_TTL_SECONDS)
+    missing = [date for date in dates if date not in forecasts]
+    if not missing:
+        return {date: _expand(date, forecast) for date, forecast in forecasts.items()}
+
+    with _session_lock:
+        fetch_lock = _fetch_locks.setdefault(location, threading.Lock())
+    with fetch_lock:
+        # Another thread may have fetched these dates while we waited
+        forecasts.update(store.get_forecasts(location, missing, WEATHER_CACHE_TTL_SECONDS))
+        missing = [date for date in dates if date not in forecasts]
+        for start_date, num_days in (_missing_ranges(missing) if missing else []):
+            fetched = _fetch_range(location, start_date, num_days)
+            store.put_forecasts(location, fetched)
+            forecasts.update({date: fetched[date] for date in missing if date in fetched})
+    return {date: _expand(date, forecast) for date, forecast in forecasts.items()}
+
+
+def date_range(start_date: str, days: int) -> List[str]:
+    """The dates of `days` consecutive days starting at start_date."""
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    return [(start + timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range(days)]
@@ -0,0 +1,136 @@
+"""
+Cold-start benchmark for the FastAPI server.
+
+Starts `uvicorn main:app` in a fresh process several times and measures how
+long it takes until the server answers HTTP requests. With --offline every
+outbound connection is routed to a dead proxy, so a start that depends on
+Google Calendar, Strava or any other network service fails or slows down
+visibly. --import-profile prints the slowest imports of `import main` and
+which of the libraries the tools load on first use it imported anyway.
+
+Usage (from the app directory):
+    python -m benchmarks.startup [--runs 5] [--workers 2] [--offline] [--import-profile]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+# Any response from this route means the app has finished starting
+READY_PATH = "/favicon.ico"
+
+# Libraries the tools import on first use; `import main` should not load them
+DEFERRED_LIBRARIES = ("numpy", "pandas", "matplotlib", "seaborn", "chromadb", "stravalib")
+
+
+def _environment(offline: bool) -> dict:
+    env = dict(os.environ)
+    if offline:
+        # Port 9 (discard) refuses connections, so any network call at startup fails fast
+        dead_proxy = "http://127.0.0.1:9"
+        env.update(HTTP_PROXY=dead_proxy, HTTPS_PROXY=dead_proxy,
+                   http_proxy=dead_proxy, https_proxy=dead_proxy,
+                   NO_PROXY="127.0.0.1,localhost", no_proxy="127.0.0.1,localhost")
+    return env
+
+
+def _wait_until_ready(process: subprocess.Popen, port: int, timeout: float) -> bool:
+    url = f"http://127.0.0.1:{port}{READY_PATH}"
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            return False
+        try:
+            urllib.request.urlopen(url, timeout=1)
+            return True
+        except urllib.error.HTTPError:
+            # The server answered, even if with an error status
+            return True
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.02)
+    return False
+
+
+def measure_cold_start(port: int, workers: int, offline: bool, timeout: float) -> float:
+    """Start uvicorn once and return the seconds until it serves requests."""
+    command = [sys.executable, "-m", "uvicorn", "main:app",
+               "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+    if workers > 1:
+        command += ["--workers", str(workers)]
+
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=APP_DIR, env=_environment(offline),
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        ready = _wait_until_ready(process, port, timeout)
+        elapsed = time.perf_counter() - started
+    finally:
+        process.terminate()
+        try:
+            _, stderr = process.communicate(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            _, stderr = process.communicate()
+
+    if not ready:
+        raise RuntimeError(f"Server did not start within {timeout}s:\n{stderr.decode(errors='replace')[-2000:]}")
+    return elapsed
+
+
+def import_profile(offline: bool, top: int = 15) -> None:
+    """Print the imports of `import main` with the largest cumulative time and the deferred libraries it loaded."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            cwd=APP_DIR, env=_environment(offline), capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # Format: "import time: <self us> | <cumulative us> | <indented module name>"
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        return
+
+    rows.sort(reverse=True)
+    print("\nSlowest imports (cumulative ms, self ms, module):")
+    for cumulative_us, self_us, name in rows[:top]:
+        print(f"  {cumulative_us / 1000:8.1f} {self_us / 1000:8.1f}  {name}")
+
+    loaded = {name for _, _, name in rows if name in DEFERRED_LIBRARIES}
+    print(f"\nDeferred libraries imported at startup: {', '.join(sorted(loaded)) or 'none'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the cold start of `uvicorn main:app`")
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold starts to measure")
+    parser.add_argument("--port", type=int, default=8765, help="Port to start the server on")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds to wait for one start")
+    parser.add_argument("--offline", action="store_true", help="Block outbound network access")
+    parser.add_argument("--import-profile", action="store_true", help="Show the slowest imports of main")
+    args = parser.parse_args()
+
+    timings = []
+    for run in range(1, args.runs + 1):
+        elapsed = measure_cold_start(args.port, args.workers, args.offline, args.timeout)
+        timings.append(elapsed)
+        print(f"run {run}: {elapsed:.2f}s")
+
+    print(f"\ncold start ({args.workers} worker(s){', offline' if args.offline else ''}): "
+          f"min {min(timings):.2f}s  median {statistics.median(timings):.2f}s  max {max(timings):.2f}s")
+
+    if args.import_profile:
+        import_profile(args.offline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark of the weather response parsing step.
+
+Builds synthetic WorldWeatherOnline responses with hourly forecasts for an
+increasing number of days and times the provider's JSON parser against
+the previous XML/ElementTree parser, so parse cost stays visible as
+forecast ranges grow. No network access is needed.
+
+Usage (from the app directory):
+    python -m benchmarks.weather_parse [--days 1 3 7 14] [--repeat 200]
+"""
+
+import argparse
+import json
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+
+from ai_coach_agent.tools.weather_provider import parse_forecasts
+
+# WorldWeatherOnline returns ~25 fields per hourly entry; only three are used
+_HOUR_FIELDS = {
+    "windspeedMiles": "7", "windspeedKmph": "11", "winddirDegree": "240", "winddir16Point": "WSW",
+    "weatherCode": "116", "precipMM": "0.0", "precipInches": "0.0", "humidity": "71",
+    "visibility": "10", "visibilityMiles": "6", "pressure": "1017", "pressureInches": "30",
+    "cloudcover": "42", "HeatIndexC": "16", "DewPointC": "9", "WindChillC": "15",
+    "WindGustMiles": "11", "WindGustKmph": "18", "FeelsLikeC": "15", "chanceofrain": "0",
+    "chanceofsunshine": "87", "uvIndex": "4",
+}
+
+
+def _sample_days(days: int):
+    start = datetime(2025, 6, 16)
+    for offset in range(days):
+        date = (start + timedelta(days=offset)).strftime("%Y-%m-%d")
+        hours = [
+            {"time": str(hour * 100), "tempC": str(10 + hour % 12), "weatherDesc": [{"value": "Partly cloudy "}],
+             "weatherIconUrl": [{"value": "https://cdn.worldweatheronline.com/images/wsymbol_0002.png"}],
+             **_HOUR_FIELDS}
+            for hour in range(24)
+        ]
+        yield date, hours
+
+
+def sample_json(days: int) -> bytes:
+    weather = [{"date": date, "maxtempC": "21", "mintempC": "9", "hourly": hours} for date, hours in _sample_days(days)]
+    current = [{"observation_time": "07:00 AM", "temp_C": "14", "weatherDesc": [{"value": "Sunny"}]}]
+    return json.dumps({"data": {"current_condition": current, "weather": weather}}).encode()
+
+
+def sample_xml(days: int) -> bytes:
+    parts = ["<data><current_condition><observation_time>07:00 AM</observation_time>"
+             "<temp_C>14</temp_C><weatherDesc>Sunny</weatherDesc></current_condition>"]
+    for date, hours in _sample_days(days):
+        parts.append(f"<weather><date>{date}</date><maxtempC>21</maxtempC><mintempC>9</mintempC>")
+        for hour in hours:
+            fields = "".join(f"<{key}>{value}</{key}>" for key, value in _HOUR_FIELDS.items())
+            parts.append(f"<hourly><time>{hour['time']}</time><tempC>{hour['tempC']}</tempC>"
+                         f"<weatherDesc><![CDATA[Partly cloudy ]]></weatherDesc>{fields}</hourly>")
+        parts.append("</weather>")
+    parts.append("</data>")
+    return "".join(parts).encode()
+
+
+def parse_xml(content: bytes) -> dict:
+    """The XML parsing used before the JSON format, kept here as the baseline."""
+    root = ET.fromstring(content)
+    forecasts = {}
+    for weather in root.findall("weather"):
+        hours = []
+        for hour in weather.findall("hourly"):
+            condition = hour.findtext("weatherDesc")
+            hours.append({
+                "time": f"{int(hour.findtext('time')) // 100:02d}:00",
+                "tempC": hour.findtext("tempC"),
+                "desc": condition.strip() if condition else "",
+            })
+        forecasts[weather.findtext("date")] = hours
+    return forecasts
+
+
+def _time_per_call(function, content: bytes, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function(content)
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark weather response parsing")
+    parser.add_argument("--days", type=int, nargs="+", default=[1, 3, 7, 14], help="Forecast lengths to test")
+    parser.add_argument("--repeat", type=int, default=200, help="Parses per measurement")
+    args = parser.parse_args()
+
+    print(f"{'days':>4} {'json KB':>8} {'xml KB':>8} {'json ms':>8} {'xml ms':>8} {'cached B/day':>12}")
+    for days in args.days:
+        json_content, xml_content = sample_json(days), sample_xml(days)
+        parsed = parse_forecasts(json_content)
+        assert len(parsed) == days and all(len(day["hours"]) == 24 for day in parsed.values())
+        cached = sum(len(json.dumps(day, separators=(",", ":"))) for day in parsed.values()) / days
+
+        json_seconds = _time_per_call(parse_forecasts, json_content, args.repeat)
+        xml_seconds = _time_per_call(parse_xml, xml_content, args.repeat)
+        print(f"{days:>4} {len(json_content) / 1024:>8.1f} {len(xml_content) / 1024:>8.1f} "
+              f"{json_seconds * 1000:>8.3f} {xml_seconds * 1000:>8.3f} {cached:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,409 @@
+"""
+Relational storage for Strava activities.
+
+Activity summaries and laps live in the ``activities`` table. Stream points
+are stored column by column as typed NumPy arrays in one compressed ``.npz``
+file per activity, so listing activities never touches stream data and
+charts load arrays directly instead of parsing JSON.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Stream columns and their on-disk dtypes; the point index is implicit.
+# NumPy is imported by the functions that handle streams, not at server start
+STREAM_COLUMNS = {
+    "distance_meters": "float32",
+    "velocity_ms": "float32",
+    "heartrate_bpm": "int16",
+    "altitude_meters": "float32",
+    "cadence": "int16",
+}
+
+# Integer columns cannot hold NaN, so missing samples are stored as this value
+MISSING_INT = -1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS activities (
+    activity_id INTEGER PRIMARY KEY,
+    name TEXT,
+    start_date TEXT,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    laps TEXT NOT NULL DEFAULT '[]',
+    laps_count INTEGER NOT NULL DEFAULT 0,
+    streams_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_activities_start_date ON activities(start_date);
+
+CREATE TABLE IF NOT EXISTS strava_activity_index (
+    activity_id INTEGER PRIMARY KEY,
+    start_date_local TEXT NOT NULL,
+    sport_type TEXT,
+    name TEXT,
+    distance REAL,
+    moving_time INTEGER,
+    average_speed REAL,
+    laps_payload TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_strava_index_start ON strava_activity_index(start_date_local);
+
+CREATE TABLE IF NOT EXISTS strava_sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def columns_from_streams(streams: Union[List[Dict], Dict[str, Any]]) -> Dict[str, "np.ndarray"]:
+    """Convert stream points to typed column arrays.
+
+    Args:
+        streams: Either a list of point dicts (one per sample) or a dict of
+            column name -> sequence/array. Short or missing columns are padded.
+
+    Returns:
+        Dict of column name -> NumPy array with the dtype from STREAM_COLUMNS
+    """
+    import numpy as np
+
+    if isinstance(streams, dict):
+        length = max((len(v) for v in streams.values() if v is not None), default=0)
+    else:
+        length = len(streams)
+
+    columns = {}
+    for column, dtype in STREAM_COLUMNS.items():
+        if isinstance(streams, dict):
+            values = streams.get(column)
+        else:
+            values = [point.get(column) for point in streams]
+        if isinstance(values, np.ndarray) and values.dtype == dtype and len(values) == length:
+            columns[column] = values
+            continue
+        as_float = np.full(length, np.nan)
+        if values is not None and len(values):
+            if isinstance(values, np.ndarray):
+                given = values.astype(np.float64)
+            else:
+                given = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            as_float[:len(given)] = given[:length]
+        if np.issubdtype(dtype, np.integer):
+            as_float = np.where(np.isnan(as_float), MISSING_INT, np.rint(as_float))
+        columns[column] = as_float.astype(dtype)
+    return columns
+
+
+def streams_from_columns(columns: Dict[str, "np.ndarray"]) -> List[Dict[str, Any]]:
+    """Convert column arrays back to the list-of-points form used by the API."""
+    import numpy as np
+
+    lists = {}
+    for column, values in columns.items():
+        if np.issubdtype(values.dtype, np.integer):
+            lists[column] = [None if v == MISSING_INT else v for v in values.tolist()]
+        else:
+            # Round away float32 representation noise before handing out Python floats
+            lists[column] = [None if v != v else v for v in values.astype(np.float64).round(3).tolist()]
+    length = len(next(iter(lists.values()), []))
+    names = list(lists)
+    return [
+        {"index": i, **dict(zip(names, row))}
+        for i, row in enumerate(zip(*(lists[name] for name in names)))
+    ] if length else []
+
+
+class ActivityStore:
+    """SQLite-backed store for Strava activities and laps, with streams in .npz files."""
+
+    def __init__(self, db_path: Path, streams_dir: Optional[Path] = None):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.streams_dir = Path(streams_dir) if streams_dir else self.db_path.parent / "streams"
+        self.streams_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._convert_json_streams()
+
+    def _convert_json_streams(self) -> None:
+        """Move streams kept as JSON rows by older versions into .npz files."""
+        with self._lock:
+            table = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'activity_streams'"
+            ).fetchone()
+            if table is None:
+                return
+            for row in self._conn.execute("SELECT activity_id, streams FROM activity_streams").fetchall():
+                self._write_streams(row["activity_id"], columns_from_streams(json.loads(row["streams"])))
+            with self._conn:
+                self._conn.execute("DROP TABLE activity_streams")
+
+    def _streams_path(self, activity_id: int) -> Path:
+        return self.streams_dir / f"{int(activity_id)}.npz"
+
+    def _write_streams(self, activity_id: int, columns: Dict[str, "np.ndarray"]) -> None:
+        import numpy as np
+
+        path = self._streams_path(activity_id)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, **columns)
+        os.replace(tmp_path, path)
+
+    def load_streams(self, activity_id: int, fill_missing: bool = True) -> Optional[Dict[str, "np.ndarray"]]:
+        """Load the stream columns of an activity as NumPy arrays.
+
+        Args:
+            activity_id: The Strava activity ID
+            fill_missing: Return integer columns as float32 with NaN for missing
+                samples instead of the MISSING_INT sentinel
+
+        Returns:
+            Dict of column name -> array, or None if no streams are stored
+        """
+        import numpy as np
+
+        path = self._streams_path(activity_id)
+        if not path.exists():
+            return None
+        with np.load(path) as data:
+            columns = {name: data[name] for name in data.files}
+        if fill_missing:
+            for name, values in columns.items():
+                if np.issubdtype(values.dtype, np.integer):
+                    columns[name] = np.where(values == MISSING_INT, np.nan, values).astype(np.float32)
+        return columns
+
+    def put_activity(self,
+                     activity_id: int,
+                     metadata: Dict[str, Any],
+                     data_points: Optional[Dict[str, Any]] = None) -> None:
+        """Insert or replace an activity with its laps and streams.
+
+        Args:
+            activity_id: The Strava activity ID
+            metadata: Activity summary fields (name, start_date, distance, ...)
+            data_points: Dict with a 'laps' list and 'streams' as a list of
+                points or a dict of columns
+        """
+        self.put_activities([
+            {"activity_id": activity_id, "metadata": metadata, "data_points": data_points}
+        ])
+
+    def put_activities(self, activities: List[Dict[str, Any]]) -> int:
+        """Insert or replace several activities in one transaction.
+
+        Args:
+            activities: Dicts with 'activity_id', 'metadata' and 'data_points'
+                in the format accepted by put_activity
+
+        Returns:
+            int: Number of activities written
+        """
+        rows = []
+        now = datetime.now().isoformat()
+        with self._lock:
+            for activity in activities:
+                activity_id = int(activity["activity_id"])
+                data_points = activity.get("data_points") or {}
+                laps = data_points.get("laps") or []
+                columns = columns_from_streams(data_points.get("streams") or [])
+                metadata = {k: v for k, v in (activity.get("metadata") or {}).items() if k != "data_points"}
+                self._write_streams(activity_id, columns)
+                rows.append((
+                    activity_id,
+                    metadata.get("name"),
+                    metadata.get("start_date"),
+                    json.dumps(metadata),
+                    json.dumps(laps),
+                    len(laps),
+                    len(columns["distance_meters"]),
+                    now,
+                ))
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO activities "
+                    "(activity_id, name, start_date, metadata, laps, laps_count, streams_count, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(activity_id) DO UPDATE SET "
+                    "name = excluded.name, start_date = excluded.start_date, metadata = excluded.metadata, "
+                    "laps = excluded.laps, laps_count = excluded.laps_count, "
+                    "streams_count = excluded.streams_count, updated_at = excluded.updated_at",
+                    rows,
+                )
+        return len(rows)
+
+    def get_activity(self, activity_id: int, include_streams: bool = True) -> Optional[Dict[str, Any]]:
+        """Load one activity.
+
+        Args:
+            activity_id: The Strava activity ID
+            include_streams: Whether to load the stream points as well
+
+        Returns:
+            Dict with 'activity_id', 'metadata' and 'data_points', or None if not stored
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM activities WHERE activity_id = ?", (int(activity_id),)
+            ).fetchone()
+        if row is None:
+            return None
+        data_points = {"laps": json.loads(row["laps"])}
+        if include_streams:
+            columns = self.load_streams(activity_id, fill_missing=False)
+            data_points["streams"] = streams_from_columns(columns) if columns else []
+        metadata = json.loads(row["metadata"])
+        metadata["laps_count"] = row["laps_count"]
+        metadata["streams_count"] = row["streams_count"]
+        return {"activity_id": row["activity_id"], "metadata": metadata, "data_points": data_points}
+
+    def list_activities(self) -> List[Dict[str, Any]]:
+        """List activity summaries ordered by start date, without laps or streams."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT activity_id, name, start_date, laps_count, streams_count "
+                "FROM activities ORDER BY start_date"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def has_activity(self, activity_id: int) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM activities WHERE activity_id = ?", (int(activity_id),)
+            ).fetchone()
+        return row is not None
+
+    def delete_activity(self, activity_id: int) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM activities WHERE activity_id = ?", (int(activity_id),)
+            )
+            self._streams_path(activity_id).unlink(missing_ok=True)
+        return cursor.rowcount > 0
+
+    # ------------------------------------------------------------------
+    # Strava activity index (summaries from the athlete's activity list)
+    # ------------------------------------------------------------------
+
+    def upsert_summaries(self, summaries: List[Dict[str, Any]]) -> int:
+        """Insert or update activity summaries from the Strava activity list.
+
+        Args:
+            summaries: Dicts with activity_id, start_date_local ("YYYY-MM-DD HH:MM:SS"),
+                sport_type, name, distance, moving_time and average_speed
+
+        Returns:
+            int: Number of summaries written
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO strava_activity_index "
+                "(activity_id, start_date_local, sport_type, name, distance, moving_time, average_speed) "
+                "VALUES (:activity_id, :start_date_local, :sport_type, :name, :distance, :moving_time, :average_speed) "
+                "ON CONFLICT(activity_id) DO UPDATE SET "
+                "start_date_local = excluded.start_date_local, sport_type = excluded.sport_type, "
+                "name = excluded.name, distance = excluded.distance, moving_time = excluded.moving_time, "
+                "average_speed = excluded.average_speed",
+                summaries,
+            )
+        return len(summaries)
+
+    def summaries_on_date(self, date: str, sport_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Activity summaries that started on a local date (YYYY-MM-DD), earliest first."""
+        query = (
+            "SELECT activity_id, start_date_local, sport_type, name, distance, moving_time, average_speed "
+            "FROM strava_activity_index WHERE start_date_local >= ? AND start_date_local < ?"
+        )
+        params: List[Any] = [date, f"{date}~"]
+        if sport_type:
+            query += " AND sport_type = ?"
+            params.append(sport_type)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY start_date_local", params).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_summary(self, activity_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT activity_id, start_date_local, sport_type, name, distance, moving_time, average_speed "
+                "FROM strava_activity_index WHERE activity_id = ?", (int(activity_id),)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def delete_summary(self, activity_id: int) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM strava_activity_index WHERE activity_id = ?", (int(activity_id),)
+            )
+        return cursor.rowcount > 0
+
+    def summaries_without_activity(self,
+                                   sport_type: Optional[str] = None,
+                                   after: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Indexed activities whose details and streams are not stored yet, oldest first.
+
+        Args:
+            sport_type: Only return this sport type (e.g. "Run")
+            after: Only return activities starting after this start_date_local value
+        """
+        query = (
+            "SELECT i.activity_id, i.start_date_local, i.sport_type, i.name "
+            "FROM strava_activity_index i LEFT JOIN activities a ON a.activity_id = i.activity_id "
+            "WHERE a.activity_id IS NULL"
+        )
+        params: List[Any] = []
+        if sport_type:
+            query += " AND i.sport_type = ?"
+            params.append(sport_type)
+        if after:
+            query += " AND i.start_date_local > ?"
+            params.append(after)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY i.start_date_local", params).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_laps_payload(self, activity_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT laps_payload FROM strava_activity_index WHERE activity_id = ?", (int(activity_id),)
+            ).fetchone()
+        return json.loads(row["laps_payload"]) if row and row["laps_payload"] else None
+
+    def set_laps_payload(self, activity_id: int, payload: Optional[Dict[str, Any]]) -> None:
+        """Cache (or clear, with None) the lap data fetched for an indexed activity."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE strava_activity_index SET laps_payload = ? WHERE activity_id = ?",
+                (json.dumps(payload, default=str) if payload is not None else None, int(activity_id)),
+            )
+
+    def get_sync_state(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM strava_sync_state WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def set_sync_state(self, key: str, value: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO strava_sync_state (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM activities").fetchone()[0]
@@ -0,0 +1,153 @@
+"""
+Local mirror of Google Calendar events.
+
+Events are kept per calendar with their start and end normalised to UTC so
+day and week windows are answered with one indexed range query. The
+syncToken returned by Google is stored alongside, so the mirror can be
+brought up to date with incremental (delta) syncs.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calendar_events (
+    calendar_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    event_type TEXT,
+    start_utc TEXT,
+    end_utc TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (calendar_id, event_id)
+);
+CREATE INDEX IF NOT EXISTS idx_calendar_events_start ON calendar_events(calendar_id, start_utc);
+
+CREATE TABLE IF NOT EXISTS calendar_sync (
+    calendar_id TEXT PRIMARY KEY,
+    sync_token TEXT,
+    window_start TEXT,
+    synced_at REAL
+);
+"""
+
+
+def to_utc(event_time: Dict[str, str]) -> Optional[str]:
+    """Normalise a Calendar API start/end object to "YYYY-MM-DDTHH:MM:SSZ"."""
+    if not event_time:
+        return None
+    if "dateTime" in event_time:
+        dt = datetime.fromisoformat(event_time["dateTime"].replace("Z", "+00:00"))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    if "date" in event_time:
+        return f"{event_time['date']}T00:00:00Z"
+    return None
+
+
+class CalendarStore:
+    """SQLite-backed mirror of calendar events and their sync tokens."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def upsert_events(self, calendar_id: str, events: List[Dict[str, Any]]) -> int:
+        """Apply events from the Calendar API; cancelled events are removed.
+
+        Returns:
+            int: Number of events written or removed
+        """
+        with self._lock, self._conn:
+            for event in events:
+                if event.get("status") == "cancelled":
+                    self._conn.execute(
+                        "DELETE FROM calendar_events WHERE calendar_id = ? AND event_id = ?",
+                        (calendar_id, event["id"]),
+                    )
+                    continue
+                self._conn.execute(
+                    "INSERT INTO calendar_events (calendar_id, event_id, event_type, start_utc, end_utc, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(calendar_id, event_id) DO UPDATE SET "
+                    "event_type = excluded.event_type, start_utc = excluded.start_utc, "
+                    "end_utc = excluded.end_utc, data = excluded.data",
+                    (
+                        calendar_id,
+                        event["id"],
+                        event.get("eventType", "default"),
+                        to_utc(event.get("start")),
+                        to_utc(event.get("end")),
+                        json.dumps(event),
+                    ),
+                )
+        return len(events)
+
+    def delete_event(self, calendar_id: str, event_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM calendar_events WHERE calendar_id = ? AND event_id = ?",
+                (calendar_id, event_id),
+            )
+
+    def clear(self, calendar_id: str) -> None:
+        """Drop every mirrored event and the sync token of a calendar."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM calendar_events WHERE calendar_id = ?", (calendar_id,))
+            self._conn.execute("DELETE FROM calendar_sync WHERE calendar_id = ?", (calendar_id,))
+
+    def events_between(self,
+                       calendar_id: str,
+                       time_min: str,
+                       time_max: str,
+                       event_type: Optional[str] = "default") -> List[Dict[str, Any]]:
+        """Events overlapping [time_min, time_max), ordered by start time.
+
+        Args:
+            calendar_id: Calendar to read
+            time_min: Window start as "YYYY-MM-DDTHH:MM:SSZ"
+            time_max: Window end as "YYYY-MM-DDTHH:MM:SSZ"
+            event_type: Only return this event type (None for all)
+
+        Returns:
+            List of Calendar API event dicts
+        """
+        query = (
+            "SELECT data FROM calendar_events "
+            "WHERE calendar_id = ? AND start_utc < ? AND end_utc > ?"
+        )
+        params: List[Any] = [calendar_id, time_max, time_min]
+        if event_type:
+            query += " AND event_type = ?"
+            params.append(event_type)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY start_utc", params).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def get_sync_state(self, calendar_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sync_token, window_start, synced_at FROM calendar_sync WHERE calendar_id = ?",
+                (calendar_id,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def set_sync_state(self, calendar_id: str, sync_token: Optional[str], window_start: str, synced_at: float) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO calendar_sync (calendar_id, sync_token, window_start, synced_at) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(calendar_id) DO UPDATE SET sync_token = excluded.sync_token, "
+                "window_start = excluded.window_start, synced_at = excluded.synced_at",
+                (calendar_id, sync_token, window_start, synced_at),
+            )
@@ -1,10 +1,15 @@
-import chromadb
-from chromadb.config import Settings
 from pathlib import Path
 import os
 import json
+import threading
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
+from .session_store import SessionStore
+from .activity_store import ActivityStore
+from .calendar_store import CalendarStore
+from .weather_store import WeatherStore
+from .embedding_cache import EmbeddingCache
+from .rag_index import RagLexicalIndex
 
 class ChromaService:
     def __init__(self):
@@ -15,49 +20,159 @@ class ChromaService:
         # Create the database directory if it doesn't exist
         DB_DIR.mkdir(parents=True, exist_ok=True)
         
-        # Initialize ChromaDB client
-        self.client = chromadb.PersistentClient(
-            path=str(DB_DIR),
-            settings=Settings(
-                anonymized_telemetry=False,
-                allow_reset=True
-                #is_persistent=True
-            )
-        )
+        # ChromaDB is opened on first use (see the client property) so importing
+        # the service does not load chromadb and its embedding stack
+        self._db_dir = DB_DIR
+        self._client = None
+        self._collection = None
+        self._client_lock = threading.RLock()
         
-        # Disable telemetry to avoid capture() error
-        try:
-            import chromadb.telemetry as telemetry_module
-            telemetry_module.TelemetryClient = None
-        except:
-            pass
-        
-        # Create or get the main collection
-        self.collection = self.client.get_or_create_collection(
-            name="agent_memory",
-            metadata={"description": "Memory storage for AI agents"}
+        # Training plan sessions live in a relational store; Chroma is kept for vector search.
+        # Sessions of older data directories are moved over by `python -m db.migrate`
+        self.sessions = SessionStore(APP_DIR / "data" / "coach.db")
+        
+        # Strava activities and their streams are kept apart from sessions and memories
+        self.activities = ActivityStore(APP_DIR / "data" / "coach.db")
+        
+        # Local mirror of Google Calendar events
+        self.calendar = CalendarStore(APP_DIR / "data" / "coach.db")
+        
+        # Cached weather forecasts per location and day
+        self.weather = WeatherStore(APP_DIR / "data" / "coach.db")
+        
+        # Embeddings by content hash, kept in their own file as they are large
+        self.embedding_cache = EmbeddingCache(
+            APP_DIR / "data" / "embedding_cache.db",
+            max_entries=int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "100000"))
         )
+        self._embedding_function = None
+        
+        # BM25 index over the rag_knowledge chunks, kept in step with the collection
+        self.rag_index = RagLexicalIndex(APP_DIR / "data" / "coach.db")
+    
+    @property
+    def client(self):
+        """ChromaDB client, created on first access."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import chromadb
+                    from chromadb.config import Settings
+                    
+                    client = chromadb.PersistentClient(
+                        path=str(self._db_dir),
+                        settings=Settings(
+                            anonymized_telemetry=False,
+                            allow_reset=True
+                            #is_persistent=True
+                        )
+                    )
+                    
+                    # Disable telemetry to avoid capture() error
+                    try:
+                        import chromadb.telemetry as telemetry_module
+                        telemetry_module.TelemetryClient = None
+                    except:
+                        pass
+                    
+                    self._client = client
+        return self._client
+    
+    @property
+    def collection(self):
+        """The agent_memory collection, created or opened on first access."""
+        if self._collection is None:
+            with self._client_lock:
+                if self._collection is None:
+                    self._collection = self.client.get_or_create_collection(
+                        name="agent_memory",
+                        metadata={"description": "Memory storage for AI agents"}
+                    )
+        return self._collection
+    
+    @property
+    def embedding_function(self):
+        """Chroma's default embedding function, the one the collections embed queries with."""
+        if self._embedding_function is None:
+            with self._client_lock:
+                if self._embedding_function is None:
+                    from chromadb.utils import embedding_functions
+                    self._embedding_function = embedding_functions.DefaultEmbeddingFunction()
+        return self._embedding_function
+    
+    def _copy_legacy_sessions(self, session_ids: List[str]) -> int:
+        """Copy the given session records from agent_memory into the session store."""
+        results = self.collection.get(ids=session_ids, include=["documents", "metadatas"])
+        return self.sessions.add_sessions([
+            {
+                "id": results['ids'][i],
+                "document": results['documents'][i],
+                "metadata": self._deserialize_metadata(results['metadatas'][i])
+            }
+            for i in range(len(results['ids']))
+        ])
+    
+    @staticmethod
+    def _as_results(records: List[Dict[str, Any]]) -> Dict[str, List]:
+        """Shape session store records like a Chroma get() result."""
+        return {
+            'ids': [record['id'] for record in records],
+            'documents': [record['document'] for record in records],
+            'metadatas': [record['metadata'] for record in records]
+        }
+    
+    def _allocate_memory_ids(self, count: int) -> List[str]:
+        """Reserve memory ids from the persistent counter instead of counting the collection."""
+        floor = 0
+        if not self.sessions.has_counter("memory"):
+            # First allocation on an existing data dir: start above the highest legacy id
+            for existing_id in self.collection.get(include=[])['ids']:
+                if existing_id.startswith("memory_") and existing_id[7:].isdigit():
+                    floor = max(floor, int(existing_id[7:]))
+        return [f"memory_{n}" for n in self.sessions.allocate_ids("memory", count, floor)]
     
     def add_memory(self, 
                    text: str, 
                    metadata: Optional[Dict[str, Any]] = None,
                    embedding: Optional[List[float]] = None) -> str:
         """Add a new memory to the database"""
-        if metadata is None:
-            metadata = {}
+        return self.add_memories(
+            [text],
+            metadatas=[metadata] if metadata is not None else None,
+            embeddings=[embedding] if embedding else None
+        )[0]
+    
+    def add_memories(self,
+                     texts: List[str],
+                     metadatas: Optional[List[Dict[str, Any]]] = None,
+                     embeddings: Optional[List[List[float]]] = None) -> List[str]:
+        """Add several memories in a single collection write.
+        
+        Args:
+            texts: Memory documents
+            metadatas: Optional metadata per memory
+            embeddings: Optional precomputed embedding per memory
             
-        # Generate a unique ID for the memory
-        memory_id = f"memory_{len(self.collection.get()['ids']) + 1}"
+        Returns:
+            List[str]: The ids assigned to the memories, in input order
+        """
+        if not texts:
+            return []
+        if metadatas is None:
+            metadatas = [{} for _ in texts]
+        
+        # Generate unique IDs for the memories
+        memory_ids = self._allocate_memory_ids(len(texts))
         
-        # Add the memory to the collection
+        # Add the memories to the collection
         self.collection.add(
-            documents=[text],
-            metadatas=[metadata],
-            ids=[memory_id],
-            embeddings=[embedding] if embedding else None
+            documents=list(texts),
+            metadatas=metadatas,
+            ids=memory_ids,
+            embeddings=embeddings
         )
         
-        return memory_id
+        return memory_ids
     
     def search_memories(self, 
                        query: str, 
@@ -107,69 +222,37 @@ class ChromaService:
             return False
 
     def store_training_plan(self, sessions: List[Dict], metadata: Dict) -> str:
-        """Store training plan sessions in ChromaDB.
+        """Store training plan sessions in the session store.
         
         Args:
             sessions: List of session dictionaries
             metadata: Additional metadata for the plan
             
         Returns:
-            str: Plan ID
+            str: "success" or the error message
         """
         try:
-            # Generate unique IDs for each session
-            ids = [f"session_{i:03d}" for i in range(1, len(sessions) + 1)]
-            
-            # Create document strings for each session
-            documents = []
-            for session in sessions:
+            records = []
+            for i, session in enumerate(sessions, start=1):
                 doc = f"Session planned for {session['date']}, {session['distance']} {session['type']}"
                 if session.get('notes'):
                     doc += f", {session['notes']}"
-                documents.append(doc)
-            
-            # Prepare metadata for each session with new structure
-            metadatas = []
-            for session in sessions:
-                session_metadata = {
-                    "date": session["date"],
-                    "day": session["day"],
-                    "type": session["type"],
-                    "distance": session["distance"],
-                    "notes": session.get("notes", ""),
-                    # New fields with default empty values (serialized as JSON strings)
-                    "calendar": json.dumps({
-                        "events": []
-                    }),
-                    "weather": json.dumps({
-                        "hours": []
-                    }),
-                    "time_scheduled": json.dumps([]),
-                    "data_points": json.dumps({
-                        "laps": []
-                    }),
-                    "session_completed": False
-                }
-                metadatas.append(session_metadata)
+                records.append({
+                    "id": f"session_{i:03d}",
+                    "document": doc,
+                    "metadata": {
+                        "date": session["date"],
+                        "day": session["day"],
+                        "type": session["type"],
+                        "distance": session["distance"],
+                        "notes": session.get("notes", ""),
+                        "session_completed": False
+                    }
+                })
             
-            # Add the sessions to the collection
-            try:
-                self.collection.add(
-                    ids=ids,
-                    documents=documents,
-                    metadatas=metadatas
-                )
-                print(f"Successfully stored {len(sessions)} training plan sessions")
-                return "success"
-            except Exception as add_error:
-                # Check if it's a telemetry error (non-critical)
-                if "telemetry" in str(add_error).lower() or "capture()" in str(add_error):
-                    print(f"ChromaDB telemetry warning (non-critical): {str(add_error)}")
-                    # Still return success since the data was likely stored
-                    return "success"
-                else:
-                    # Re-raise non-telemetry errors
-                    raise add_error
+            self.sessions.add_sessions(records)
+            print(f"Successfully stored {len(sessions)} training plan sessions")
+            return "success"
             
         except Exception as e:
             print(f"Error storing training plan: {str(e)}")
@@ -188,6 +271,52 @@ class ChromaService:
         
 
 
+    def patch_sessions(self,
+                       patches: Dict[str, Dict[str, Any]],
+                       expected_versions: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """Apply field changes to many sessions in a single write.
+        
+        Args:
+            patches: Mapping of session id to the metadata fields to change
+            expected_versions: Optional mapping of session id to the 'version' the
+                caller read; sessions changed by another writer since are skipped
+            
+        Returns:
+            Dict containing:
+                - status: "success", "conflict" or "error"
+                - updated: Session ids that were written
+                - missing: Session ids that do not exist
+                - conflicts: Session ids whose version no longer matched
+        """
+        try:
+            result = self.sessions.patch_sessions(patches, expected_versions)
+            return {"status": "conflict" if result["conflicts"] else "success", **result}
+        except Exception as e:
+            print(f"Error patching sessions: {str(e)}")
+            return {"status": "error", "updated": [], "missing": [], "conflicts": [], "message": str(e)}
+
+    def patch_sessions_by_date(self, patches_by_date: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Apply field changes to the sessions on each given date in a single write.
+        
+        Args:
+            patches_by_date: Mapping of YYYY-MM-DD date to the metadata fields to change
+            
+        Returns:
+            Dict containing:
+                - status: "success" or "error"
+                - updated: Session ids that were written
+                - missing: Dates without a session
+        """
+        try:
+            result = self.sessions.patch_sessions_by_date(patches_by_date)
+            return {"status": "success", **result}
+        except Exception as e:
+            print(f"Error patching sessions by date: {str(e)}")
+            return {"status": "error", "updated": [], "missing": [], "conflicts": [], "message": str(e)}
+
+    def _patch_session(self, session_id: str, updates: Dict[str, Any]) -> bool:
+        return bool(self.sessions.patch_sessions({session_id: updates})["updated"])
+
     def update_session_calendar(self, session_id: str, calendar_events: List[Dict]) -> bool:
         """Update calendar events for a specific session.
         
@@ -199,26 +328,7 @@ class ChromaService:
             bool: True if successful, False otherwise
         """
         try:
-            # Get current session metadata
-            result = self.collection.get(ids=[session_id])
-            if not result['ids']:
-                return False
-            
-            current_metadata = result['metadatas'][0]
-            
-            # Update calendar events
-            current_metadata['calendar'] = json.dumps({
-                "events": calendar_events
-            })
-            
-            # Update the session
-            self.collection.update(
-                ids=[session_id],
-                metadatas=[current_metadata]
-            )
-            
-            return True
-            
+            return self._patch_session(session_id, {"calendar": {"events": calendar_events}})
         except Exception as e:
             print(f"Error updating session calendar: {str(e)}")
             return False
@@ -234,24 +344,7 @@ class ChromaService:
             bool: True if successful, False otherwise
         """
         try:
-            # Get current session metadata
-            result = self.collection.get(ids=[session_id])
-            if not result['ids']:
-                return False
-            
-            current_metadata = result['metadatas'][0]
-            
-            # Update weather data
-            current_metadata['weather'] = json.dumps(weather_data)
-            
-            # Update the session
-            self.collection.update(
-                ids=[session_id],
-                metadatas=[current_metadata]
-            )
-            
-            return True
-            
+            return self._patch_session(session_id, {"weather": weather_data})
         except Exception as e:
             print(f"Error updating session weather: {str(e)}")
             return False
@@ -267,24 +360,7 @@ class ChromaService:
             bool: True if successful, False otherwise
         """
         try:
-            # Get current session metadata
-            result = self.collection.get(ids=[session_id])
-            if not result['ids']:
-                return False
-            
-            current_metadata = result['metadatas'][0]
-            
-            # Update time scheduled
-            current_metadata['time_scheduled'] = json.dumps(time_scheduled)
-            
-            # Update the session
-            self.collection.update(
-                ids=[session_id],
-                metadatas=[current_metadata]
-            )
-            
-            return True
-            
+            return self._patch_session(session_id, {"time_scheduled": time_scheduled})
         except Exception as e:
             print(f"Error updating session time scheduled: {str(e)}")
             return False
@@ -300,24 +376,7 @@ class ChromaService:
             bool: True if successful, False otherwise
         """
         try:
-            # Get current session metadata
-            result = self.collection.get(ids=[session_id])
-            if not result['ids']:
-                return False
-            
-            current_metadata = result['metadatas'][0]
-            
-            # Update session completion status
-            current_metadata['session_completed'] = session_completed
-            
-            # Update the session
-            self.collection.update(
-                ids=[session_id],
-                metadatas=[current_metadata]
-            )
-            
-            return True
-            
+            return self._patch_session(session_id, {"session_completed": session_completed})
         except Exception as e:
             print(f"Error updating session status: {str(e)}")
             return False
@@ -333,24 +392,7 @@ class ChromaService:
             bool: True if successful, False otherwise
         """
         try:
-            # Get current session metadata
-            result = self.collection.get(ids=[session_id])
-            if not result['ids']:
-                return False
-            
-            current_metadata = result['metadatas'][0]
-            
-            # Update the metadata with new values
-            current_metadata.update(updates)
-            
-            # Update the session
-            self.collection.update(
-                ids=[session_id],
-                metadatas=[current_metadata]
-            )
-            
-            return True
-            
+            return self._patch_session(session_id, updates)
         except Exception as e:
             print(f"Error updating session metadata: {str(e)}")
             return False
@@ -396,18 +438,43 @@ class ChromaService:
     def get_session_by_date(self, date: str) -> List[Dict]:
         """Get sessions from a specific date IN THE FORMAT YYYY-MM-DD"""
         try:
-            results = self.collection.get(where={"date": date})
-            
-            # Deserialize JSON strings in metadata
-            if results and 'metadatas' in results:
-                for i, metadata in enumerate(results['metadatas']):
-                    results['metadatas'][i] = self._deserialize_metadata(metadata)
-            
-            return results
+            return self._as_results(self.sessions.get_by_date(date))
         except Exception as e:
             print(f"Error retrieving today's sessions: {str(e)}")
             return []
 
+    def get_sessions_by_status(self, session_completed: bool) -> Dict:
+        """Get all sessions with the given completion status, ordered by date."""
+        return self._as_results(self.sessions.get_by_status(session_completed))
+
+    def get_session_by_activity_id(self, activity_id: int) -> Dict:
+        """Get the session(s) linked to a Strava activity."""
+        return self._as_results(self.sessions.get_by_activity(activity_id))
+
+    def delete_all_sessions(self) -> int:
+        """Delete every training plan session. Returns the number deleted."""
+        return self.sessions.delete_all()
+
+    def get_sessions_in_range(self, start_date: str, end_date: str) -> Dict:
+        """Get all sessions between two dates (inclusive) with a single indexed query.
+        
+        Args:
+            start_date: First date of the window in YYYY-MM-DD format
+            end_date: Last date of the window in YYYY-MM-DD format
+            
+        Returns:
+            Dict with 'ids', 'documents' and 'metadatas' lists, ordered by date
+        
+        Raises:
+            ValueError: If a date is not in YYYY-MM-DD format or end_date < start_date
+        """
+        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+        end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+        if end_dt < start_dt:
+            raise ValueError("end_date must not be before start_date")
+        
+        return self._as_results(self.sessions.get_in_range(start_date, end_date))
+
     def get_weekly_sessions(self, start_date: str) -> Dict:
         """Get sessions for a week starting from the given date (Monday).
         
@@ -422,8 +489,6 @@ class ChromaService:
                 - message: Description of the result
         """
         try:
-            from datetime import datetime, timedelta
-            
             # Validate start_date format
             try:
                 start_dt = datetime.strptime(start_date, "%Y-%m-%d")
@@ -447,34 +512,16 @@ class ChromaService:
             start_date_of_week = monday_dt.strftime("%Y-%m-%d")
             end_date_of_week = sunday_dt.strftime("%Y-%m-%d")
             
-            # Get all sessions for the week by querying each day individually
+            # Get all sessions for the week in one query
+            results = self.get_sessions_in_range(start_date_of_week, end_date_of_week)
             daily_sessions = {}
-            
-            for i in range(7):
-                current_date = (monday_dt + timedelta(days=i)).strftime("%Y-%m-%d")
-                
-                # Get sessions for this specific date
-                results = self.collection.get(
-                    where={"date": current_date}
-                )
-                
-                # Check if we have any results for this date
-                if (results and 'ids' in results and results['ids'] and 
-                    len(results['ids']) > 0):
-                    
-                    # Deserialize JSON strings in metadata
-                    if 'metadatas' in results and results['metadatas'] and len(results['metadatas']) > 0:
-                        for j, metadata in enumerate(results['metadatas']):
-                            results['metadatas'][j] = self._deserialize_metadata(metadata)
-                    
-                    # Process the results for this date
-                    for j in range(len(results['ids'])):
-                        session_date = results['metadatas'][j].get('date', '')
-                        daily_sessions[session_date] = {
-                            'id': results['ids'][j],
-                            'session': results['documents'][j],
-                            'metadata': results['metadatas'][j]
-                        }
+            for j in range(len(results['ids'])):
+                session_date = results['metadatas'][j].get('date', '')
+                daily_sessions[session_date] = {
+                    'id': results['ids'][j],
+                    'session': results['documents'][j],
+                    'metadata': results['metadatas'][j]
+                }
             
             # Create a complete week structure (Monday to Sunday)
             week_data = []
@@ -482,6 +529,7 @@ class ChromaService:
             total_distance_completed = 0            
             total_sessions = 0
             completed_sessions = 0
+            today = datetime.now().strftime("%Y-%m-%d")
             
             for i in range(7):
                 current_date = (monday_dt + timedelta(days=i)).strftime("%Y-%m-%d")
@@ -493,8 +541,8 @@ class ChromaService:
                     
                     # Extract session information
                     session_type = metadata.get('type', 'No Session')
-                    actual_distance = metadata.get('actual_distance', 0)
-                    planned_distance = metadata.get('distance', 0)
+                    actual_distance = metadata.get('actual_distance') or 0
+                    planned_distance = metadata.get('distance') or 0
                     session_completed = metadata.get('session_completed', False)
                     
                     # Update totals
@@ -514,7 +562,7 @@ class ChromaService:
                         'actual_distance': actual_distance,
                         'session_completed': session_completed,
                         'has_activity': session_type != 'Rest Day' and actual_distance > 0,
-                        'is_today': current_date == datetime.now().strftime("%Y-%m-%d")
+                        'is_today': current_date == today
                     })
                 else:
                     # No session data for this day
@@ -526,7 +574,7 @@ class ChromaService:
                         'actual_distance': 0,
                         'session_completed': False,
                         'has_activity': False,
-                        'is_today': current_date == datetime.now().strftime("%Y-%m-%d")
+                        'is_today': current_date == today
                     })
             
             # Create weekly summary
@@ -556,33 +604,24 @@ class ChromaService:
                 "message": f"Error retrieving weekly sessions: {str(e)}"
             }
 
-    def get_upcoming_sessions(self, days: int = 7) -> List[Dict]:
-        """Get sessions scheduled for the next n days."""
+    def get_upcoming_sessions(self, days: int = 7) -> Dict:
+        """Get sessions scheduled for the next n days.
+        
+        Returns:
+            Dict with 'ids', 'documents' and 'metadatas' lists, ordered by date
+            (all empty if the sessions could not be read)
+        """
         try:
             today = datetime.now()
             end_date = (today + timedelta(days=days)).strftime("%Y-%m-%d")
             
-            results = self.collection.query(
-                where={
-                    "date": {
-                        "$gte": today.strftime("%Y-%m-%d"),
-                        "$lte": end_date
-                    }
-                }
-            )
-            
-            # Deserialize JSON strings in metadata
-            if results and 'metadatas' in results and results['metadatas']:
-                for i, metadata in enumerate(results['metadatas'][0]):
-                    results['metadatas'][0][i] = self._deserialize_metadata(metadata)
-            
-            return results
+            return self.get_sessions_in_range(today.strftime("%Y-%m-%d"), end_date)
         except Exception as e:
             print(f"Error retrieving upcoming sessions: {str(e)}")
-            return []
+            return self._as_results([])
 
     def list_all_sessions(self) -> Dict:
-        """List all sessions stored in ChromaDB.
+        """List all training plan sessions.
         
         Returns:
             Dict containing:
@@ -591,33 +630,13 @@ class ChromaService:
                 - count: Total number of sessions
         """
         try:
-            # Get all data from the collection
-            results = self.collection.get()
-            
-            if not results:
-                return {
-                    "status": "success",
-                    "data": [],
-                    "count": 0,
-                    "message": "No sessions found in ChromaDB"
-                }
-            
-            # Format the results and deserialize metadata
-            sessions = []
-            for i in range(len(results['ids'])):
-                metadata = self._deserialize_metadata(results['metadatas'][i])
-                session = {
-                    "id": results['ids'][i],
-                    "document": results['documents'][i],
-                    "metadata": metadata
-                }
-                sessions.append(session)
+            sessions = self.sessions.list_all()
             
             return {
                 "status": "success",
                 "data": sessions,
                 "count": len(sessions),
-                "message": f"Found {len(sessions)} sessions in ChromaDB"
+                "message": f"Found {len(sessions)} sessions" if sessions else "No sessions found"
             }
             
         except Exception as e:
@@ -628,12 +647,44 @@ class ChromaService:
                 "message": f"Error listing sessions: {str(e)}"
             }
 
-    def get_activity_by_id(self, activity_id: int) -> Dict:
+    def store_activity(self, activity_id: int, metadata: Dict[str, Any], data_points: Optional[Dict[str, Any]] = None) -> bool:
+        """Store (or replace) a Strava activity in the activity store.
+        
+        Args:
+            activity_id: The Strava activity ID
+            metadata: Activity summary fields
+            data_points: Dict with 'laps' and 'streams' lists
+            
+        Returns:
+            bool: True if stored successfully
+        """
+        try:
+            self.activities.put_activity(activity_id, metadata, data_points)
+            return True
+        except Exception as e:
+            print(f"Error storing activity {activity_id}: {str(e)}")
+            return False
+    
+    def store_activities(self, activities: List[Dict[str, Any]]) -> int:
+        """Store a batch of activities (same format as write_activity_data) in one write.
+        
+        Returns:
+            int: Number of activities stored, 0 on error
+        """
+        try:
+            return self.activities.put_activities(activities)
+        except Exception as e:
+            print(f"Error storing {len(activities)} activities: {str(e)}")
+            return 0
+    
+    def get_activity_by_id(self, activity_id: int, streams_as_arrays: bool = False) -> Dict:
         """
         Retrieves activity data by activity_id from the database.
         
         Args:
             activity_id: The Strava activity ID
+            streams_as_arrays: Return data_points['streams'] as a dict of NumPy
+                column arrays instead of a list of point dicts
             
         Returns:
             Dict containing:
@@ -642,33 +693,20 @@ class ChromaService:
                 - activity_data: The activity data or None if not found
         """
         try:
-            activity_id_str = str(activity_id)
-            results = self.collection.get(ids=[activity_id_str])
-            
-            if not results['ids']:
+            activity_data = self.activities.get_activity(activity_id, include_streams=not streams_as_arrays)
+            if activity_data is not None and streams_as_arrays:
+                activity_data["data_points"]["streams"] = self.activities.load_streams(activity_id) or {}
+            if activity_data is None:
+                # Data dirs that have not been migrated yet still hold activities in agent_memory
+                activity_data = self._get_legacy_activity(activity_id)
+            
+            if activity_data is None:
                 return {
                     "status": "error",
                     "message": f"No activity found with ID: {activity_id}",
                     "activity_data": None
                 }
             
-            # Reconstruct the activity data structure
-            document = results['documents'][0]
-            metadata = results['metadatas'][0]
-            
-            # Parse data_points separately to avoid duplication
-            data_points = {}
-            if metadata.get("data_points"):
-                data_points = json.loads(metadata["data_points"])
-                # Remove data_points from metadata to avoid duplication
-                del metadata["data_points"]
-            
-            activity_data = {
-                "activity_id": activity_id,
-                "metadata": metadata,  # metadata without data_points
-                "data_points": data_points  # data_points as separate field
-            }
-            
             return {
                 "status": "success",
                 "message": f"Found activity data for ID: {activity_id}",
@@ -681,6 +719,67 @@ class ChromaService:
                 "message": f"Error retrieving activity data: {str(e)}",
                 "activity_data": None
             }
+    
+    def _get_legacy_activity(self, activity_id: int) -> Optional[Dict[str, Any]]:
+        """Read an activity stored as Chroma metadata by older versions."""
+        results = self.collection.get(ids=[str(activity_id)])
+        if not results['ids']:
+            return None
+        return self._legacy_activity_record(activity_id, results['metadatas'][0])
+    
+    @staticmethod
+    def _legacy_activity_record(activity_id: int, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        parsed_metadata = {}
+        data_points = {}
+        for key, value in metadata.items():
+            if key == "data_points" and value:
+                data_points = json.loads(value)
+            elif isinstance(value, str) and (value.startswith('[') or value.startswith('{')):
+                try:
+                    parsed_metadata[key] = json.loads(value)
+                except json.JSONDecodeError:
+                    parsed_metadata[key] = value
+            else:
+                parsed_metadata[key] = value
+        return {"activity_id": int(activity_id), "metadata": parsed_metadata, "data_points": data_points}
+    
+    def migrate_legacy_records(self, remove_legacy: bool = True) -> Dict[str, int]:
+        """Move sessions and activities out of the agent_memory collection.
+        
+        Older data directories kept training sessions ("session_NNN") and Strava
+        activities (keyed by raw activity id) in agent_memory next to free-form
+        memories. This copies them into the session and activity stores and, by
+        default, deletes them from the collection so only memories remain.
+        
+        Args:
+            remove_legacy: Delete the migrated records from agent_memory
+            
+        Returns:
+            Dict with the number of sessions and activities migrated
+        """
+        all_ids = self.collection.get(include=[])['ids']
+        session_ids = [i for i in all_ids if i.startswith("session_")]
+        activity_ids = [i for i in all_ids if i.isdigit()]
+        migrated = {"sessions": 0, "activities": 0}
+        
+        if session_ids:
+            migrated["sessions"] = self._copy_legacy_sessions(session_ids)
+        self.sessions.set_meta("legacy_sessions_imported", datetime.now().isoformat())
+        
+        # Activities carry their streams, so move them one at a time to bound memory use
+        for activity_id in activity_ids:
+            results = self.collection.get(ids=[activity_id], include=["metadatas"])
+            if not results['ids']:
+                continue
+            record = self._legacy_activity_record(int(activity_id), results['metadatas'][0])
+            if not self.activities.has_activity(record["activity_id"]):
+                self.activities.put_activity(record["activity_id"], record["metadata"], record["data_points"])
+                migrated["activities"] += 1
+        
+        if remove_legacy and (session_ids or activity_ids):
+            self.collection.delete(ids=session_ids + activity_ids)
+        
+        return migrated
 
 # Create a singleton instance
 chroma_service = ChromaService() 
\ No newline at end of file
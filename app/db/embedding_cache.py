@@ -0,0 +1,97 @@
+"""
+On-disk cache of text embeddings keyed by content hash.
+
+Vectors are stored as float32 blobs under sha256(model + text), so
+re-ingesting a document whose chunks were embedded before costs a lookup
+instead of a model run. The cache keeps at most max_entries vectors and
+evicts the least recently used ones when it grows past that.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    content_hash TEXT PRIMARY KEY,
+    vector BLOB NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used ON embedding_cache(last_used);
+"""
+
+
+def content_hash(model: str, text: str) -> str:
+    """Cache key of a text embedded with a given model."""
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite-backed LRU cache of float32 embedding vectors."""
+
+    def __init__(self, db_path: Path, max_entries: int = 100_000):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def get_many(self, hashes: Iterable[str]) -> Dict[str, List[float]]:
+        """Cached vectors for the given hashes; hits are marked as recently used."""
+        # NumPy is imported on the first lookup, not at server start
+        import numpy as np
+
+        hashes = list(dict.fromkeys(hashes))
+        found: Dict[str, List[float]] = {}
+        now = time.time()
+        with self._lock:
+            # Stay well below SQLite's bound parameter limit
+            for offset in range(0, len(hashes), 500):
+                batch = hashes[offset:offset + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT content_hash, vector FROM embedding_cache WHERE content_hash IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+            if found:
+                with self._conn:
+                    self._conn.executemany(
+                        "UPDATE embedding_cache SET last_used = ? WHERE content_hash = ?",
+                        [(now, key) for key in found],
+                    )
+        return found
+
+    def put_many(self, vectors: Dict[str, List[float]]) -> None:
+        """Store vectors by hash and evict the least recently used ones beyond max_entries."""
+        if not vectors:
+            return
+        import numpy as np
+
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache (content_hash, vector, last_used) VALUES (?, ?, ?)",
+                [(key, np.asarray(vector, dtype=np.float32).tobytes(), now) for key, vector in vectors.items()],
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+            if count > self.max_entries:
+                # Evict down to 90% so eviction does not run on every insert
+                excess = count - int(self.max_entries * 0.9)
+                self._conn.execute(
+                    "DELETE FROM embedding_cache WHERE content_hash IN "
+                    "(SELECT content_hash FROM embedding_cache ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+        return {"entries": count, "max_entries": self.max_entries}
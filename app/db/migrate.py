@@ -0,0 +1,32 @@
+"""
+Migrate an existing data directory to the split storage layout.
+
+Moves training sessions and Strava activities out of the ``agent_memory``
+Chroma collection into the SQLite session and activity stores, leaving only
+free-form memories in the collection.
+
+Usage (from the app directory):
+    python -m db.migrate [--keep-legacy]
+"""
+
+import argparse
+
+from .chroma_service import chroma_service
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Move sessions and activities out of agent_memory.")
+    parser.add_argument(
+        "--keep-legacy",
+        action="store_true",
+        help="copy records without deleting them from the agent_memory collection",
+    )
+    args = parser.parse_args()
+
+    migrated = chroma_service.migrate_legacy_records(remove_legacy=not args.keep_legacy)
+    print(f"Migrated {migrated['sessions']} sessions and {migrated['activities']} activities")
+    print(f"agent_memory now holds {chroma_service.collection.count()} memories")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Lexical (BM25) index over the RAG knowledge chunks.
+
+A SQLite FTS5 table mirrors the text of every chunk in the rag_knowledge
+collection: its content, its title/section/document title and its
+authors/source. It is updated together with the collection on ingest and
+delete, so keyword queries ("cadence 180", an author's name) are answered
+from the inverted index with BM25 ranking instead of embeddings alone.
+Stopwords and terms found in most chunks are left out of the query, as they
+match nearly everything and carry no ranking signal.
+"""
+
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS rag_lexical USING fts5(
+    chunk_id UNINDEXED,
+    document_id UNINDEXED,
+    category UNINDEXED,
+    content,
+    title,
+    authors,
+    tokenize = 'porter unicode61'
+);
+"""
+
+# BM25 weights of the content, title and authors columns
+COLUMN_WEIGHTS = (1.0, 2.0, 1.5)
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# Query terms in more than this fraction of the indexed chunks are dropped (low IDF)
+MAX_TERM_CHUNK_FRACTION = 0.5
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below between
+both but by can could did do does doing down during each few for from further had has have having he her
+here hers herself him himself his how i if in into is it its itself just me more most my myself no nor not
+now of off on once only or other our ours ourselves out over own same she should so some such than that the
+their theirs them themselves then there these they this those through to too under until up very was we
+were what when where which while who whom why will with would you your yours yourself yourselves
+""".split())
+
+
+def lexical_fields(content: str, metadata: Optional[Dict[str, Any]]) -> Tuple[str, str, str]:
+    """The (content, title, authors) texts indexed for a chunk."""
+    metadata = metadata or {}
+    title = " ".join(str(metadata[key]) for key in ("title", "section", "document_title") if metadata.get(key))
+    authors = " ".join(str(metadata[key]) for key in ("authors", "source") if metadata.get(key))
+    return content or "", title, authors
+
+
+class RagLexicalIndex:
+    """SQLite FTS5 index of RAG chunks, queried with BM25."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def upsert(self, ids: List[str], documents: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """Index chunks, replacing earlier versions of the same ids."""
+        if not ids:
+            return
+        rows = []
+        for chunk_id, document, metadata in zip(ids, documents, metadatas):
+            metadata = metadata or {}
+            rows.append((chunk_id, metadata.get("document_id", ""), metadata.get("category", ""),
+                         *lexical_fields(document, metadata)))
+        with self._lock, self._conn:
+            self._delete(ids)
+            self._conn.executemany(
+                "INSERT INTO rag_lexical (chunk_id, document_id, category, content, title, authors) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def delete(self, ids: Iterable[str]) -> None:
+        with self._lock, self._conn:
+            self._delete(list(ids))
+
+    def delete_document(self, document_id: str, keep: Iterable[str] = ()) -> None:
+        """Remove the chunks of a document, except the ids in keep."""
+        keep = set(keep)
+        with self._lock, self._conn:
+            ids = [row[0] for row in self._conn.execute(
+                "SELECT chunk_id FROM rag_lexical WHERE document_id = ?", (document_id,)
+            ) if row[0] not in keep]
+            self._delete(ids)
+
+    def _delete(self, ids: List[str]) -> None:
+        for offset in range(0, len(ids), 500):
+            batch = ids[offset:offset + 500]
+            placeholders = ",".join("?" * len(batch))
+            self._conn.execute(f"DELETE FROM rag_lexical WHERE chunk_id IN ({placeholders})", batch)
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM rag_lexical")
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM rag_lexical").fetchone()[0]
+
+    def _match(self, query: str) -> Optional[str]:
+        """FTS match expression OR-ing the selective terms of the query, or None if there are none."""
+        terms = [term for term in dict.fromkeys(token.lower() for token in _TOKEN.findall(query))
+                 if term not in STOPWORDS]
+        if not terms:
+            return None
+        with self._lock:
+            total = self._conn.execute("SELECT COUNT(*) FROM rag_lexical").fetchone()[0]
+            selective = [
+                term for term in terms
+                if self._conn.execute(
+                    "SELECT COUNT(*) FROM rag_lexical WHERE rag_lexical MATCH ?", (f'"{term}"',)
+                ).fetchone()[0] <= total * MAX_TERM_CHUNK_FRACTION
+            ]
+        return " OR ".join(f'"{term}"' for term in selective) or None
+
+    def _where(self, match: str, category: Optional[str]) -> Tuple[str, List[Any]]:
+        where, params = "WHERE rag_lexical MATCH ?", [match]
+        if category:
+            where += " AND category = ?"
+            params.append(category)
+        return where, params
+
+    def match_count(self, query: str, category: Optional[str] = None) -> int:
+        """Number of chunks matching the selective terms of the query (see search)."""
+        match = self._match(query)
+        if not match:
+            return 0
+        where, params = self._where(match, category)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM rag_lexical {where}", params).fetchone()[0]
+
+    def search(self, query: str, limit: int = 50, category: Optional[str] = None) -> List[Tuple[str, float]]:
+        """BM25 search for chunks containing any of the selective query terms.
+
+        Args:
+            query: Free-text query; every word is matched as a term, so FTS syntax is never interpreted.
+                Stopwords and terms in more than MAX_TERM_CHUNK_FRACTION of the chunks are ignored
+            limit: Maximum number of hits
+            category: Optional exact category filter
+
+        Returns:
+            List of (chunk_id, score) with the best match first; higher scores are better
+        """
+        match = self._match(query)
+        if not match:
+            return []
+        where, params = self._where(match, category)
+        sql = (f"SELECT chunk_id, bm25(rag_lexical, 0, 0, 0, {', '.join(map(str, COLUMN_WEIGHTS))}) AS rank "
+               f"FROM rag_lexical {where} ORDER BY rank LIMIT ?")
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        # FTS5's bm25() is negated so that smaller sorts first
+        return [(chunk_id, -rank) for chunk_id, rank in rows]
@@ -0,0 +1,528 @@
+"""
+Relational storage for training plan sessions.
+
+Sessions live in SQLite with typed columns and child tables for calendar
+events, weather hours, scheduled time slots and laps, so lookups by date,
+completion status or activity are index seeks instead of metadata scans.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Columns stored directly on the sessions table
+SESSION_COLUMNS = [
+    "date",
+    "day",
+    "type",
+    "distance",
+    "notes",
+    "session_completed",
+    "activity_id",
+    "actual_distance",
+    "coach_feedback",
+]
+
+# Child tables: metadata field -> (table, wrapper key, item columns)
+# item columns map the JSON key used by the tools to the SQL column name;
+# any other item keys are kept in the table's 'extra' JSON column and any
+# other wrapper keys (e.g. data_points besides 'laps') in sessions.child_extra
+CHILD_TABLES = {
+    "calendar": ("session_calendar_events", "events", {
+        "event_id": "event_id",
+        "title": "title",
+        "start": "start_time",
+        "end": "end_time",
+    }),
+    "weather": ("session_weather_hours", "hours", {
+        "time": "time",
+        "tempC": "temp_c",
+        "desc": "description",
+    }),
+    "time_scheduled": ("session_time_scheduled", None, {
+        "title": "title",
+        "start": "start_time",
+        "end": "end_time",
+        "tempC": "temp_c",
+        "desc": "description",
+        "status": "status",
+        "actual_start": "actual_start",
+    }),
+    "data_points": ("session_laps", "laps", {
+        "lap_index": "lap_index",
+        "distance_meters": "distance_meters",
+        "pace_ms": "pace_ms",
+        "pace_min_km": "pace_min_km",
+        "pace": "pace",
+        "heartrate_bpm": "heartrate_bpm",
+        "cadence": "cadence",
+        "elapsed_time": "elapsed_time",
+        "segment": "segment",
+    }),
+}
+
+# Child columns with REAL/INTEGER affinity; values that are not numbers are
+# kept in the item's 'extra' JSON instead of being written as strings
+NUMERIC_CHILD_COLUMNS = {"lap_index", "distance_meters", "pace_ms", "pace", "heartrate_bpm", "cadence", "elapsed_time"}
+
+_DISTANCE = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*(km|k|m)?\s*$", re.IGNORECASE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    document TEXT NOT NULL DEFAULT '',
+    date TEXT NOT NULL,
+    day TEXT,
+    type TEXT,
+    distance REAL,
+    notes TEXT,
+    session_completed INTEGER NOT NULL DEFAULT 0,
+    activity_id INTEGER,
+    actual_distance REAL,
+    coach_feedback TEXT,
+    extra TEXT,
+    child_extra TEXT,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions(date);
+CREATE INDEX IF NOT EXISTS idx_sessions_completed ON sessions(session_completed, date);
+CREATE INDEX IF NOT EXISTS idx_sessions_activity ON sessions(activity_id);
+
+CREATE TABLE IF NOT EXISTS session_calendar_events (
+    session_id TEXT NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    event_id TEXT,
+    title TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    extra TEXT,
+    PRIMARY KEY (session_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS session_weather_hours (
+    session_id TEXT NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    time TEXT,
+    temp_c TEXT,
+    description TEXT,
+    extra TEXT,
+    PRIMARY KEY (session_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS session_time_scheduled (
+    session_id TEXT NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    title TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    temp_c TEXT,
+    description TEXT,
+    status TEXT,
+    actual_start TEXT,
+    extra TEXT,
+    PRIMARY KEY (session_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS session_laps (
+    session_id TEXT NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    lap_index INTEGER,
+    distance_meters REAL,
+    pace_ms REAL,
+    pace_min_km TEXT,
+    pace REAL,
+    heartrate_bpm REAL,
+    cadence REAL,
+    elapsed_time INTEGER,
+    segment TEXT,
+    extra TEXT,
+    PRIMARY KEY (session_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS id_counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Convert a distance such as 10, "10.52", "10.52km" or "850m" to kilometres.
+
+    Values without a unit are taken as kilometres; values that cannot be parsed give None.
+    """
+    if value is None or value == "" or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _DISTANCE.match(str(value))
+    if not match:
+        return None
+    number = float(match.group(1))
+    return number / 1000 if (match.group(2) or "").lower() == "m" else number
+
+
+def _to_number(value: Any) -> Optional[float]:
+    """A numeric child column value, or None if the value is not a number."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _child_items(field: str, value: Any) -> Tuple[List[Dict], Dict[str, Any]]:
+    """Split a child field's metadata value into its items and the other wrapper keys."""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            return [], {}
+    _, wrapper_key, _ = CHILD_TABLES[field]
+    # Tolerate payloads nested under their own field name, e.g. {"data_points": {"laps": [...]}}
+    if isinstance(value, dict) and field in value and wrapper_key not in value:
+        value = value[field]
+    wrapper_extra: Dict[str, Any] = {}
+    if wrapper_key and isinstance(value, dict):
+        wrapper_extra = {key: item for key, item in value.items() if key != wrapper_key}
+        value = value.get(wrapper_key, [])
+    if not isinstance(value, list):
+        return [], wrapper_extra
+    return [item for item in value if isinstance(item, dict)], wrapper_extra
+
+
+class SessionStore:
+    """SQLite-backed store for training plan sessions."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(SCHEMA)
+        self._ensure_column("sessions", "version", "INTEGER NOT NULL DEFAULT 0")
+        self._ensure_column("sessions", "child_extra", "TEXT")
+        for table, _, _ in CHILD_TABLES.values():
+            self._ensure_column(table, "extra", "TEXT")
+        self._conn.commit()
+
+    def _ensure_column(self, table: str, column: str, definition: str) -> None:
+        """Add a column to a table created by an older schema."""
+        existing = {row["name"] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+        if column not in existing:
+            self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    # ------------------------------------------------------------------
+    # Meta
+    # ------------------------------------------------------------------
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM store_meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO store_meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+
+    def has_counter(self, name: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM id_counters WHERE name = ?", (name,)).fetchone()
+        return row is not None
+
+    def allocate_ids(self, name: str, count: int = 1, floor: int = 0) -> List[int]:
+        """Reserve consecutive numbers from a persistent, monotonic counter.
+
+        Args:
+            name: Counter name, e.g. "memory"
+            count: How many numbers to reserve
+            floor: Starting value used only when the counter does not exist yet
+
+        Returns:
+            List[int]: The reserved numbers, never handed out before
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO id_counters (name, value) VALUES (?, ?)", (name, floor)
+            )
+            self._conn.execute(
+                "UPDATE id_counters SET value = value + ? WHERE name = ?", (count, name)
+            )
+            last = self._conn.execute(
+                "SELECT value FROM id_counters WHERE name = ?", (name,)
+            ).fetchone()["value"]
+        return list(range(last - count + 1, last + 1))
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def add_sessions(self, sessions: List[Dict[str, Any]]) -> int:
+        """Insert sessions, skipping ids that already exist.
+
+        Args:
+            sessions: List of dicts with 'id', 'document' and 'metadata'
+
+        Returns:
+            int: Number of sessions inserted
+        """
+        inserted = 0
+        with self._lock, self._conn:
+            for session in sessions:
+                metadata = session.get("metadata", {})
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO sessions (id, document, date) VALUES (?, ?, ?)",
+                    (session["id"], session.get("document", ""), metadata.get("date", "")),
+                )
+                if cursor.rowcount:
+                    inserted += 1
+                    self._patch_one(session["id"], metadata, None)
+        return inserted
+
+    def patch_sessions(self,
+                       patches: Dict[str, Dict[str, Any]],
+                       expected_versions: Optional[Dict[str, int]] = None) -> Dict[str, List[str]]:
+        """Apply field changes to many sessions in one transaction, without reading them first.
+
+        Only the given fields are written: typed columns are set in place, child
+        tables are replaced for the given fields only, unknown keys are merged
+        into the 'extra' JSON column and 'actual_start' sets (or, with None,
+        clears) the start of the first scheduled slot. Every write bumps the
+        session's version.
+
+        Args:
+            patches: Mapping of session id to the fields to change
+            expected_versions: Optional mapping of session id to the version the
+                caller last read; sessions whose version has moved on are skipped
+
+        Returns:
+            Dict with 'updated', 'missing' and 'conflicts' lists of session ids
+        """
+        expected_versions = expected_versions or {}
+        result = {"updated": [], "missing": [], "conflicts": []}
+        with self._lock, self._conn:
+            for session_id, fields in patches.items():
+                status = self._patch_one(session_id, fields, expected_versions.get(session_id))
+                result[status].append(session_id)
+        return result
+
+    def patch_sessions_by_date(self, patches_by_date: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+        """Apply field changes to every session on each given date in one transaction.
+
+        Args:
+            patches_by_date: Mapping of YYYY-MM-DD date to the fields to change
+
+        Returns:
+            Dict with 'updated' session ids and 'missing' dates that have no session
+        """
+        result = {"updated": [], "missing": [], "conflicts": []}
+        with self._lock, self._conn:
+            for date, fields in patches_by_date.items():
+                rows = self._conn.execute("SELECT id FROM sessions WHERE date = ?", (date,)).fetchall()
+                if not rows:
+                    result["missing"].append(date)
+                for row in rows:
+                    status = self._patch_one(row["id"], fields, None)
+                    result[status].append(row["id"])
+        return result
+
+    def _patch_one(self, session_id: str, fields: Dict[str, Any], expected_version: Optional[int]) -> str:
+        """Write fields for one session. Caller holds the lock and transaction.
+
+        Returns:
+            str: "updated", "missing" or "conflicts"
+        """
+        assignments = ["version = version + 1"]
+        params: List[Any] = []
+        children = {}
+        child_extra = {}
+        extra = {}
+        for field, value in fields.items():
+            if field in CHILD_TABLES:
+                items, wrapper_extra = _child_items(field, value)
+                children[field] = items
+                if CHILD_TABLES[field][1]:
+                    child_extra[field] = wrapper_extra
+            elif field == "actual_start":
+                continue  # written to the first scheduled slot below
+            elif field in ("distance", "actual_distance"):
+                assignments.append(f"{field} = ?")
+                params.append(_to_float(value))
+            elif field == "session_completed":
+                assignments.append(f"{field} = ?")
+                params.append(1 if value else 0)
+            elif field in SESSION_COLUMNS:
+                assignments.append(f"{field} = ?")
+                params.append(value)
+            elif field != "version":
+                extra[field] = value
+
+        if extra:
+            assignments.append("extra = json_patch(COALESCE(extra, '{}'), ?)")
+            params.append(json.dumps(extra))
+        if child_extra:
+            # Replaced together with the child rows of the same fields
+            paths = ", ".join(f"'$.{field}', json(?)" for field in child_extra)
+            assignments.append(f"child_extra = json_set(COALESCE(child_extra, '{{}}'), {paths})")
+            params.extend(json.dumps(value) for value in child_extra.values())
+
+        where = "id = ?"
+        params.append(session_id)
+        if expected_version is not None:
+            where += " AND version = ?"
+            params.append(expected_version)
+
+        cursor = self._conn.execute(f"UPDATE sessions SET {', '.join(assignments)} WHERE {where}", params)
+        if not cursor.rowcount:
+            exists = self._conn.execute("SELECT 1 FROM sessions WHERE id = ?", (session_id,)).fetchone()
+            return "conflicts" if exists else "missing"
+
+        for field, items in children.items():
+            self._replace_children(session_id, field, items)
+        if "actual_start" in fields:
+            self._conn.execute(
+                "UPDATE session_time_scheduled SET actual_start = ? WHERE session_id = ? AND position = 0",
+                (fields["actual_start"] or None, session_id),
+            )
+        return "updated"
+
+    def _replace_children(self, session_id: str, field: str, items: List[Dict]) -> None:
+        table, _, item_columns = CHILD_TABLES[field]
+        self._conn.execute(f"DELETE FROM {table} WHERE session_id = ?", (session_id,))
+        if not items:
+            return
+        sql_columns = ", ".join(["session_id", "position", *item_columns.values(), "extra"])
+        placeholders = ", ".join("?" * (len(item_columns) + 3))
+        rows = []
+        for position, item in enumerate(items):
+            values = []
+            extra = {key: value for key, value in item.items() if key not in item_columns}
+            for key, column in item_columns.items():
+                value = item.get(key)
+                if column in NUMERIC_CHILD_COLUMNS and value is not None:
+                    number = _to_number(value)
+                    if number is None:
+                        extra[key] = value
+                    value = number
+                values.append(value)
+            rows.append((session_id, position, *values, json.dumps(extra) if extra else None))
+        self._conn.executemany(f"INSERT INTO {table} ({sql_columns}) VALUES ({placeholders})", rows)
+
+    def delete_all(self) -> int:
+        """Delete every session. Returns the number of sessions deleted."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM sessions")
+        return cursor.rowcount
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_by_ids(self, ids: Iterable[str]) -> List[Dict[str, Any]]:
+        ids = list(ids)
+        if not ids:
+            return []
+        placeholders = ", ".join("?" * len(ids))
+        return self._select(f"id IN ({placeholders})", ids)
+
+    def get_by_date(self, date: str) -> List[Dict[str, Any]]:
+        return self._select("date = ?", (date,))
+
+    def get_in_range(self, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+        return self._select("date BETWEEN ? AND ?", (start_date, end_date))
+
+    def get_by_status(self, session_completed: bool) -> List[Dict[str, Any]]:
+        return self._select("session_completed = ?", (1 if session_completed else 0,))
+
+    def get_by_activity(self, activity_id: int) -> List[Dict[str, Any]]:
+        return self._select("activity_id = ?", (activity_id,))
+
+    def list_all(self) -> List[Dict[str, Any]]:
+        return self._select("1 = 1", ())
+
+    def ids_by_date(self, date: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT id FROM sessions WHERE date = ? ORDER BY id", (date,)).fetchall()
+        return [row["id"] for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def _select(self, where: str, params: Iterable[Any]) -> List[Dict[str, Any]]:
+        """Load sessions matching a WHERE clause together with their child rows."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM sessions WHERE {where} ORDER BY date, id", tuple(params)
+            ).fetchall()
+            if not rows:
+                return []
+            ids = [row["id"] for row in rows]
+            children = {field: self._load_children(field, ids) for field in CHILD_TABLES}
+        return [self._to_record(row, children) for row in rows]
+
+    def _load_children(self, field: str, ids: List[str]) -> Dict[str, List[Dict]]:
+        table, _, item_columns = CHILD_TABLES[field]
+        placeholders = ", ".join("?" * len(ids))
+        rows = self._conn.execute(
+            f"SELECT * FROM {table} WHERE session_id IN ({placeholders}) ORDER BY session_id, position",
+            ids,
+        ).fetchall()
+        grouped: Dict[str, List[Dict]] = {}
+        for row in rows:
+            item = {
+                key: row[column]
+                for key, column in item_columns.items()
+                if row[column] is not None
+            }
+            if row["extra"]:
+                item.update(json.loads(row["extra"]))
+            grouped.setdefault(row["session_id"], []).append(item)
+        return grouped
+
+    @staticmethod
+    def _to_record(row: sqlite3.Row, children: Dict[str, Dict[str, List[Dict]]]) -> Dict[str, Any]:
+        """Rebuild the metadata structure the tools and frontend expect."""
+        session_id = row["id"]
+        child_extra = json.loads(row["child_extra"]) if row["child_extra"] else {}
+        metadata = {
+            "date": row["date"],
+            "day": row["day"],
+            "type": row["type"],
+            "distance": row["distance"],
+            "notes": row["notes"] or "",
+            "calendar": {"events": children["calendar"].get(session_id, []), **child_extra.get("calendar", {})},
+            "weather": {"hours": children["weather"].get(session_id, []), **child_extra.get("weather", {})},
+            "time_scheduled": children["time_scheduled"].get(session_id, []),
+            "data_points": {"laps": children["data_points"].get(session_id, []), **child_extra.get("data_points", {})},
+            "session_completed": bool(row["session_completed"]),
+            "version": row["version"],
+        }
+        for optional in ("activity_id", "actual_distance", "coach_feedback"):
+            if row[optional] is not None:
+                metadata[optional] = row[optional]
+        if row["extra"]:
+            metadata.update(json.loads(row["extra"]))
+        return {
+            "id": session_id,
+            "document": row["document"],
+            "metadata": metadata,
+        }
@@ -0,0 +1,82 @@
+"""
+Persistent cache of weather forecasts.
+
+One row per (location, date) holds the forecast for that day and when it
+was fetched, so a forecast fetched for a whole week is reused by every
+later lookup of those days until it is older than the caller's TTL.
+Forecasts older than RETENTION_SECONDS are deleted whenever new ones are
+stored, so the table does not grow by a row per location and day forever.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+# Forecasts fetched longer ago than this are deleted on the next write
+RETENTION_SECONDS = 3 * 24 * 60 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS weather_forecasts (
+    location TEXT NOT NULL,
+    date TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (location, date)
+);
+"""
+
+
+class WeatherStore:
+    """SQLite-backed TTL cache of daily forecasts keyed by (location, date)."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def get_forecasts(self, location: str, dates: Iterable[str], max_age: float) -> Dict[str, Dict[str, Any]]:
+        """Cached forecasts for the dates that are younger than max_age seconds.
+
+        Args:
+            location: Location key (e.g. "51.59,-0.24")
+            dates: Dates in YYYY-MM-DD format
+            max_age: Maximum age of a forecast in seconds
+
+        Returns:
+            Mapping of date to forecast for the dates found in the cache
+        """
+        dates = list(dates)
+        if not dates:
+            return {}
+        placeholders = ",".join("?" * len(dates))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT date, data FROM weather_forecasts "
+                f"WHERE location = ? AND fetched_at >= ? AND date IN ({placeholders})",
+                [location, time.time() - max_age, *dates],
+            ).fetchall()
+        return {row["date"]: json.loads(row["data"]) for row in rows}
+
+    def put_forecasts(self, location: str, forecasts: Dict[str, Dict[str, Any]],
+                      fetched_at: Optional[float] = None) -> None:
+        """Store the forecasts of several days fetched together and purge expired ones."""
+        fetched_at = fetched_at or time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO weather_forecasts (location, date, fetched_at, data) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(location, date) DO UPDATE SET "
+                "fetched_at = excluded.fetched_at, data = excluded.data",
+                [(location, date, fetched_at, json.dumps(forecast, separators=(",", ":")))
+                 for date, forecast in forecasts.items()],
+            )
+            self._conn.execute(
+                "DELETE FROM weather_forecasts WHERE fetched_at < ?", (time.time() - RETENTION_SECONDS,)
+            )
@@ -9,7 +9,7 @@ from typing import AsyncIterable, Dict, Set
 from datetime import datetime
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, Query, WebSocket, UploadFile, File, HTTPException
+from fastapi import FastAPI, Query, Request, WebSocket, UploadFile, File, HTTPException
 from fastapi.responses import FileResponse, HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from google.adk.agents import LiveRequestQueue
@@ -20,6 +20,12 @@ from google.adk.sessions.in_memory_session_service import InMemorySessionService
 from google.genai import types
 from ai_coach_agent.agent import root_agent
 from db.chroma_service import chroma_service
+from ai_coach_agent.tools.strava_rate_limit import strava_scheduler
+from ai_coach_agent.tools.strava_backfill import start_backfill, get_backfill_status
+from ai_coach_agent.tools.strava_webhook import (
+    verify_subscription, is_subscription_event, enqueue_event, get_webhook_status
+)
+from ai_coach_agent.tools.training_plan_parser import import_training_plan, PLAN_TABLE_EXTENSIONS
 
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -333,7 +339,29 @@ async def upload_file(file: UploadFile = File(...), session_id: str = Query(...)
         print(f"File saved successfully at: {file_path}")
         print(f"File exists: {file_path.exists()}")
         print(f"File size: {file_path.stat().st_size} bytes")
-        
+
+        # Tabular plans are parsed and stored by rules; the planner agent only sees other formats
+        if file_path.suffix.lower() in PLAN_TABLE_EXTENSIONS:
+            result = await asyncio.to_thread(import_training_plan, str(file_path))
+            if result["status"] == "success":
+                websocket = websocket_connections.get(session_id)
+                if websocket is not None:
+                    await send_log_to_frontend(websocket, "[PLANNER_AGENT] START: Starting uploaded plan processing")
+                    await websocket.send_text(json.dumps({
+                        "mime_type": "text/plain",
+                        "data": result["summary"],
+                        "role": "model",
+                    }))
+                    await websocket.send_text(json.dumps({"turn_complete": True, "interrupted": False}))
+                    await send_log_to_frontend(websocket, "[PLANNER_AGENT] FINISH: Successfully completed uploaded plan processing")
+                return {
+                    "status": "success",
+                    "message": "File uploaded and training plan imported",
+                    "filename": safe_filename,
+                    "sessions": result["sessions"]
+                }
+            print(f"Plan import fell back to the planner agent: {result['message']}")
+
         # Send a message through WebSocket
         if session_id in websocket_connections:
             print(f"Sending WebSocket message to session {session_id}")
@@ -551,6 +579,34 @@ async def get_weekly_sessions(start_date: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving weekly sessions: {str(e)}")
 
+@app.get("/api/range")
+async def get_sessions_in_range(
+    from_date: str = Query(..., alias="from", description="First date in YYYY-MM-DD format"),
+    to_date: str = Query(..., alias="to", description="Last date in YYYY-MM-DD format"),
+):
+    """Get all sessions in a date window (inclusive) with a single storage query."""
+    try:
+        result = chroma_service.get_sessions_in_range(from_date, to_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date range: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving sessions: {str(e)}")
+    
+    sessions = [
+        {
+            "id": result['ids'][i],
+            "session": result['documents'][i],
+            "metadata": result['metadatas'][i]
+        }
+        for i in range(len(result['ids']))
+    ]
+    return {
+        "status": "success",
+        "data": sessions,
+        "count": len(sessions),
+        "message": f"Found {len(sessions)} sessions from {from_date} to {to_date}"
+    }
+
 @app.get("/api/activity/{activity_id}")
 async def get_activity_by_id_endpoint(activity_id: int):
     """Get activity data for a specific activity_id."""
@@ -564,6 +620,64 @@ async def get_activity_by_id_endpoint(activity_id: int):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving activity: {str(e)}")
 
+@app.get("/api/strava-rate-limit")
+async def get_strava_rate_limit():
+    """Current Strava API budget, queue depth and request counters."""
+    return {
+        "status": "success",
+        "data": strava_scheduler.metrics()
+    }
+
+@app.post("/api/strava/backfill")
+async def start_strava_backfill(after: str = None, batch_size: int = 20, limit: int = None, restart: bool = False):
+    """Start importing historical Strava runs in the background."""
+    if after:
+        try:
+            datetime.strptime(after, "%Y-%m-%d")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="after must be in YYYY-MM-DD format")
+    return start_backfill(after=after, batch_size=batch_size, limit=limit, restart=restart)
+
+@app.get("/api/strava/backfill")
+async def strava_backfill_status():
+    """Progress of the current or last Strava backfill."""
+    return {
+        "status": "success",
+        "data": get_backfill_status()
+    }
+
+@app.get("/api/strava/webhook")
+async def strava_webhook_verify(
+    mode: str = Query(None, alias="hub.mode"),
+    verify_token: str = Query(None, alias="hub.verify_token"),
+    challenge: str = Query(None, alias="hub.challenge"),
+):
+    """Validation handshake for the Strava push subscription."""
+    response = verify_subscription(mode, verify_token, challenge)
+    if response is None:
+        raise HTTPException(status_code=403, detail="Invalid webhook verification request")
+    return response
+
+@app.post("/api/strava/webhook")
+async def strava_webhook_event(request: Request):
+    """Receive a Strava activity event; processing happens in the background."""
+    try:
+        event = await request.json()
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+    if not isinstance(event, dict) or not is_subscription_event(event):
+        raise HTTPException(status_code=403, detail="Event is not from the configured Strava subscription")
+    queued = enqueue_event(event)
+    return {"status": "success", "queued": queued}
+
+@app.get("/api/strava/webhook/status")
+async def strava_webhook_status():
+    """Webhook event counters and the last processed result."""
+    return {
+        "status": "success",
+        "data": get_webhook_status()
+    }
+
 @app.post("/api/analyze-chart")
 async def analyze_chart_endpoint(image_path: str = Query(...), session_id: str = Query(...)):
     """Analyze a running chart image directly from the backend."""
@@ -717,10 +831,10 @@ async def get_training_plan_stats():
     try:
         from db.chroma_service import chroma_service
         
-        # Get all sessions from the main collection
-        results = chroma_service.collection.get()
+        # Get all sessions from the session store
+        sessions = chroma_service.sessions.list_all()
         
-        if not results['ids']:
+        if not sessions:
             return {
                 "status": "success",
                 "total_sessions": 0,
@@ -737,7 +851,8 @@ async def get_training_plan_stats():
         session_types = {}
         total_distance = 0
         
-        for metadata in results['metadatas']:
+        for session in sessions:
+            metadata = session['metadata']
             date = metadata.get('date', '')
             if date:
                 dates.add(date)
@@ -771,7 +886,7 @@ async def get_training_plan_stats():
             "start_date": start_date,
             "end_date": end_date,
             "duration_weeks": plan_duration_weeks,
-            "total_sessions": len(results['ids']),
+            "total_sessions": len(sessions),
             "total_distance_km": round(total_distance, 1),
             "session_breakdown": session_types,
             "created_at": start_date,  # Use start date as creation date
@@ -780,9 +895,9 @@ async def get_training_plan_stats():
         
         return {
             "status": "success",
-            "total_sessions": len(results['ids']),
+            "total_sessions": len(sessions),
             "plans": [plan_info],
-            "message": f"Found training plan with {len(results['ids'])} sessions from {start_date} to {end_date}"
+            "message": f"Found training plan with {len(sessions)} sessions from {start_date} to {end_date}"
         }
         
     except Exception as e:
@@ -791,25 +906,22 @@ async def get_training_plan_stats():
 
 @app.delete("/api/training-plan")
 async def delete_training_plan():
-    """Delete all training plan sessions from ChromaDB."""
+    """Delete all training plan sessions. Activities and memories are kept."""
     try:
         from db.chroma_service import chroma_service
         
-        # Get all sessions from the main collection
-        results = chroma_service.collection.get()
+        # Delete all sessions from the session store
+        deleted = chroma_service.delete_all_sessions()
         
-        if not results['ids']:
+        if not deleted:
             return {
                 "status": "success",
                 "message": "No training plans found to delete"
             }
         
-        # Delete all sessions
-        chroma_service.collection.delete(ids=results['ids'])
-        
         return {
             "status": "success",
-            "message": f"Successfully deleted {len(results['ids'])} training plan sessions"
+            "message": f"Successfully deleted {deleted} training plan sessions"
         }
         
     except Exception as e:
@@ -833,6 +945,7 @@ async def delete_rag_entry(document_id: str):
         
         # Delete all chunks for this document
         rag_collection.delete(ids=results['ids'])
+        chroma_service.rag_index.delete(results['ids'])
         
         return {
             "status": "success",